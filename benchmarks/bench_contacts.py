@@ -0,0 +1,111 @@
+"""Time of geometry.find_contacts against vertex count, compared with the
+previous search, which used a single radius of threshold plus the longest
+edge and the tangent plane of the nearest vertex. Each target is a sphere,
+optionally with one long edge, and the source is a smaller sphere half sunk
+in its equator.
+
+Doesn't need Maya, run it from the repository root:
+
+    python benchmarks/bench_contacts.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+root = Path(__file__).parents[1]
+sys.path.insert(0, root.joinpath("python").as_posix())
+sys.path.insert(0, root.joinpath("tests").as_posix())
+
+from meshes import make_sphere  # noqa: E402
+from sticky_controller.core import geometry  # noqa: E402
+
+ROWS = [50, 100, 200, 400]
+THRESHOLD = 0.01
+# With a long edge the previous search scans every vertex for every point,
+# it runs out of memory on larger meshes.
+FIXED_LONG_EDGE_MAX = 5000
+
+
+def find_contacts_fixed_radius(
+    points: np.ndarray,
+    other_points: np.ndarray,
+    other_normals: np.ndarray,
+    threshold: float,
+    other_edges: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Previous search, one radius covering the longest edge."""
+    lengths = np.linalg.norm(
+        other_points[other_edges[:, 0]] - other_points[other_edges[:, 1]],
+        axis=1,
+    )
+    radius = threshold + lengths.max()
+    point_ids = np.nonzero(
+        np.all(points >= other_points.min(axis=0) - radius, axis=1)
+        & np.all(points <= other_points.max(axis=0) + radius, axis=1)
+    )[0]
+    nearest, _ = geometry.SpatialHash(other_points, radius).nearest(
+        points[point_ids], radius
+    )
+    point_ids, nearest = point_ids[nearest != -1], nearest[nearest != -1]
+    signed_distances = np.einsum(
+        "ij,ij->i",
+        points[point_ids] - other_points[nearest],
+        other_normals[nearest],
+    )
+    hits = signed_distances < threshold
+
+    return point_ids[hits], signed_distances[hits]
+
+
+def measure(function: callable, *args) -> tuple[float, int]:
+    """Returns the best time of 3 runs and the number of contacts."""
+    best = np.inf
+    for _ in range(3):
+        start = time.perf_counter()
+        point_ids, _ = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, len(point_ids)
+
+
+def main():
+    print(
+        f"{'vertices':>9} {'long edge':>9} {'fixed (ms)':>11} "
+        f"{'contacts':>8} {'grown (ms)':>11} {'contacts':>8}"
+    )
+    for rows in ROWS:
+        target_points, target_triangles = make_sphere(rows)
+        source_points, _ = make_sphere(rows, radius=0.3)
+        source_points = source_points + (1, 0, 0)
+        for long_edge in [False, True]:
+            points, triangles = target_points, target_triangles
+            if long_edge:
+                # A stray vertex pulled far away, like a modeling mistake.
+                points = points.copy()
+                points[-1] = (0, 0, -3)
+            args = (source_points, points, geometry.normalize(points))
+            if long_edge and len(points) > FIXED_LONG_EDGE_MAX:
+                fixed = "-"
+            else:
+                seconds, count = measure(
+                    find_contacts_fixed_radius,
+                    *args,
+                    THRESHOLD,
+                    geometry.get_edges(triangles),
+                )
+                fixed = f"{seconds * 1000:>11.1f} {count:>8}"
+            grown, grown_count = measure(
+                geometry.find_contacts, *args, THRESHOLD, triangles
+            )
+            print(
+                f"{len(points):>9} {str(long_edge):>9} {fixed:>20} "
+                f"{grown * 1000:>11.1f} {grown_count:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
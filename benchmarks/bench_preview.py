@@ -0,0 +1,87 @@
+"""Time of the numpy side of the radius preview against vertex count: sorting
+the distances to the sticky center, in Volume and Surface falloff modes, and
+each tick of a radius drag, from 0.05 to 0.5 and back on a unit sphere. A
+tick computes the levels of the changed vertices and the vertex id lists
+given to setVertexColors, once per level.
+
+The MColorArray creation, setVertexColors calls and viewport refresh are
+not timed, they need Maya.
+
+Doesn't need Maya, run it from the repository root:
+
+    python benchmarks/bench_preview.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+root = Path(__file__).parents[1]
+sys.path.insert(0, root.joinpath("python").as_posix())
+sys.path.insert(0, root.joinpath("tests").as_posix())
+
+from meshes import make_sphere  # noqa: E402
+from sticky_controller.core import geometry  # noqa: E402
+
+ROWS = [100, 200, 400, 700]
+# Same as preview.LUT_SIZE, preview.py imports Maya.
+LUT_SIZE = 256
+RADII = np.concatenate([np.linspace(0.05, 0.5, 30), np.linspace(0.5, 0.05, 30)])
+
+
+def sort_distances(distances: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(distances)
+    return order, distances[order]
+
+
+def drag(order: np.ndarray, distances: np.ndarray) -> tuple[list, list]:
+    """Returns the time and number of ranges of each tick."""
+    times, range_counts = [], []
+    count = len(distances)
+    for radius in RADII:
+        start_time = time.perf_counter()
+        count, ranges = geometry.get_level_ranges(
+            distances, radius, count, LUT_SIZE
+        )
+        for _, start, end in ranges:
+            order[start:end].tolist()
+        times.append(time.perf_counter() - start_time)
+        range_counts.append(len(ranges))
+    return times, range_counts
+
+
+def main():
+    print(
+        f"{'vertices':>9} {'mode':>7} {'sort (ms)':>10} "
+        f"{'tick mean (ms)':>15} {'tick max (ms)':>14} {'ranges':>7}"
+    )
+    for rows in ROWS:
+        points, triangles = make_sphere(rows)
+        edges = geometry.get_edges(triangles)
+        center = points[len(points) // 2]
+        for mode in ["volume", "surface"]:
+            start = time.perf_counter()
+            distances = np.linalg.norm(points - center, axis=1)
+            if mode == "surface":
+                seed = int(np.argmin(distances))
+                distances = geometry.get_surface_distances(
+                    points, edges, seed, distances[seed], RADII.max() * 2
+                )
+            order, distances = sort_distances(distances)
+            sort_time = time.perf_counter() - start
+
+            times, range_counts = drag(order, distances)
+            print(
+                f"{len(points):>9} {mode:>7} {sort_time * 1000:>10.1f} "
+                f"{np.mean(times) * 1000:>15.2f} "
+                f"{np.max(times) * 1000:>14.2f} "
+                f"{np.mean(range_counts):>7.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
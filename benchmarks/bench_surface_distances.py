@@ -0,0 +1,89 @@
+"""Time of geometry.get_surface_distances against vertex count and radius,
+compared with the previous search, which relaxed every edge around the seed
+at once until stable. Each mesh is a unit sphere, seeded on its equator.
+
+Doesn't need Maya, run it from the repository root:
+
+    python benchmarks/bench_surface_distances.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+root = Path(__file__).parents[1]
+sys.path.insert(0, root.joinpath("python").as_posix())
+sys.path.insert(0, root.joinpath("tests").as_posix())
+
+from meshes import make_sphere  # noqa: E402
+from sticky_controller.core import geometry  # noqa: E402
+
+ROWS = [100, 200, 400, 700]
+RADII = [0.2, 1.0]
+
+
+def get_surface_distances_relaxed(
+    points: np.ndarray,
+    edges: np.ndarray,
+    seed: int,
+    seed_distance: float,
+    max_distance: float,
+) -> np.ndarray:
+    """Previous search, all edges relaxed at once until stable."""
+    near = np.linalg.norm(points - points[seed], axis=1) <= max_distance
+    edges = edges[near[edges[:, 0]] & near[edges[:, 1]]]
+    lengths = np.linalg.norm(points[edges[:, 0]] - points[edges[:, 1]], axis=1)
+
+    distances = np.full(len(points), np.inf)
+    distances[seed] = seed_distance
+    while True:
+        new_distances = distances.copy()
+        np.minimum.at(
+            new_distances, edges[:, 0], distances[edges[:, 1]] + lengths
+        )
+        np.minimum.at(
+            new_distances, edges[:, 1], distances[edges[:, 0]] + lengths
+        )
+        new_distances[new_distances > max_distance] = np.inf
+        if np.array_equal(new_distances, distances):
+            break
+        distances = new_distances
+
+    return distances
+
+
+def measure(function: callable, *args) -> tuple[float, int]:
+    """Returns the best time of 3 runs and the number of reached vertices."""
+    best = np.inf
+    for _ in range(3):
+        start = time.perf_counter()
+        distances = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, int(np.isfinite(distances).sum())
+
+
+def main():
+    print(
+        f"{'vertices':>9} {'radius':>6} {'reached':>8} "
+        f"{'relaxed (ms)':>13} {'dijkstra (ms)':>14}"
+    )
+    for rows in ROWS:
+        points, triangles = make_sphere(rows)
+        args = (points, geometry.get_edges(triangles), len(points) // 2, 0.0)
+        for radius in RADII:
+            relaxed, _ = measure(get_surface_distances_relaxed, *args, radius)
+            dijkstra, reached = measure(
+                geometry.get_surface_distances, *args, radius
+            )
+            print(
+                f"{len(points):>9} {radius:>6} {reached:>8} "
+                f"{relaxed * 1000:>13.1f} {dijkstra * 1000:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Time per frame of the stickies pinned with their uvPin against the same
+stickies pinned with a barycentric pin, on a skinned sphere animated by its
+joint, against vertex count.
+
+The deformed mesh is evaluated whole for both pins, so the time of pulling
+the deformed mesh alone is given too: the barycentric pin only saves what is
+spent on top of it.
+
+Run with mayapy from the repository root:
+
+    mayapy benchmarks/maya/bench_barycentric_pin.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).parents[2].joinpath("python").as_posix())
+
+SUBDIVISIONS = [50, 200, 500, 1000]
+STICKIES = 20
+FRAMES = 50
+
+
+def build_scene(subdivisions: int) -> str:
+    """Returns a sphere skinned to an animated joint."""
+    from maya import cmds
+
+    sphere = cmds.polySphere(
+        subdivisionsAxis=subdivisions, subdivisionsHeight=subdivisions
+    )[0]
+    cmds.delete(sphere, constructionHistory=True)
+    joint = cmds.createNode("joint")
+    cmds.skinCluster(joint, sphere)
+    cmds.setKeyframe(joint, attribute="rotateY", time=1, value=0)
+    cmds.setKeyframe(joint, attribute="rotateY", time=FRAMES, value=90)
+
+    return sphere
+
+
+def measure(plugs: list[str]) -> float:
+    """Returns the mean time of evaluating plugs on each frame, in ms."""
+    from maya import cmds
+
+    start = time.perf_counter()
+    for frame in range(1, FRAMES + 1):
+        cmds.currentTime(frame, update=False)
+        for plug in plugs:
+            cmds.dgeval(plug)
+
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    import maya.standalone
+
+    maya.standalone.initialize()
+    from maya import cmds
+    from sticky_controller.core import pin, sticky
+
+    # Plugs are pulled one by one, as the DG does.
+    cmds.evaluationManager(mode="off")
+
+    print(
+        f"{'vertices':>10} {'mesh (ms)':>10} {'uvPin (ms)':>11} "
+        f"{'baryPin (ms)':>13}"
+    )
+    for subdivisions in SUBDIVISIONS:
+        cmds.file(new=True, force=True)
+        sphere = build_scene(subdivisions)
+        count = cmds.polyEvaluate(sphere, vertex=True)
+        soft_mods = [
+            sticky.create_sticky(
+                cmds.xform(
+                    f"{sphere}.vtx[{i}]",
+                    query=True,
+                    translation=True,
+                    worldSpace=True,
+                ),
+                sphere,
+                select=False,
+            )
+            for i in range(0, count, count // STICKIES)[:STICKIES]
+        ]
+        pin_plugs = [
+            f"{pin.get_pin_multiply(soft_mod)}.matrixSum"
+            for soft_mod in soft_mods
+        ]
+
+        uvp, _ = sticky.get_sticky_pin(soft_mods[0])
+        # Deformed mesh both pins read.
+        mesh_plug = cmds.listConnections(
+            f"{uvp}.deformedGeometry",
+            source=True,
+            destination=False,
+            plugs=True,
+        )[0]
+
+        mesh_time = measure([mesh_plug])
+        uv_time = measure(pin_plugs)
+        for soft_mod in soft_mods:
+            pin.set_pin_mode(soft_mod, pin.BARYCENTRIC)
+        bary_time = measure(pin_plugs)
+
+        print(
+            f"{count:>10} {mesh_time:>10.2f} {uv_time:>11.2f} "
+            f"{bary_time:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
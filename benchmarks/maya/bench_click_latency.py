@@ -0,0 +1,108 @@
+"""Time of precompute.get_uv_coordinates, run on each click creating a
+sticky, against vertex count: with the surface of the mesh prepared in the
+background, and without it (closestPointOnMesh node). The prepared query is
+timed on the prepared pose, and once the mesh is deformed by its joint.
+
+Run with mayapy from the repository root:
+
+    mayapy benchmarks/maya/bench_click_latency.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).parents[2].joinpath("python").as_posix())
+
+SUBDIVISIONS = [50, 200, 500, 1000]
+CLICKS = 20
+# Seconds to wait for the surfaces to be prepared.
+TIMEOUT = 120
+
+
+def build_scene(subdivisions: int) -> tuple[str, str, str]:
+    """Returns a sphere skinned to a joint, its deformed shape and the
+    joint.
+    """
+    from maya import cmds
+
+    sphere = cmds.polySphere(
+        subdivisionsAxis=subdivisions, subdivisionsHeight=subdivisions
+    )[0]
+    cmds.delete(sphere, constructionHistory=True)
+    joint = cmds.createNode("joint")
+    cmds.skinCluster(joint, sphere)
+    shape = cmds.listRelatives(
+        sphere, shapes=True, noIntermediate=True, fullPath=True
+    )[0]
+
+    return sphere, shape, joint
+
+
+def wait_prepared(shape: str):
+    """Process the idle queue until the surface of shape is prepared."""
+    import maya.utils
+    from sticky_controller.core import precompute
+
+    start = time.perf_counter()
+    while not precompute._precomputer.get_surface(shape):
+        if time.perf_counter() - start > TIMEOUT:
+            raise RuntimeError(f"Surface of -{shape}- not prepared !")
+        maya.utils.processIdleEvents()
+        time.sleep(0.01)
+
+
+def measure(sphere: str, shape: str, function: callable) -> float:
+    """Returns the mean time of querying the uv of every few vertices, in
+    ms.
+    """
+    from maya import cmds
+
+    count = cmds.polyEvaluate(sphere, vertex=True)
+    positions = [
+        cmds.xform(
+            f"{sphere}.vtx[{i}]", query=True, translation=True, worldSpace=True
+        )
+        for i in range(0, count, count // CLICKS)[:CLICKS]
+    ]
+    start = time.perf_counter()
+    for position in positions:
+        function(position, shape)
+
+    return (time.perf_counter() - start) / len(positions) * 1000
+
+
+def main():
+    import maya.standalone
+
+    maya.standalone.initialize()
+    from maya import cmds
+    from sticky_controller.core import mesh, precompute
+
+    print(
+        f"{'vertices':>10} {'node (ms)':>10} {'prepared (ms)':>14} "
+        f"{'deformed (ms)':>14}"
+    )
+    for subdivisions in SUBDIVISIONS:
+        cmds.file(new=True, force=True)
+        precompute.stop()
+        sphere, shape, joint = build_scene(subdivisions)
+        node_time = measure(sphere, shape, mesh.get_uv_coordinates)
+
+        precompute.start()
+        wait_prepared(shape)
+        prepared_time = measure(sphere, shape, precompute.get_uv_coordinates)
+        cmds.setAttr(f"{joint}.rotateY", 30)
+        deformed_time = measure(sphere, shape, precompute.get_uv_coordinates)
+
+        print(
+            f"{cmds.polyEvaluate(sphere, vertex=True):>10} "
+            f"{node_time:>10.2f} {prepared_time:>14.2f} "
+            f"{deformed_time:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
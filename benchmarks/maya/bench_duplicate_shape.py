@@ -0,0 +1,117 @@
+"""Time and peak memory of mesh.duplicate_shape against the previous approach,
+which duplicated the whole transform then deleted everything but one shape.
+
+Run with mayapy from the repository root:
+
+    mayapy benchmarks/maya/bench_duplicate_shape.py
+
+Each measure runs in its own mayapy process, so the peak resident memory of
+the process only accounts for one approach. The output starts with the Maya
+version and the machine, so it can be pasted as is in a commit or a review.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).parents[2].joinpath("python").as_posix())
+
+SUBDIVISIONS = [50, 200, 500, 1000]
+# Extra shapes and children under the transform, duplicated by the old
+# approach and thrown away.
+EXTRA_SHAPES = 2
+
+
+def duplicate_shape_old(transform: str, name: str) -> str:
+    from maya import cmds
+
+    dup = cmds.duplicate(transform)
+    new_shape = cmds.listRelatives(dup, shapes=True, path=True)[0]
+    new_shape = cmds.rename(new_shape, name)
+    cmds.parent(new_shape, transform, relative=True, shape=True)
+    cmds.delete(dup)
+
+    return new_shape
+
+
+def measure(method: str, subdivisions: int) -> dict:
+    """Build the scene, duplicate once and returns the timings."""
+    import maya.standalone
+
+    maya.standalone.initialize()
+    from maya import cmds
+    from sticky_controller.core import mesh
+
+    transform = cmds.polySphere(
+        subdivisionsAxis=subdivisions, subdivisionsHeight=subdivisions
+    )[0]
+    for i in range(EXTRA_SHAPES):
+        child = cmds.polySphere(
+            subdivisionsAxis=subdivisions, subdivisionsHeight=subdivisions
+        )[0]
+        cmds.parent(child, transform)
+    cmds.delete(transform, constructionHistory=True)
+
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if method == "old":
+        duplicate_shape_old(transform, "benchShape")
+    else:
+        mesh.duplicate_shape(transform, "benchShape")
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "seconds": elapsed,
+        # ru_maxrss is in KB on Linux and in bytes on macOS.
+        "peak_increase_mb": (peak_rss - start_rss)
+        / (1024**2 if sys.platform == "darwin" else 1024),
+        "vertices": cmds.polyEvaluate(transform, vertex=True),
+        "maya": cmds.about(version=True),
+    }
+
+
+def run(method: str, subdivisions: int) -> dict:
+    """Measure one approach in a new mayapy process."""
+    output = subprocess.run(
+        [sys.executable, __file__, method, str(subdivisions)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    header = False
+    for subdivisions in SUBDIVISIONS:
+        old, new = run("old", subdivisions), run("new", subdivisions)
+        if not header:
+            print(
+                f"Maya {new['maya']}, {platform.platform()}, "
+                f"{os.cpu_count()} cpus\n"
+            )
+            print(
+                f"{'vertices':>10} {'old (ms)':>9} {'new (ms)':>9} "
+                f"{'old (MB)':>9} {'new (MB)':>9}"
+            )
+            header = True
+        print(
+            f"{new['vertices']:>10} {old['seconds'] * 1000:>9.1f} "
+            f"{new['seconds'] * 1000:>9.1f} {old['peak_increase_mb']:>9.1f} "
+            f"{new['peak_increase_mb']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        print(json.dumps(measure(sys.argv[1], int(sys.argv[2]))))
+    else:
+        main()
@@ -0,0 +1,86 @@
+"""Time of the scene lookups made for every sticky of a scene (controllers,
+pin, deformed geometries and deformers of its geometry), like an export or a
+refresh of the UI does, without query cache and in a query cache scope. The
+scope time includes registering and removing its callbacks.
+
+Run with mayapy from the repository root:
+
+    mayapy benchmarks/maya/bench_query_cache.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).parents[2].joinpath("python").as_posix())
+
+STICKIES = [10, 50, 200]
+REPEAT = 5
+
+
+def build_scene(count: int) -> tuple[str, list[str]]:
+    """Returns a skinned sphere and the softMods of count stickies on it."""
+    from maya import cmds
+    from sticky_controller.core import sticky
+
+    sphere = cmds.polySphere(subdivisionsAxis=100, subdivisionsHeight=100)[0]
+    cmds.delete(sphere, constructionHistory=True)
+    cmds.skinCluster(cmds.createNode("joint"), sphere)
+    soft_mods = [
+        sticky.create_sticky(None, sphere, uv=(i / count, 0.5), select=False)
+        for i in range(count)
+    ]
+    return sphere, soft_mods
+
+
+def lookup(sphere: str, soft_mods: list[str]):
+    from sticky_controller.core import mesh, sticky
+
+    for soft_mod in soft_mods:
+        sticky.get_sticky_controllers(soft_mod)
+        sticky.get_sticky_pin(soft_mod)
+        sticky.get_deformed_geometries(soft_mod)
+        mesh.get_deformers(sphere)
+
+
+def measure(function: callable) -> float:
+    """Returns the best time of REPEAT runs, in ms."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    import maya.standalone
+
+    maya.standalone.initialize()
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    print(
+        f"{'stickies':>8} {'uncached (ms)':>14} {'scope (ms)':>11} "
+        f"{'hits':>6} {'misses':>7}"
+    )
+    for count in STICKIES:
+        cmds.file(new=True, force=True)
+        sphere, soft_mods = build_scene(count)
+
+        uncached = measure(lambda: lookup(sphere, soft_mods))
+        cached = measure(query_cache.scoped(lambda: lookup(sphere, soft_mods)))
+        query_cache.reset_stats()
+        query_cache.scoped(lookup)(sphere, soft_mods)
+        stats = query_cache.get_stats()
+
+        print(
+            f"{count:>8} {uncached:>14.1f} {cached:>11.1f} "
+            f"{stats['hits']:>6} {stats['misses']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
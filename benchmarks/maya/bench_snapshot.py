@@ -0,0 +1,76 @@
+"""Time of snapshot.import_stickies against rebuilding the same stickies one
+by one, the way the UI creates them: one create_sticky per sticky, each
+resolving its geometry data and closest point again, with the viewport
+refreshed after each one.
+
+Run with mayapy from the repository root:
+
+    mayapy benchmarks/maya/bench_snapshot.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).parents[2].joinpath("python").as_posix())
+
+STICKIES = [10, 50, 200]
+SUBDIVISIONS = 100
+
+
+def build_scene() -> tuple[str, list[tuple[float, float, float]]]:
+    """Returns a skinned sphere and the positions of its vertices."""
+    from maya import cmds
+
+    sphere = cmds.polySphere(
+        subdivisionsAxis=SUBDIVISIONS, subdivisionsHeight=SUBDIVISIONS
+    )[0]
+    cmds.delete(sphere, constructionHistory=True)
+    joint = cmds.createNode("joint")
+    cmds.skinCluster(joint, sphere)
+    count = cmds.polyEvaluate(sphere, vertex=True)
+    positions = [
+        cmds.xform(f"{sphere}.vtx[{i}]", q=True, translation=True, ws=True)
+        for i in range(0, count, 7)
+    ]
+    return sphere, positions
+
+
+def main():
+    import maya.standalone
+
+    maya.standalone.initialize()
+    from maya import cmds
+    from sticky_controller.core import snapshot, sticky
+
+    path = Path(tempfile.mkdtemp()) / "stickies.json"
+
+    print(f"{'stickies':>8} {'one by one (s)':>15} {'import (s)':>11}")
+    for count in STICKIES:
+        cmds.file(new=True, force=True)
+        sphere, positions = build_scene()
+        start = time.perf_counter()
+        for position in positions[:count]:
+            sticky.create_sticky(position, sphere)
+            cmds.refresh(force=True)
+        one_by_one = time.perf_counter() - start
+
+        snapshot.export_stickies(path)
+        names = sorted(snapshot.get_stickies())
+        cmds.delete(cmds.ls("*_sticky_grp"), "STICKIES")
+        cmds.delete(cmds.ls(type="uvPin"))
+
+        start = time.perf_counter()
+        snapshot.import_stickies(path)
+        imported = time.perf_counter() - start
+
+        # Names of the snapshot are restored on import.
+        assert sorted(snapshot.get_stickies()) == names
+        print(f"{count:>8} {one_by_one:>15.2f} {imported:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+import numpy as np
+from maya import cmds
+
+from sticky_controller import utils
+from sticky_controller.core import log, geometry, mesh
+
+# SoftMod attribute storing the surface frame of the sticky anchor.
+ANCHOR_ATTR = "sticky_anchor"
+
+# {softMod uuid: (rest shape, uv)} of the anchors recorded at idle, by uuid
+# so they are dropped with their scene.
+_pending: dict[str, tuple[str, tuple[float, float]]] = {}
+
+
+def get_anchor(soft_mod: str) -> np.ndarray | None:
+    """Returns the (4, 4) recorded anchor frame of a sticky, None if none."""
+    if not cmds.attributeQuery(ANCHOR_ATTR, node=soft_mod, exists=True):
+        return None
+    return np.array(cmds.getAttr(f"{soft_mod}.{ANCHOR_ATTR}")).reshape(4, 4)
+
+
+def set_anchor(soft_mod: str, frame: np.ndarray):
+    """Store the anchor frame of a sticky on its softMod."""
+    if _pending:
+        _pending.pop(cmds.ls(soft_mod, uuid=True)[0], None)
+    if not cmds.attributeQuery(ANCHOR_ATTR, node=soft_mod, exists=True):
+        cmds.addAttr(soft_mod, longName=ANCHOR_ATTR, dataType="matrix")
+    cmds.setAttr(
+        f"{soft_mod}.{ANCHOR_ATTR}", frame.ravel().tolist(), type="matrix"
+    )
+
+
+def get_anchor_frames(
+    shape: str,
+    uvs: np.ndarray,
+    triangulation: tuple[np.ndarray, np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the (n, 4, 4) surface frames of a rest shape at uv
+    coordinates, in its object space, and whether each uv is on the surface.
+    Only the vertices of the located triangles are read.
+
+    :param shape: Rest shape, the original shape read by the uvPin.
+    :param uvs: (n, 2) uv coordinates.
+    :param triangulation: Triangles and triangle uvs of the shape, as
+        returned by mesh.get_triangles, read if not given.
+    """
+    triangles, triangle_uvs = triangulation or mesh.get_triangles(shape)
+
+    located = [geometry.locate_uv(triangle_uvs, uv) for uv in uvs]
+    triangle_ids = np.array([triangle for triangle, _ in located])
+    weights = np.array([bary for _, bary in located])
+    vertex_ids, inverse = np.unique(
+        triangles[triangle_ids], return_inverse=True
+    )
+    get_points = mesh.get_points_reader(mesh.get_mesh_fn(shape))
+    frames = geometry.get_surface_frames(
+        get_points(vertex_ids)[inverse.reshape(-1, 3)],
+        weights,
+        geometry.get_tangent_weights(triangle_uvs[triangle_ids]),
+    )
+    # Uvs outside of every triangle get weights out of the [0, 1] range.
+    valid = np.all(weights > -1e-3, axis=1) & np.all(weights < 1 + 1e-3, axis=1)
+
+    return frames, valid
+
+
+def record_anchor(
+    soft_mod: str,
+    shape: str,
+    uv: tuple[float, float],
+    triangulation: tuple[np.ndarray, np.ndarray] = None,
+) -> bool:
+    """Record the surface frame of a sticky anchor, in the object space of
+    its rest shape, to remap it on another topology or uvs later.
+
+    :param soft_mod: SoftMod of the sticky.
+    :param shape: Rest shape, the original shape read by the uvPin.
+    :param uv: Pin coordinate of the sticky.
+    :param triangulation: Triangles and triangle uvs of the shape, as
+        returned by mesh.get_triangles, read if not given.
+
+    :returns: Whether the anchor was recorded, uv is on the surface.
+    """
+    frames, valid = get_anchor_frames(shape, np.array([uv]), triangulation)
+    if not valid[0]:
+        log.warning(f"-{soft_mod}- is not pinned on its surface !")
+        return False
+
+    set_anchor(soft_mod, frames[0])
+    return True
+
+
+def record_anchor_deferred(soft_mod: str, shape: str, uv: tuple[float, float]):
+    """Record the anchor of a sticky at idle, like record_anchor, so its
+    creation doesn't wait for the triangulation of the whole mesh. The
+    anchors queued meanwhile are recorded together, reading each mesh once.
+
+    :param soft_mod: SoftMod of the sticky.
+    :param shape: Rest shape, the original shape read by the uvPin.
+    :param uv: Pin coordinate of the sticky.
+    """
+    if not _pending:
+        cmds.evalDeferred(record_pending_anchors, lowestPriority=True)
+    _pending[cmds.ls(soft_mod, uuid=True)[0]] = (shape, uv)
+
+
+def record_pending_anchors():
+    """Record the anchors queued by record_anchor_deferred, not recorded
+    since. Not undoable, the anchor belongs to the sticky creation.
+    """
+    uvs_by_shape = defaultdict(dict)
+    for uuid, (shape, uv) in _pending.items():
+        soft_mod = cmds.ls(uuid)
+        if soft_mod and cmds.objExists(shape):
+            uvs_by_shape[shape][soft_mod[0]] = uv
+    _pending.clear()
+
+    with utils.without_undo():
+        for shape, uvs in uvs_by_shape.items():
+            frames, valid = get_anchor_frames(
+                shape, np.array(list(uvs.values()))
+            )
+            for soft_mod, frame, is_valid in zip(uvs, frames, valid):
+                if not is_valid:
+                    log.warning(f"-{soft_mod}- is not pinned on its surface !")
+                    continue
+                set_anchor(soft_mod, frame)
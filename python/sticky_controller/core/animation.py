@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import Any, Callable
+
+from maya import cmds
+from maya.api import OpenMaya as om
+
+from sticky_controller.core import query_cache
+
+ANIM_CURVE_TYPES = {
+    "doubleLinear": "animCurveTL",
+    "doubleAngle": "animCurveTA",
+}
+
+
+def is_key_curve(node: str) -> bool:
+    """Whether node is an animCurve driven by time (animCurveT*). Set driven
+    keys curves (animCurveU*) are driven by another attribute.
+    """
+    return query_cache.node_type(node).startswith("animCurveT")
+
+
+def get_anim_curves(node: str) -> dict[str, str]:
+    """Returns the animCurve connected to each keyable attribute of node.
+
+    :param node: Node to get animCurves from.
+
+    :returns: {attribute: animCurve}
+    """
+    curves = {}
+    for attr in cmds.listAttr(node, keyable=True) or []:
+        input_nodes = cmds.listConnections(
+            f"{node}.{attr}", source=True, destination=False, plugs=False
+        )
+        if input_nodes and is_key_curve(input_nodes[0]):
+            curves[attr] = input_nodes[0]
+
+    return curves
+
+
+def get_driven_attributes(node: str, attributes: list[str] = None) -> list[str]:
+    """Returns the attributes driven by something else than keys
+    (constraint, set driven keys, expression, ...).
+
+    :param node: Node to check.
+    :param attributes: Attributes to check. Default is every keyable one.
+    """
+    driven = []
+    for attr in attributes or cmds.listAttr(node, keyable=True) or []:
+        input_nodes = query_cache.list_connections(
+            f"{node}.{attr}",
+            source=True,
+            destination=False,
+            skipConversionNodes=True,
+        )
+        if input_nodes and not is_key_curve(input_nodes[0]):
+            driven.append(attr)
+
+    return driven
+
+
+def get_anim_curve(plug: str) -> str | None:
+    """Returns the animCurve connected to plug, if any."""
+    curves = cmds.listConnections(
+        plug, source=True, destination=False, type="animCurve"
+    )
+    return curves[0] if curves else None
+
+
+def delete_anim_curve(plug: str):
+    """Delete the animCurve connected to plug, if any."""
+    curve = get_anim_curve(plug)
+    if curve:
+        cmds.delete(curve)
+
+
+def get_anim_curve_data(curve: str) -> dict[str, Any]:
+    """Get the keys of an animCurve. Every value is queried for all keys at
+    once and is expressed in ui units, as expected by cmds.
+
+    :param curve: AnimCurve node.
+
+    :returns: Data which can be given to create_anim_curve.
+    """
+    query = {"query": True}
+    return {
+        "times": cmds.keyframe(curve, **query, timeChange=True),
+        "values": cmds.keyframe(curve, **query, valueChange=True),
+        "in_tangents": cmds.keyTangent(curve, **query, inTangentType=True),
+        "out_tangents": cmds.keyTangent(curve, **query, outTangentType=True),
+        "in_angles": cmds.keyTangent(curve, **query, inAngle=True),
+        "out_angles": cmds.keyTangent(curve, **query, outAngle=True),
+        "in_weights": cmds.keyTangent(curve, **query, inWeight=True),
+        "out_weights": cmds.keyTangent(curve, **query, outWeight=True),
+        "weighted": cmds.keyTangent(curve, **query, weightedTangents=True)[0],
+        "pre_infinity": cmds.setInfinity(curve, **query, preInfinite=True)[0],
+        "post_infinity": cmds.setInfinity(curve, **query, postInfinite=True)[0],
+    }
+
+
+def create_anim_curve(plug: str, data: dict[str, Any]) -> str | None:
+    """Create an animCurve with given keys and connect it to plug. Keys are
+    written with a single setAttr on the keyTimeValue multi attribute instead
+    of one setKeyframe per key, which keeps it fast and undoable.
+
+    :param plug: Attribute to animate ("node.attribute").
+    :param data: Keys data, as returned by get_anim_curve_data. Only "times"
+        and "values" are mandatory.
+
+    :returns: AnimCurve node, None if there is no key.
+    """
+    times, values = data["times"], data["values"]
+    if not times:
+        return None
+
+    node_type = ANIM_CURVE_TYPES.get(
+        cmds.getAttr(plug, type=True), "animCurveTU"
+    )
+    # Plugs like "uvPin.coordinate[0].coordinateU" aren't valid node names.
+    curve = cmds.createNode(node_type, name=re.sub(r"\W", "_", plug))
+
+    time_values = [item for key in zip(times, values) for item in key]
+    cmds.setAttr(
+        f"{curve}.keyTimeValue[0:{len(times) - 1}]",
+        *time_values,
+        size=len(times),
+    )
+    cmds.connectAttr(f"{curve}.output", plug, force=True)
+
+    if data.get("weighted"):
+        cmds.keyTangent(curve, edit=True, weightedTangents=True)
+
+    # Edit tangents with one call per tangent types combination.
+    tangent_indexes = defaultdict(list)
+    for i, tangents in enumerate(
+        zip(
+            data.get("in_tangents") or [],
+            data.get("out_tangents") or [],
+        )
+    ):
+        tangent_indexes[tangents].append((i, i))
+    for (in_tangent, out_tangent), indexes in tangent_indexes.items():
+        cmds.keyTangent(
+            curve,
+            edit=True,
+            index=indexes,
+            inTangentType=in_tangent,
+            outTangentType=out_tangent,
+        )
+
+    # Angles and weights are only meaningful for fixed tangents, the other
+    # types are computed from the key values.
+    for i, (in_tangent, out_tangent) in enumerate(
+        zip(
+            data.get("in_tangents") or [],
+            data.get("out_tangents") or [],
+        )
+    ):
+        tangent_flags = {}
+        if in_tangent == "fixed":
+            tangent_flags["inAngle"] = data["in_angles"][i]
+            if data.get("weighted"):
+                tangent_flags["inWeight"] = data["in_weights"][i]
+        if out_tangent == "fixed":
+            tangent_flags["outAngle"] = data["out_angles"][i]
+            if data.get("weighted"):
+                tangent_flags["outWeight"] = data["out_weights"][i]
+        if tangent_flags:
+            cmds.keyTangent(
+                curve, edit=True, index=(i, i), lock=False, **tangent_flags
+            )
+
+    if data.get("pre_infinity") or data.get("post_infinity"):
+        cmds.setInfinity(
+            curve,
+            preInfinite=data.get("pre_infinity", "constant"),
+            postInfinite=data.get("post_infinity", "constant"),
+        )
+
+    return curve
+
+
+def bake_anim_curve(
+    plug: str, times: list[float], values: list[float]
+) -> str | None:
+    """Replace the animCurve of plug by linear keys at given times.
+
+    :param plug: Attribute to animate ("node.attribute").
+    :param times: Time of each key.
+    :param values: Value of each key, in ui units.
+
+    :returns: AnimCurve node, None if there is no key.
+    """
+    delete_anim_curve(plug)
+    return create_anim_curve(
+        plug,
+        {
+            "times": times,
+            "values": values,
+            "in_tangents": ["linear"] * len(times),
+            "out_tangents": ["linear"] * len(times),
+        },
+    )
+
+
+def get_plug_reader(plug: om.MPlug) -> Callable[[], float | list[float]]:
+    """Returns a function reading the value of plug, in the current DG
+    context. Values are in ui units like cmds.getAttr, matrices are flat
+    lists of 16 values.
+    """
+    attribute = plug.attribute()
+    if attribute.hasFn(om.MFn.kUnitAttribute):
+        unit_type = om.MFnUnitAttribute(attribute).unitType()
+        if unit_type == om.MFnUnitAttribute.kAngle:
+            return lambda: plug.asMAngle().asUnits(om.MAngle.uiUnit())
+        if unit_type == om.MFnUnitAttribute.kDistance:
+            return lambda: plug.asMDistance().asUnits(om.MDistance.uiUnit())
+        if unit_type == om.MFnUnitAttribute.kTime:
+            return lambda: plug.asMTime().asUnits(om.MTime.uiUnit())
+
+    if attribute.hasFn(om.MFn.kMatrixAttribute) or (
+        attribute.hasFn(om.MFn.kTypedAttribute)
+        and om.MFnTypedAttribute(attribute).attrType() == om.MFnData.kMatrix
+    ):
+        return lambda: list(om.MFnMatrixData(plug.asMObject()).matrix())
+
+    return plug.asDouble
+
+
+def sample_plugs(plugs: list[str], frames: list[float]) -> list[list]:
+    """Evaluate plugs on every frame, in a single traversal of time which
+    doesn't change the current time. Each frame is evaluated once through a
+    DG context, for all the plugs, instead of one getAttr(time=) per plug
+    and frame.
+
+    :param plugs: Attributes to read ("node.attribute").
+    :param frames: Frames at which plugs are read.
+
+    :returns: Values of the plugs on each frame, as returned by
+        get_plug_reader.
+    """
+    readers = [
+        get_plug_reader(om.MSelectionList().add(plug).getPlug(0))
+        for plug in plugs
+    ]
+    samples = []
+    for frame in frames:
+        context = om.MDGContext(om.MTime(frame, om.MTime.uiUnit()))
+        with om.MDGContextGuard(context):
+            samples.append([read() for read in readers])
+
+    return samples
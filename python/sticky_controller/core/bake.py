@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from maya import cmds
+
+from sticky_controller import utils
+from sticky_controller.core import log, animation, geometry, sticky, query_cache
+
+# Nodes left between a driver and its driven attribute, deleted with the
+# driver once they no longer drive anything.
+INTERMEDIATE_TYPES = {"unitConversion", "pairBlend"}
+
+
+def remove_drivers(node: str, attributes: list[str]):
+    """Disconnect whatever drives the attributes of node, and delete what is
+    left driving nothing upstream: unit conversions, pair blends, set driven
+    keys curves and constraints.
+
+    :param node: Driven node.
+    :param attributes: Driven attributes.
+    """
+    upstream = set()
+    for attr in attributes:
+        plug = f"{node}.{attr}"
+        sources = cmds.listConnections(
+            plug, source=True, destination=False, plugs=True
+        )
+        if not sources:
+            continue
+        cmds.disconnectAttr(sources[0], plug)
+        upstream.add(sources[0].split(".", 1)[0])
+
+    constraints = set()
+    while upstream:
+        driver = upstream.pop()
+        if not cmds.objExists(driver):
+            continue
+        if "constraint" in cmds.nodeType(driver, inherited=True):
+            constraints.add(driver)
+            continue
+        node_type = cmds.nodeType(driver)
+        if node_type not in INTERMEDIATE_TYPES and not node_type.startswith(
+            "animCurve"
+        ):
+            continue
+        if cmds.listConnections(driver, source=False, destination=True):
+            continue
+        # A pair blend also blends the keys the attribute had before being
+        # constrained, and is weighted by an attribute of node.
+        upstream.update(
+            set(
+                cmds.listConnections(driver, source=True, destination=False)
+                or []
+            )
+            - {node}
+        )
+        cmds.delete(driver)
+
+    for constraint in constraints:
+        outputs = cmds.listConnections(
+            constraint, source=False, destination=True, skipConversionNodes=True
+        )
+        # Constraints are also connected to their own target attributes.
+        if set(outputs or []) <= {node, constraint}:
+            cmds.delete(constraint)
+
+
+@utils.undoable
+@query_cache.scoped
+def bake_drivers(
+    soft_mods: list[str], start: int, end: int, tolerance: float = None
+) -> list[str]:
+    """Replace the constraints, drivers and expressions of the stickies
+    controllers by keys on every frame of the range.
+
+    All driven channels of all stickies are sampled in a single traversal of
+    time, then their drivers are removed and the samples are keyed.
+
+    :param soft_mods: SoftMods of the stickies.
+    :param start: First frame of the range.
+    :param end: Last frame of the range.
+    :param tolerance: If given, keys which can be interpolated from their
+        neighbours within tolerance are not created.
+
+    :returns: Baked attributes ("node.attribute").
+    """
+    driven = {}
+    for soft_mod in soft_mods:
+        for ctrl in sticky.get_sticky_controllers(soft_mod):
+            attributes = ctrl and animation.get_driven_attributes(ctrl)
+            if attributes:
+                driven[ctrl] = attributes
+    if not driven:
+        log.warning("Controllers of given stickies are not driven !")
+        return []
+
+    frames = list(range(int(start), int(end) + 1))
+    plugs = [
+        f"{ctrl}.{attr}" for ctrl, attrs in driven.items() for attr in attrs
+    ]
+    samples = dict(zip(plugs, zip(*animation.sample_plugs(plugs, frames))))
+
+    for ctrl, attributes in driven.items():
+        remove_drivers(ctrl, attributes)
+
+    for plug, values in samples.items():
+        keys = range(len(frames))
+        if tolerance is not None:
+            keys = geometry.reduce_keys(frames, values, tolerance)
+        animation.bake_anim_curve(
+            plug, [frames[i] for i in keys], [values[i] for i in keys]
+        )
+    log.info(f"{len(samples)} attributes baked on {len(frames)} frames.")
+
+    return list(samples)
@@ -0,0 +1,252 @@
+"""Size bounded store of precomputed arrays on disk, shared by all Maya
+sessions. It doesn't import Maya, see utils.get_cache_store for the store of
+the package.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import uuid
+import hashlib
+import contextlib
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+
+from sticky_controller.core import log
+
+SIZE_VARIABLE = "STICKY_CONTROLLER_CACHE_SIZE"
+DEFAULT_SIZE = 1024
+
+
+def get_max_size() -> int:
+    """Returns the size limit of the store in bytes: 1024 MB, or the one set
+    in the STICKY_CONTROLLER_CACHE_SIZE environment variable, in MB.
+    """
+    value = os.environ.get(SIZE_VARIABLE, DEFAULT_SIZE)
+    try:
+        size = int(value)
+    except ValueError:
+        log.warning(
+            f"{SIZE_VARIABLE} -{value}- is not a number of MB, "
+            f"{DEFAULT_SIZE} MB is used !"
+        )
+        size = DEFAULT_SIZE
+
+    return size * 1024**2
+
+
+class CacheStore:
+    """Size bounded store of arrays on disk, shared by all Maya sessions.
+
+    Entries are .npy files named by a hash of their content (mesh topology,
+    points, algorithm version, ...), so a key never points to stale data.
+    They are read memory-mapped, written atomically through a temporary file
+    and evicted least recently used first once the store exceeds max_size.
+    """
+
+    def __init__(self, directory: Path, max_size: int):
+        """
+        :param directory: Directory of the entries, created if needed. If it
+            can't be created or written, the store is read-only: existing
+            entries are read, new ones are computed but not stored.
+        :param max_size: Size in bytes above which entries are evicted.
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.writable = os.access(self.directory, os.W_OK)
+        except OSError:
+            self.writable = False
+        if not self.writable:
+            log.warning(
+                f"Cache directory -{self.directory}- is not writable, "
+                f"precomputed data won't be stored !"
+            )
+
+    @staticmethod
+    def get_key(name: str, *parts: str | bytes | np.ndarray, version: int = 1):
+        """Returns the key of an entry from everything its data depends on.
+
+        :param name: Name of the data, like "symmetry".
+        :param parts: Content hashes or raw content the data is computed from.
+        :param version: Version of the algorithm computing the data.
+        """
+        content = hashlib.sha1(f"{name}:{version}".encode())
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                part = np.ascontiguousarray(part).tobytes()
+            elif not isinstance(part, bytes):
+                part = str(part).encode()
+            # Length prefixed, so ("ab", "c") and ("a", "bc") differ.
+            content.update(f"{len(part)}:".encode())
+            content.update(part)
+
+        return f"{name}_{content.hexdigest()}"
+
+    def get_path(self, key: str) -> Path:
+        """Returns the file of an entry."""
+        return self.directory.joinpath(f"{key}.npy")
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Returns the read-only memory-mapped array of an entry, None if it
+        doesn't exist.
+        """
+        path = self.get_path(key)
+        try:
+            array = np.load(path, mmap_mode="r")
+        except (ValueError, OSError):
+            return None
+        # Modification time is the last access time used for eviction, the
+        # entry is still readable if the store isn't writable.
+        with contextlib.suppress(OSError):
+            os.utime(path)
+
+        return array
+
+    def put(self, key: str, array: np.ndarray):
+        """Write an entry atomically, then evict old entries if needed.
+        Does nothing if the store is read-only.
+        """
+        if not self.writable:
+            return
+
+        path = self.get_path(key)
+        temp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                np.save(f, np.asarray(array))
+            # Readers only ever see complete files.
+            os.replace(temp_path, path)
+        except OSError:
+            log.warning(f"Can't write cache entry -{path}- !")
+            if temp_path.exists():
+                temp_path.unlink()
+            return
+
+        self.evict(keep=path)
+
+    def get_or_compute(
+        self, key: str, compute: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        """Returns the array of an entry, computed and stored if needed."""
+        array = self.get(key)
+        if array is None:
+            array = compute()
+            self.put(key, array)
+
+        return array
+
+    @contextlib.contextmanager
+    def lock(self, timeout: float = 5, stale: float = 60) -> Iterator[bool]:
+        """Lock the store between sessions. Yields whether the lock was
+        acquired before timeout, locks older than stale seconds are broken.
+        """
+        path = self.directory.joinpath(".lock")
+        start = time.time()
+        acquired = False
+        while not acquired:
+            acquired = create_exclusive(path)
+            if acquired or self.break_stale_lock(path, stale):
+                continue
+            if time.time() - start > timeout:
+                break
+            time.sleep(0.05)
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                path.unlink(missing_ok=True)
+
+    @staticmethod
+    def break_stale_lock(path: Path, stale: float) -> bool:
+        """Delete a lock older than stale seconds.
+
+        Breaking is guarded by its own exclusive file, so two sessions
+        seeing the same stale lock can't both delete it, the second one
+        deleting the lock the first one just took.
+
+        :returns: Whether the lock was deleted.
+        """
+        guard = path.with_name(f"{path.name}.break")
+        if not create_exclusive(guard):
+            # Only left behind by a session killed while breaking a lock.
+            with contextlib.suppress(OSError):
+                if time.time() - guard.stat().st_mtime > stale:
+                    guard.unlink()
+            return False
+
+        try:
+            if time.time() - path.stat().st_mtime <= stale:
+                return False
+            path.unlink()
+        except FileNotFoundError:
+            # Released meanwhile, it can be taken again.
+            pass
+        except OSError:
+            return False
+        finally:
+            guard.unlink(missing_ok=True)
+
+        return True
+
+    def remove_temporary_files(self, stale: float = 3600):
+        """Delete the temporary files older than stale seconds, left behind
+        by sessions killed while writing an entry. Younger ones may still be
+        written.
+        """
+        for path in self.directory.glob("*.tmp"):
+            try:
+                if time.time() - path.stat().st_mtime > stale:
+                    path.unlink()
+            except OSError:
+                continue
+
+    def evict(self, keep: Path = None):
+        """Delete least recently used entries until the store fits in
+        max_size, and the orphan temporary files. Skipped if another session
+        is already evicting.
+        """
+        self.remove_temporary_files()
+        entries = []
+        for path in self.directory.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        size = sum(entry[1] for entry in entries)
+        if size <= self.max_size:
+            return
+
+        with self.lock(timeout=0) as acquired:
+            if not acquired:
+                return
+            for _, entry_size, path in sorted(entries):
+                if size <= self.max_size:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    path.unlink()
+                except OSError:
+                    # Still memory-mapped by a session on Windows.
+                    continue
+                size -= entry_size
+
+
+def create_exclusive(path: Path) -> bool:
+    """Create an empty file, atomically.
+
+    :returns: False if the file already exists.
+    """
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return False
+
+    return True
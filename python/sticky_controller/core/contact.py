@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from maya import cmds
+
+from sticky_controller import utils
+from sticky_controller.core import log, geometry, mesh, query_cache, sticky
+
+
+def detect_contacts(
+    source: str, target: str, start: int, end: int, threshold: float
+) -> list[dict[str, Any]]:
+    """Find, on each frame of the range, the regions of source penetrating or
+    closer than threshold to target.
+
+    :param source: Geometry which may collide, like a finger.
+    :param target: Geometry which is collided, like a cheek.
+    :param start: First frame of the range.
+    :param end: Last frame of the range.
+    :param threshold: Distance under which source is in contact with target.
+
+    :returns: Contact regions, ordered by frame:
+        {"frame": int, "center": [x, y, z], "vertex_count": int,
+        "depth": float}. Depth is the smallest signed distance of the region
+        to target, negative when penetrating.
+    """
+    source_shape = mesh.get_shape(source)
+    target_shape = mesh.get_shape(target)
+    source_edges = geometry.get_edges(mesh.get_triangles(source_shape)[0])
+    target_triangles = mesh.get_triangles(target_shape)[0]
+
+    contacts = []
+    for frame in range(int(start), int(end) + 1):
+        source_points = np.array(
+            mesh.get_world_mesh_fn(source_shape, frame).getPoints()
+        )[:, :3]
+        target_fn = mesh.get_world_mesh_fn(target_shape, frame)
+        target_points = np.array(target_fn.getPoints())[:, :3]
+        target_normals = np.array(target_fn.getVertexNormals(False))
+
+        # The search radius follows the edge lengths of each frame.
+        vertex_ids, distances = geometry.find_contacts(
+            source_points,
+            target_points,
+            target_normals,
+            threshold,
+            target_triangles,
+        )
+        labels = geometry.cluster_vertices(vertex_ids, source_edges)
+        for label in np.unique(labels):
+            region = labels == label
+            center = source_points[vertex_ids[region]].mean(axis=0)
+            contacts.append(
+                {
+                    "frame": frame,
+                    "center": center.tolist(),
+                    "vertex_count": int(region.sum()),
+                    "depth": float(distances[region].min()),
+                }
+            )
+
+    return contacts
+
+
+def merge_contacts(
+    contacts: list[dict[str, Any]], distance: float
+) -> list[dict[str, Any]]:
+    """Keep the deepest contacts which are farther than distance from each
+    other, contacts found on successive frames are often the same region.
+    """
+    merged = []
+    for contact in sorted(contacts, key=lambda c: c["depth"]):
+        center = np.array(contact["center"])
+        if all(
+            np.linalg.norm(center - other["center"]) > distance
+            for other in merged
+        ):
+            merged.append(contact)
+
+    return merged
+
+
+@utils.undoable
+@query_cache.scoped
+def create_contact_stickies(
+    contacts: list[dict[str, Any]], target: str
+) -> list[str]:
+    """Create a sticky on target at the center of each contact, at the frame
+    it was found.
+
+    :param contacts: Contacts returned by detect_contacts.
+    :param target: Geometry to deform.
+
+    :returns: SoftMods of the created stickies.
+    """
+    current_time = cmds.currentTime(query=True)
+    geometry_data = sticky.get_geometry_data(target)
+
+    soft_mods = []
+    try:
+        for contact in contacts:
+            cmds.currentTime(contact["frame"])
+            soft_mod = sticky.create_sticky(
+                position=contact["center"],
+                geometry=target,
+                geometry_data=geometry_data,
+                select=False,
+            )
+            if soft_mod:
+                soft_mods.append(soft_mod)
+    finally:
+        cmds.currentTime(current_time)
+
+    return soft_mods
+
+
+def detect(
+    threshold: float, create: bool = True, merge_distance: float = 10
+) -> list[dict[str, Any]]:
+    """Detect contacts of the first selected geometry on the second selected
+    geometry, on the playback range.
+
+    :param threshold: Distance under which geometries are in contact.
+    :param create: Create a sticky on the second geometry for each contact
+        region.
+    :param merge_distance: Contacts closer than this distance share the same
+        sticky. Default is the default radius of a sticky.
+
+    :returns: Contact regions found.
+    """
+    sel = cmds.ls(selection=True, type="transform")
+    if len(sel) != 2:
+        log.warning("Please select two geometries !")
+        return []
+
+    source, target = sel
+    contacts = detect_contacts(
+        source,
+        target,
+        cmds.playbackOptions(query=True, minTime=True),
+        cmds.playbackOptions(query=True, maxTime=True),
+        threshold,
+    )
+    for contact in contacts:
+        log.info(
+            f"Frame {contact['frame']}: {contact['vertex_count']} vertices of "
+            f"-{source}- in contact with -{target}- around "
+            f"{[round(x, 3) for x in contact['center']]} "
+            f"(depth {contact['depth']:.3f})."
+        )
+
+    if create and contacts:
+        create_contact_stickies(
+            merge_contacts(contacts, merge_distance), target
+        )
+
+    return contacts
@@ -83,7 +83,7 @@ def create(
 
 
 def apply_controllers_position(
-    data: dict[str, dict[str, tuple[float, float, float]]]
+    data: dict[str, dict[str, tuple[float, float, float]]],
 ):
     """Apply position data. Replace the controllers at their position before
     adding or removing deformed geometries.
@@ -0,0 +1,1028 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Callable
+
+import numpy as np
+
+
+def closest_points_on_triangles(
+    points: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized closest point on triangles, each point is tested against the
+    triangle at the same index.
+
+    :param points: (n, 3) positions.
+    :param a: (n, 3) first corner of triangles.
+    :param b: (n, 3) second corner of triangles.
+    :param c: (n, 3) third corner of triangles.
+
+    :returns: (n, 3) closest points and (n, 3) barycentric weights.
+    """
+    ab, ac = b - a, c - a
+    ap, bp, cp = points - a, points - b, points - c
+    d1 = np.einsum("ij,ij->i", ab, ap)
+    d2 = np.einsum("ij,ij->i", ac, ap)
+    d3 = np.einsum("ij,ij->i", ab, bp)
+    d4 = np.einsum("ij,ij->i", ac, bp)
+    d5 = np.einsum("ij,ij->i", ab, cp)
+    d6 = np.einsum("ij,ij->i", ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Projection inside the triangle.
+        denom = va + vb + vc
+        v = np.where(denom != 0, vb / denom, 0.0)
+        w = np.where(denom != 0, vc / denom, 0.0)
+        bary = np.stack([1 - v - w, v, w], axis=-1)
+
+        # Voronoi regions of edges and corners, checked from the lowest to
+        # the highest priority so the last assignment wins.
+        edge_bc = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        bary[edge_bc] = np.stack([0 * w, 1 - w, w], axis=-1)[edge_bc]
+
+        edge_ac = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        w = d2 / (d2 - d6)
+        bary[edge_ac] = np.stack([1 - w, 0 * w, w], axis=-1)[edge_ac]
+
+        bary[(d6 >= 0) & (d5 <= d6)] = (0, 0, 1)
+
+        edge_ab = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        v = d1 / (d1 - d3)
+        bary[edge_ab] = np.stack([1 - v, v, 0 * v], axis=-1)[edge_ab]
+
+        bary[(d3 >= 0) & (d4 <= d3)] = (0, 1, 0)
+        bary[(d1 <= 0) & (d2 <= 0)] = (1, 0, 0)
+
+    closest = bary[:, 0, None] * a + bary[:, 1, None] * b + bary[:, 2, None] * c
+
+    return closest, bary
+
+
+def locate_uv(
+    triangle_uvs: np.ndarray, uv: tuple[float, float]
+) -> tuple[int, np.ndarray]:
+    """Find the triangle containing a uv coordinate.
+
+    :param triangle_uvs: (t, 3, 2) uv of each triangle corner.
+    :param uv: UV coordinate to locate.
+
+    :returns: Triangle id and its (3,) barycentric weights at uv. If uv is
+        outside of all triangles, returns the closest triangle.
+    """
+    a = triangle_uvs[:, 0]
+    v0 = triangle_uvs[:, 1] - a
+    v1 = triangle_uvs[:, 2] - a
+    v2 = np.asarray(uv, dtype=np.float64) - a
+    d00 = np.einsum("ij,ij->i", v0, v0)
+    d01 = np.einsum("ij,ij->i", v0, v1)
+    d11 = np.einsum("ij,ij->i", v1, v1)
+    d20 = np.einsum("ij,ij->i", v2, v0)
+    d21 = np.einsum("ij,ij->i", v2, v1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = d00 * d11 - d01 * d01
+        v = (d11 * d20 - d01 * d21) / denom
+        w = (d00 * d21 - d01 * d20) / denom
+    bary = np.stack([1 - v - w, v, w], axis=-1)
+
+    # Inside triangles have all weights positive, the best triangle is the one
+    # with the highest smallest weight.
+    scores = np.nan_to_num(bary.min(axis=1), nan=-np.inf)
+    triangle = int(np.argmax(scores))
+
+    return triangle, bary[triangle]
+
+
+def get_triangle_uvs(
+    tri_counts: np.ndarray,
+    tri_vertices: np.ndarray,
+    poly_counts: np.ndarray,
+    poly_vertices: np.ndarray,
+    uv_counts: np.ndarray,
+    uv_ids: np.ndarray,
+    uvs: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get the triangles of a mesh with the uv of each triangle corner.
+
+    :param tri_counts: (f,) number of triangles of each polygon.
+    :param tri_vertices: (t * 3,) vertex ids of each triangle corner.
+    :param poly_counts: (f,) number of vertices of each polygon.
+    :param poly_vertices: (fv,) vertex ids of each polygon corner.
+    :param uv_counts: (f,) number of uvs of each polygon.
+    :param uv_ids: Uv ids of the polygons corners with uvs.
+    :param uvs: (u, 2) uv coordinates.
+
+    :returns: (t, 3) vertex ids and (t, 3, 2) uvs of each triangle, nan for
+        polygons without uvs.
+    """
+    tri_vertices = tri_vertices.reshape(-1, 3)
+
+    # Uv id of each face-vertex, -1 for faces without uvs.
+    face_vertex_uvs = np.full(len(poly_vertices), -1, dtype=np.int64)
+    mapped = np.repeat(uv_counts == poly_counts, poly_counts)
+    face_vertex_uvs[mapped] = uv_ids
+
+    # Find the face-vertex of each triangle corner from its face and vertex.
+    vertex_count = int(poly_vertices.max()) + 1 if len(poly_vertices) else 1
+    face_vertex_keys = (
+        np.repeat(np.arange(len(poly_counts)), poly_counts) * vertex_count
+        + poly_vertices
+    )
+    order = np.argsort(face_vertex_keys)
+    triangle_keys = (
+        np.repeat(np.arange(len(tri_counts)), tri_counts)[:, None]
+        * vertex_count
+        + tri_vertices
+    )
+    face_vertices = order[
+        np.searchsorted(face_vertex_keys[order], triangle_keys)
+    ]
+
+    triangle_uvs = uvs[face_vertex_uvs[face_vertices]]
+    triangle_uvs[face_vertex_uvs[face_vertices] == -1] = np.nan
+
+    return tri_vertices, triangle_uvs
+
+
+def get_tangent_weights(triangle_uvs: np.ndarray) -> np.ndarray:
+    """Weights of the two edges (corner 0 to 1, corner 0 to 2) of triangles
+    giving their U tangent, the direction in which U increases.
+
+    :param triangle_uvs: (..., 3, 2) uv of each triangle corner.
+
+    :returns: (..., 2) edges weights, (1, 0) for triangles without uv area.
+    """
+    du1, dv1 = np.moveaxis(
+        triangle_uvs[..., 1, :] - triangle_uvs[..., 0, :], -1, 0
+    )
+    du2, dv2 = np.moveaxis(
+        triangle_uvs[..., 2, :] - triangle_uvs[..., 0, :], -1, 0
+    )
+    det = du1 * dv2 - du2 * dv1
+    degenerate = np.abs(det) < 1e-12
+    det = np.where(degenerate, 1, det)
+
+    return np.stack(
+        [
+            np.where(degenerate, 1, dv2 / det),
+            np.where(degenerate, 0, -dv1 / det),
+        ],
+        axis=-1,
+    )
+
+
+def get_symmetry_map(
+    points: np.ndarray, axis: int = 0, tolerance: float = None
+) -> np.ndarray:
+    """Match each vertex with the vertex at its mirrored position.
+
+    :param points: (n, 3) positions of the vertices, in a symmetric pose.
+    :param axis: Mirror axis, 0 for x, 1 for y, 2 for z.
+    :param tolerance: Maximum distance between a mirrored vertex and its match.
+        Default is 0.1% of the bounding box diagonal.
+
+    :returns: (n,) id of the mirrored vertex of each vertex, -1 if not found.
+    """
+    tolerance = tolerance or 1e-3 * np.linalg.norm(
+        points.max(axis=0) - points.min(axis=0)
+    )
+    mirrored = points.copy()
+    mirrored[:, axis] *= -1
+
+    symmetry_map, _ = SpatialHash(points, tolerance).nearest(
+        mirrored, tolerance
+    )
+    return symmetry_map
+
+
+def get_vertex_triangles(
+    triangles: np.ndarray, vertex_count: int = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get the triangles using each vertex, in a compressed form.
+
+    :param triangles: (t, 3) vertex ids of each triangle.
+    :param vertex_count: Number of vertices of the mesh.
+
+    :returns: Offsets and triangle ids, triangles using vertex i are
+        triangle_ids[offsets[i]:offsets[i + 1]].
+    """
+    vertex_ids = triangles.ravel()
+    vertex_count = vertex_count or int(vertex_ids.max()) + 1
+    order = np.argsort(vertex_ids, kind="stable")
+    offsets = np.zeros(vertex_count + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(vertex_ids, minlength=vertex_count))
+
+    return offsets, order // 3
+
+
+class SurfaceTracker:
+    """Track the closest point of a moving position on a mesh surface.
+
+    Each query starts from the previously hit triangle and walks towards the
+    closest triangle through the triangles sharing a vertex, so successive
+    queries only read the points around the previous hit instead of the whole
+    mesh.
+    """
+
+    def __init__(
+        self,
+        triangles: np.ndarray,
+        triangle_uvs: np.ndarray,
+        max_steps: int = 256,
+    ):
+        """
+        :param triangles: (t, 3) vertex ids of each triangle.
+        :param triangle_uvs: (t, 3, 2) uv of each triangle corner.
+        :param max_steps: Maximum number of walking steps per query.
+        """
+        self.triangles = triangles
+        self.triangle_uvs = triangle_uvs
+        self.max_steps = max_steps
+        self.offsets, self.vertex_triangles = get_vertex_triangles(triangles)
+        self.triangle = None
+
+    def get_neighbors(self, triangle: int) -> np.ndarray:
+        """Returns the triangle and all triangles sharing a vertex with it."""
+        return np.unique(
+            np.concatenate(
+                [
+                    self.vertex_triangles[self.offsets[v] : self.offsets[v + 1]]
+                    for v in self.triangles[triangle]
+                ]
+            )
+        )
+
+    def closest_on(
+        self,
+        position: np.ndarray,
+        triangles: np.ndarray,
+        get_points: Callable[[np.ndarray], np.ndarray],
+    ) -> tuple[int, np.ndarray, np.ndarray, float]:
+        """Returns the closest triangle among triangles, with its closest
+        point, barycentric weights and distance to position.
+        """
+        vertex_ids = self.triangles[triangles]
+        unique_ids, inverse = np.unique(vertex_ids, return_inverse=True)
+        corners = get_points(unique_ids)[inverse.reshape(-1, 3)]
+        closest, bary = closest_points_on_triangles(
+            np.broadcast_to(position, (len(triangles), 3)),
+            corners[:, 0],
+            corners[:, 1],
+            corners[:, 2],
+        )
+        distances = np.linalg.norm(closest - position, axis=1)
+        best = int(np.argmin(distances))
+
+        return triangles[best], closest[best], bary[best], distances[best]
+
+    def project(
+        self,
+        position: tuple[float, float, float],
+        get_points: Callable[[np.ndarray], np.ndarray],
+    ) -> tuple[np.ndarray, np.ndarray, float]:
+        """Project position on the surface.
+
+        :param position: Position to project.
+        :param get_points: Returns the (n, 3) positions of given vertex ids.
+
+        :returns: uv, closest point and distance.
+        """
+        position = np.asarray(position, dtype=np.float64)
+
+        if self.triangle is None:
+            # First query, test every triangle.
+            candidates = np.arange(len(self.triangles))
+            triangle, closest, bary, distance = self.closest_on(
+                position, candidates, get_points
+            )
+        else:
+            triangle, distance = self.triangle, np.inf
+            for _ in range(self.max_steps):
+                result = self.closest_on(
+                    position, self.get_neighbors(triangle), get_points
+                )
+                if result[3] >= distance:
+                    # Local minimum reached.
+                    break
+                triangle, closest, bary, distance = result
+
+        self.triangle = triangle
+        uv = bary @ self.triangle_uvs[triangle]
+
+        return uv, closest, distance
+
+
+def get_edges(triangles: np.ndarray) -> np.ndarray:
+    """Returns the (e, 2) unique vertex ids pairs of the triangles edges."""
+    edges = np.sort(
+        np.concatenate(
+            [triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]]
+        ),
+        axis=1,
+    ).astype(np.int64)
+    # Unique on 1d keys is much faster than on rows.
+    vertex_count = int(edges.max()) + 1
+    keys = np.unique(edges[:, 0] * vertex_count + edges[:, 1])
+
+    return np.stack([keys // vertex_count, keys % vertex_count], axis=-1)
+
+
+class SpatialHash:
+    """Uniform grid of points, stored as sorted cell keys, to find the points
+    close to many query points at once.
+    """
+
+    def __init__(self, points: np.ndarray, cell_size: float):
+        """
+        :param points: (n, 3) positions to store.
+        :param cell_size: Size of the grid cells, should be at least the
+            largest query radius.
+        """
+        self.points = points
+        self.cell_size = cell_size
+
+        keys = self.get_keys(np.floor(points / cell_size).astype(np.int64))
+        self.order = np.argsort(keys, kind="stable")
+        self.keys, self.starts, counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+        self.ends = self.starts + counts
+
+    @staticmethod
+    def get_keys(cells: np.ndarray) -> np.ndarray:
+        """Hash (n, 3) cell indices into (n,) keys. Collisions only add
+        candidates, which are then filtered by distance.
+        """
+        return (
+            (cells[:, 0] * 73856093)
+            ^ (cells[:, 1] * 19349663)
+            ^ (cells[:, 2] * 83492791)
+        )
+
+    def query_pairs(
+        self,
+        points: np.ndarray,
+        radius: float,
+        offsets: list[tuple[int, int, int]] = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find all stored points within radius of the query points.
+
+        :param points: (m, 3) query positions.
+        :param radius: Search radius, lower or equal to the cell size.
+        :param offsets: Offsets of the cells to search around the cell of
+            each query point. Default is the cell and all its neighbors.
+
+        :returns: Query ids, stored point ids and distances of each pair.
+        """
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        query_ids, point_ids = [], []
+        for offset in offsets or itertools.product((-1, 0, 1), repeat=3):
+            keys = self.get_keys(cells + offset)
+            found = np.searchsorted(self.keys, keys)
+            found = np.minimum(found, len(self.keys) - 1)
+            hits = np.nonzero(self.keys[found] == keys)[0]
+            starts = self.starts[found[hits]]
+            counts = self.ends[found[hits]] - starts
+
+            # Expand each hit cell into the ids of its points.
+            shifts = np.repeat(np.cumsum(counts) - counts - starts, counts)
+            query_ids.append(np.repeat(hits, counts))
+            point_ids.append(self.order[np.arange(counts.sum()) - shifts])
+
+        query_ids = np.concatenate(query_ids)
+        point_ids = np.concatenate(point_ids)
+        distances = np.linalg.norm(
+            points[query_ids] - self.points[point_ids], axis=1
+        )
+        close = distances <= radius
+
+        return query_ids[close], point_ids[close], distances[close]
+
+    def nearest(
+        self, points: np.ndarray, radius: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the nearest stored point of each query point within radius.
+        The cell of each query point is searched first, neighbor cells are
+        only searched when they can contain a nearer point.
+
+        :param points: (m, 3) query positions.
+        :param radius: Search radius, lower or equal to the cell size.
+
+        :returns: (m,) nearest point ids, -1 if none, and (m,) distances, inf
+            if none.
+        """
+        nearest = np.full(len(points), -1, dtype=np.int64)
+        distances = np.full(len(points), np.inf)
+
+        def update(query_ids: np.ndarray, offsets: list[tuple[int, int, int]]):
+            pairs = self.query_pairs(points[query_ids], radius, offsets)
+            # Sort pairs by query then distance, the first pair of each query
+            # is the nearest.
+            order = np.lexsort((pairs[2], pairs[0]))
+            ids, first = np.unique(pairs[0][order], return_index=True)
+            pair_distances = pairs[2][order][first]
+            nearer = pair_distances < distances[query_ids[ids]]
+            ids = query_ids[ids[nearer]]
+            nearest[ids] = pairs[1][order][first][nearer]
+            distances[ids] = pair_distances[nearer]
+
+        update(np.arange(len(points)), [(0, 0, 0)])
+
+        # Distance from each query point to the border of its cell.
+        fractions = points / self.cell_size
+        fractions -= np.floor(fractions)
+        borders = (
+            np.minimum(fractions, 1 - fractions).min(axis=1) * self.cell_size
+        )
+        remaining = np.nonzero((distances > borders) & (borders < radius))[0]
+        if len(remaining):
+            update(
+                remaining,
+                [
+                    offset
+                    for offset in itertools.product((-1, 0, 1), repeat=3)
+                    if offset != (0, 0, 0)
+                ],
+            )
+
+        return nearest, distances
+
+
+def find_contacts(
+    points: np.ndarray,
+    other_points: np.ndarray,
+    other_normals: np.ndarray,
+    threshold: float,
+    other_triangles: np.ndarray = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the points penetrating, or closer than threshold to, another
+    surface. The distance to the surface is the distance to the closest point
+    on the triangles around the nearest other point, signed by the normal
+    interpolated at that closest point.
+
+    Points are first searched within threshold plus the median edge length.
+    The radius then grows for the points not found yet, deep penetrations or
+    points above long edges, up to the bounding box diagonal. Larger radii
+    only search one point and one vertex per cell of an eighth of the radius,
+    so a few long edges or far points don't make every query scan huge cells.
+
+    :param points: (n, 3) positions to test.
+    :param other_points: (m, 3) positions of the other surface.
+    :param other_normals: (m, 3) normals of the other surface.
+    :param threshold: Distance under which a point is in contact.
+    :param other_triangles: (t, 3) vertex ids of the other surface triangles.
+        Their edges give the first search radius. Without them, the distance
+        is approximated by the distance to the tangent plane of the nearest
+        other point, and the first radius is twice the threshold.
+
+    :returns: Ids of the points in contact and their signed distance to the
+        other surface, negative when penetrating.
+    """
+    radius = threshold * 2
+    if other_triangles is not None and len(other_triangles):
+        edges = get_edges(other_triangles)
+        lengths = np.linalg.norm(
+            other_points[edges[:, 0]] - other_points[edges[:, 1]], axis=1
+        )
+        radius = threshold + np.median(lengths)
+    max_radius = np.linalg.norm(np.ptp(other_points, axis=0)) + threshold
+    radius = max(min(radius, max_radius), 1e-9)
+
+    # Points in contact are within threshold of the other surface bounding box.
+    remaining = np.nonzero(
+        np.all(points >= other_points.min(axis=0) - threshold, axis=1)
+        & np.all(points <= other_points.max(axis=0) + threshold, axis=1)
+    )[0]
+    nearest = np.full(len(points), -1, dtype=np.int64)
+    vertex_ids = np.arange(len(other_points))
+    query_ids, inverse = remaining, np.arange(len(remaining))
+    while len(remaining):
+        found, _ = SpatialHash(other_points[vertex_ids], radius).nearest(
+            points[query_ids], radius
+        )
+        found = found[inverse]
+        nearest[remaining[found != -1]] = vertex_ids[found[found != -1]]
+        remaining = remaining[found == -1]
+        if radius >= max_radius or not len(remaining):
+            break
+
+        # Remaining points are farther than the previous radius from every
+        # vertex, an approximate nearest vertex is enough to know on which
+        # side of the surface they are.
+        radius = min(radius * 4, max_radius)
+        vertex_ids, _ = get_cell_representatives(other_points, radius / 8)
+        query_ids, inverse = get_cell_representatives(
+            points[remaining], radius / 8
+        )
+        query_ids = remaining[query_ids]
+
+    point_ids = np.nonzero(nearest != -1)[0]
+    nearest = nearest[point_ids]
+    signed_distances = np.einsum(
+        "ij,ij->i",
+        points[point_ids] - other_points[nearest],
+        other_normals[nearest],
+    )
+    if other_triangles is not None and len(other_triangles):
+        signed_distances = get_triangles_signed_distances(
+            points[point_ids],
+            nearest,
+            other_points,
+            other_normals,
+            other_triangles,
+            signed_distances,
+        )
+    hits = signed_distances < threshold
+
+    return point_ids[hits], signed_distances[hits]
+
+
+def get_triangles_signed_distances(
+    points: np.ndarray,
+    nearest: np.ndarray,
+    other_points: np.ndarray,
+    other_normals: np.ndarray,
+    other_triangles: np.ndarray,
+    default: np.ndarray,
+) -> np.ndarray:
+    """Signed distance of each point to the triangles using its nearest
+    vertex. The closest point on these triangles gives the distance, the
+    normal interpolated at the closest point gives the side.
+
+    :param points: (n, 3) positions.
+    :param nearest: (n,) nearest vertex of each point.
+    :param other_points: (m, 3) positions of the surface.
+    :param other_normals: (m, 3) normals of the surface.
+    :param other_triangles: (t, 3) vertex ids of the surface triangles.
+    :param default: (n,) distance of the points whose nearest vertex isn't
+        used by any triangle.
+
+    :returns: (n,) signed distances, negative behind the surface.
+    """
+    offsets, vertex_triangles = get_vertex_triangles(
+        other_triangles, len(other_points)
+    )
+    counts = offsets[nearest + 1] - offsets[nearest]
+    # One pair per point and triangle using its nearest vertex.
+    pair_points = np.repeat(np.arange(len(points)), counts)
+    pair_starts = np.repeat(
+        offsets[nearest] - np.cumsum(counts) + counts, counts
+    )
+    pair_triangles = vertex_triangles[pair_starts + np.arange(counts.sum())]
+
+    corner_ids = other_triangles[pair_triangles]
+    corners = other_points[corner_ids]
+    closest, bary = closest_points_on_triangles(
+        points[pair_points], corners[:, 0], corners[:, 1], corners[:, 2]
+    )
+    vectors = points[pair_points] - closest
+    distances = np.linalg.norm(vectors, axis=1)
+    normals = np.einsum("ij,ijk->ik", bary, other_normals[corner_ids])
+    distances[np.einsum("ij,ij->i", vectors, normals) < 0] *= -1
+
+    # Keep the closest pair of each point, pairs are sorted by point.
+    order = np.lexsort((np.abs(distances), pair_points))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = pair_points[order][1:] != pair_points[order][:-1]
+    signed_distances = default.copy()
+    signed_distances[pair_points[order][first]] = distances[order][first]
+
+    return signed_distances
+
+
+def get_cell_representatives(
+    points: np.ndarray, cell_size: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Reduce points to one point per cell of a uniform grid.
+
+    :returns: Ids of the first point of each cell, and the index in these ids
+        of the cell of each point.
+    """
+    if not len(points):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    cells = np.floor(points / cell_size).astype(np.int64)
+    cells -= cells.min(axis=0)
+    sizes = cells.max(axis=0) + 1
+    if np.prod(sizes.astype(np.float64)) < 2**62:
+        # Exact keys, unlike the hash keys, colliding cells far from each
+        # other must not be merged.
+        keys = (cells[:, 0] * sizes[1] + cells[:, 1]) * sizes[2] + cells[:, 2]
+        _, representatives, inverse = np.unique(
+            keys, return_index=True, return_inverse=True
+        )
+    else:
+        _, representatives, inverse = np.unique(
+            cells, axis=0, return_index=True, return_inverse=True
+        )
+    return representatives, inverse.ravel()
+
+
+def cluster_vertices(vertex_ids: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Group vertices into regions connected by edges.
+
+    :param vertex_ids: Ids of the vertices to cluster.
+    :param edges: (e, 2) vertex ids pairs of the mesh edges.
+
+    :returns: Region label of each vertex, labels are the smallest vertex id
+        of each region.
+    """
+    if not len(vertex_ids):
+        return np.zeros(0, dtype=np.int64)
+
+    selected = np.zeros(int(max(vertex_ids.max(), edges.max())) + 1, bool)
+    selected[vertex_ids] = True
+    edges = edges[selected[edges[:, 0]] & selected[edges[:, 1]]]
+
+    # Propagate the smallest label through edges until stable.
+    labels = np.arange(len(selected))
+    while True:
+        edge_labels = np.minimum(labels[edges[:, 0]], labels[edges[:, 1]])
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, edges[:, 0], edge_labels)
+        np.minimum.at(new_labels, edges[:, 1], edge_labels)
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    return labels[vertex_ids]
+
+
+def get_view_tangents(
+    focal_lengths: np.ndarray,
+    film_aperture: tuple[float, float],
+    aspect_ratio: float,
+    film_fit: int = 1,
+) -> np.ndarray:
+    """Tangents of the half angles of view of a perspective camera, fitted to
+    the resolution gate like Maya does.
+
+    :param focal_lengths: (f,) focal length of each frame, in millimeters.
+    :param film_aperture: Horizontal and vertical film aperture, in inches.
+    :param aspect_ratio: Width / height of the rendered image.
+    :param film_fit: 0 for fill, 1 for horizontal, 2 for vertical, 3 for
+        overscan.
+
+    :returns: (f, 2) horizontal and vertical tangents.
+    """
+    focal_lengths = np.asarray(focal_lengths, dtype=np.float64)
+    film_aspect = film_aperture[0] / film_aperture[1]
+    if film_fit == 0:
+        film_fit = 1 if film_aspect < aspect_ratio else 2
+    elif film_fit == 3:
+        film_fit = 2 if film_aspect < aspect_ratio else 1
+
+    tangents = np.empty((len(focal_lengths), 2))
+    if film_fit == 1:
+        tangents[:, 0] = film_aperture[0] * 25.4 / 2 / focal_lengths
+        tangents[:, 1] = tangents[:, 0] / aspect_ratio
+    else:
+        tangents[:, 1] = film_aperture[1] * 25.4 / 2 / focal_lengths
+        tangents[:, 0] = tangents[:, 1] * aspect_ratio
+
+    return tangents
+
+
+def get_spheres_visibility(
+    centers: np.ndarray,
+    radii: np.ndarray,
+    view_matrices: np.ndarray,
+    view_tangents: np.ndarray,
+    clip_planes: np.ndarray,
+    min_size: float = 0,
+) -> np.ndarray:
+    """Test spheres against the view frustum of a camera on several frames.
+
+    :param centers: (f, n, 3) world positions of the n spheres on each frame.
+    :param radii: (f, n) radius of the n spheres on each frame.
+    :param view_matrices: (f, 4, 4) world inverse matrix of the camera on each
+        frame, Maya row-major convention. The camera looks down -z.
+    :param view_tangents: (f, 2) returned by get_view_tangents.
+    :param clip_planes: (f, 2) near and far clip distances on each frame.
+    :param min_size: Diameter under which a sphere is considered as invisible,
+        as a fraction of the image width.
+
+    :returns: (f, n) whether each sphere is visible on each frame.
+    """
+    view_matrices = np.asarray(view_matrices, dtype=np.float64)
+    points = np.einsum("fni,fij->fnj", centers, view_matrices[:, :3, :3])
+    points += view_matrices[:, None, 3, :3]
+    depths = -points[..., 2]
+
+    near, far = clip_planes[:, 0, None], clip_planes[:, 1, None]
+    visible = (depths + radii > near) & (depths - radii < far)
+    for axis in range(2):
+        tangents = view_tangents[:, axis, None]
+        # Signed distance to the side plane, whose normal is (1, -tangent)
+        # in the (side, depth) plane.
+        distances = np.abs(points[..., axis]) - depths * tangents
+        visible &= distances / np.sqrt(1 + tangents**2) < radii
+
+    # Diameter over image width at the sphere depth, spheres around the
+    # camera fill the image.
+    half_widths = np.maximum(depths, 1e-9) * view_tangents[:, 0, None]
+    sizes = np.where(depths > radii, radii / half_widths, np.inf)
+
+    return visible & (sizes >= min_size)
+
+
+def get_step_keys(values: np.ndarray) -> np.ndarray:
+    """Returns the indexes of the values which differ from the previous one,
+    always including the first one. These are the only keys needed by a
+    stepped animCurve.
+    """
+    values = np.asarray(values)
+    if not len(values):
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate([[0], np.nonzero(values[1:] != values[:-1])[0] + 1])
+
+
+def reduce_keys(
+    times: np.ndarray, values: np.ndarray, tolerance: float
+) -> np.ndarray:
+    """Find the keys to keep so the linear interpolation between them stays
+    within tolerance of every sample.
+
+    Each segment starts on the last kept key and is extended as far as
+    possible, its length growing exponentially then refined by bisection, so
+    long flat or linear runs only need a few vectorized checks.
+
+    :param times: (f,) increasing sample times.
+    :param values: (f,) sample values.
+    :param tolerance: Maximum absolute error of the reduced curve.
+
+    :returns: Indexes of the kept keys, always including the first and last.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    last = len(values) - 1
+    if last < 1:
+        return np.arange(len(values))
+
+    def fits(start: int, end: int) -> bool:
+        weights = (times[start : end + 1] - times[start]) / (
+            times[end] - times[start]
+        )
+        line = values[start] + weights * (values[end] - values[start])
+        return np.abs(values[start : end + 1] - line).max() <= tolerance
+
+    kept = [0]
+    start = 0
+    while start < last:
+        # Grow the segment until it fails, then bisect the failing step.
+        good, step = start + 1, 1
+        while good < last:
+            end = min(start + step * 2, last)
+            if not fits(start, end):
+                bad = end
+                while bad - good > 1:
+                    middle = (good + bad) // 2
+                    if fits(start, middle):
+                        good = middle
+                    else:
+                        bad = middle
+                break
+            good, step = end, step * 2
+        kept.append(good)
+        start = good
+
+    return np.array(kept)
+
+
+def get_surface_distances(
+    points: np.ndarray,
+    edges: np.ndarray,
+    seed: int,
+    seed_distance: float,
+    max_distance: float,
+) -> np.ndarray:
+    """Approximate the distances along the surface from a seed vertex, as the
+    shortest paths through the mesh edges.
+
+    Paths are searched with Dijkstra's algorithm, stopping at max_distance,
+    only among the vertices around the seed since a path is never shorter
+    than the straight distance.
+
+    :param points: (n, 3) vertex positions.
+    :param edges: (e, 2) vertex ids pairs of the mesh edges.
+    :param seed: Vertex the paths start from.
+    :param seed_distance: Distance of the seed vertex itself.
+    :param max_distance: Distance beyond which vertices are not reached.
+
+    :returns: (n,) distance of each vertex, inf if farther than max_distance.
+    """
+    distances = np.full(len(points), np.inf)
+    if seed_distance > max_distance:
+        return distances
+
+    # Search on the vertices around the seed only, with local ids.
+    near_ids = np.nonzero(
+        np.linalg.norm(points - points[seed], axis=1) <= max_distance
+    )[0]
+    local_ids = np.full(len(points), -1)
+    local_ids[near_ids] = np.arange(len(near_ids))
+    edges = local_ids[edges]
+    edges = edges[(edges != -1).all(axis=1)]
+    lengths = np.linalg.norm(
+        points[near_ids[edges[:, 0]]] - points[near_ids[edges[:, 1]]], axis=1
+    )
+
+    # Neighbours of each vertex, as ranges of the half edges sorted by start.
+    half_edges = np.concatenate([edges, edges[:, ::-1]])
+    order = np.argsort(half_edges[:, 0], kind="stable")
+    neighbours = half_edges[order, 1].tolist()
+    neighbour_lengths = np.concatenate([lengths, lengths])[order].tolist()
+    starts = np.searchsorted(
+        half_edges[order, 0], np.arange(len(near_ids) + 1)
+    ).tolist()
+
+    local_distances = [np.inf] * len(near_ids)
+    local_distances[local_ids[seed]] = seed_distance
+    heap = [(seed_distance, int(local_ids[seed]))]
+    while heap:
+        distance, vertex = heapq.heappop(heap)
+        if distance > local_distances[vertex]:
+            continue
+        for i in range(starts[vertex], starts[vertex + 1]):
+            other_distance = distance + neighbour_lengths[i]
+            other = neighbours[i]
+            if (
+                other_distance <= max_distance
+                and other_distance < local_distances[other]
+            ):
+                local_distances[other] = other_distance
+                heapq.heappush(heap, (other_distance, other))
+    distances[near_ids] = local_distances
+
+    return distances
+
+
+def get_level_ranges(
+    sorted_distances: np.ndarray,
+    radius: float,
+    previous_count: int,
+    level_count: int,
+) -> tuple[int, np.ndarray]:
+    """Quantize the sorted distances within radius into levels, for vertex
+    colors written one range of vertices per level.
+
+    :param sorted_distances: (n,) increasing distances of the vertices.
+    :param radius: Distance mapped to the last level.
+    :param previous_count: Number of vertices within the previous radius,
+        those farther than radius get level_count, the outside level.
+    :param level_count: Number of levels within radius.
+
+    :returns: Number of vertices within radius, and (r, 3) level, start and
+        end of each range of vertices to write, in sorted order.
+    """
+    count = int(np.searchsorted(sorted_distances, radius, "right"))
+    changed = max(count, previous_count)
+    levels = np.full(changed, level_count)
+    if radius > 0:
+        levels[:count] = np.rint(
+            sorted_distances[:count] / radius * (level_count - 1)
+        )
+
+    # Levels increase with the distances, so each level is one range.
+    bounds = np.searchsorted(levels, np.arange(level_count + 2))
+    used = np.nonzero(np.diff(bounds))[0]
+
+    return count, np.stack([used, bounds[used], bounds[used + 1]], axis=-1)
+
+
+def get_surface_frames(
+    corners: np.ndarray, weights: np.ndarray, tangent_weights: np.ndarray
+) -> np.ndarray:
+    """Matrices of points on triangles, with the triangle normal as Y axis and
+    its U tangent as X axis, like a uvPin with normalAxis Y.
+
+    :param corners: (n, 3, 3) corners of each triangle.
+    :param weights: (n, 3) barycentric weights of each point.
+    :param tangent_weights: (n, 2) weights of the edges giving the U tangent,
+        see get_tangent_weights.
+
+    :returns: (n, 4, 4) row major matrices.
+    """
+    edges_1 = corners[:, 1] - corners[:, 0]
+    edges_2 = corners[:, 2] - corners[:, 0]
+    normals = normalize(np.cross(edges_1, edges_2))
+    tangents = (
+        edges_1 * tangent_weights[:, :1] + edges_2 * tangent_weights[:, 1:]
+    )
+    tangents -= normals * np.einsum("ij,ij->i", tangents, normals)[:, None]
+    tangents = normalize(tangents)
+
+    frames = np.zeros((len(corners), 4, 4))
+    frames[:, 0, :3] = tangents
+    frames[:, 1, :3] = normals
+    frames[:, 2, :3] = np.cross(tangents, normals)
+    frames[:, 3, :3] = np.einsum("ij,ijk->ik", weights, corners)
+    frames[:, 3, 3] = 1
+
+    return frames
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Returns the (n, 3) vectors normalized, null vectors stay null."""
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(
+        vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0
+    )
+
+
+def project_on_mesh(
+    points: np.ndarray,
+    normals: np.ndarray,
+    mesh_points: np.ndarray,
+    triangles: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized closest point of many points on a mesh. Triangles facing
+    away from the normal of a point are penalized, so points on thin shells
+    don't jump to the opposite side.
+
+    Candidate triangles are the ones using a vertex within twice the longest
+    edge of each point, found with a SpatialHash. The radius grows for the
+    points farther from the surface than the longest edge.
+
+    :param points: (n, 3) positions to project.
+    :param normals: (n, 3) surface normals at the points.
+    :param mesh_points: (v, 3) vertex positions of the mesh.
+    :param triangles: (t, 3) vertex ids of each triangle.
+
+    :returns: (n,) triangle ids, (n, 3) barycentric weights and (n,)
+        distances of the projections.
+    """
+    corners = mesh_points[triangles]
+    triangle_normals = normalize(
+        np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    )
+    max_edge = np.linalg.norm(
+        corners - np.roll(corners, 1, axis=1), axis=-1
+    ).max()
+
+    hits = np.full(len(points), -1, dtype=np.int64)
+    weights = np.zeros((len(points), 3))
+    distances = np.full(len(points), np.inf)
+    scores = np.full(len(points), np.inf)
+
+    def update(query_ids: np.ndarray, triangle_ids: np.ndarray):
+        closest, bary = closest_points_on_triangles(
+            points[query_ids],
+            corners[triangle_ids, 0],
+            corners[triangle_ids, 1],
+            corners[triangle_ids, 2],
+        )
+        pair_distances = np.linalg.norm(closest - points[query_ids], axis=1)
+        facing = np.einsum(
+            "ij,ij->i", triangle_normals[triangle_ids], normals[query_ids]
+        )
+        # Distances are up to three times longer on opposite triangles.
+        pair_scores = pair_distances * (2 - facing)
+
+        # The first pair of each query, sorted by score, is the best.
+        order = np.lexsort((pair_scores, query_ids))
+        ids, first = np.unique(query_ids[order], return_index=True)
+        best = order[first]
+        better = pair_scores[best] < scores[ids]
+        ids, best = ids[better], best[better]
+        hits[ids] = triangle_ids[best]
+        weights[ids] = bary[best]
+        distances[ids] = pair_distances[best]
+        scores[ids] = pair_scores[best]
+
+    # Expand each vertex into the triangles using it.
+    offsets, vertex_triangles = get_vertex_triangles(
+        triangles, len(mesh_points)
+    )
+    diagonal = np.linalg.norm(np.ptp(mesh_points, axis=0))
+    radius = max(max_edge * 2, 1e-6)
+    remaining = np.arange(len(points))
+    while len(remaining) and radius <= diagonal * 2:
+        query_ids, vertex_ids, _ = SpatialHash(mesh_points, radius).query_pairs(
+            points[remaining], radius
+        )
+        starts = offsets[vertex_ids]
+        counts = offsets[vertex_ids + 1] - starts
+        shifts = np.repeat(np.cumsum(counts) - counts - starts, counts)
+        keys = np.unique(
+            remaining[np.repeat(query_ids, counts)] * len(triangles)
+            + vertex_triangles[np.arange(counts.sum()) - shifts]
+        )
+        if len(keys):
+            update(keys // len(triangles), keys % len(triangles))
+
+        # The triangle of the closest point only has a vertex within radius
+        # if that point is closer than radius minus the longest edge.
+        remaining = remaining[distances[remaining] > radius - max_edge]
+        radius *= 4
+
+    for query_id in remaining:
+        update(np.full(len(triangles), query_id), np.arange(len(triangles)))
+
+    return hits, weights, distances
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import contextlib
+
+import numpy as np
+from maya import cmds
+from maya.api import OpenMaya as om
+
+from sticky_controller import utils
+from sticky_controller.core import log, animation, geometry, sticky
+
+# Callbacks restoring full quality for playblasts, renders and saved files.
+_CALLBACK_IDS: list[int] = []
+# Callbacks reconnecting the LOD of opened scenes, saved at full quality.
+_SCENE_CALLBACK_IDS: list[int] = []
+
+
+def get_active_camera() -> str | None:
+    """Returns the camera of the focused viewport, or of the first visible
+    one.
+    """
+    panels = [cmds.getPanel(withFocus=True)]
+    panels.extend(cmds.getPanel(visiblePanels=True) or [])
+    for panel in panels:
+        if panel and cmds.getPanel(typeOf=panel) == "modelPanel":
+            return cmds.modelPanel(panel, query=True, camera=True)
+
+    return None
+
+
+def get_camera_shape(camera: str) -> str:
+    """Returns the shape of a camera transform, or the camera shape itself."""
+    return cmds.ls(camera, dagObjects=True, type="camera")[0]
+
+
+def get_lod_node(soft_mod: str) -> str | None:
+    """Returns the multDoubleLinear driving the envelope of the sticky, if
+    its LOD has been computed.
+    """
+    if not cmds.attributeQuery("lod_node", node=soft_mod, exists=True):
+        return None
+    nodes = cmds.listConnections(
+        f"{soft_mod}.lod_node", source=True, destination=False
+    )
+    return nodes[0] if nodes else None
+
+
+def get_envelope(soft_mod: str) -> float:
+    """Returns the envelope of the sticky, regardless of its LOD."""
+    if get_lod_node(soft_mod):
+        return cmds.getAttr(f"{soft_mod}.lod_envelope")
+    return cmds.getAttr(f"{soft_mod}.envelope")
+
+
+def set_envelope(soft_mod: str, value: float):
+    """Set the envelope of the sticky, kept through its LOD."""
+    if get_lod_node(soft_mod):
+        cmds.setAttr(f"{soft_mod}.lod_envelope", value)
+        if not cmds.listConnections(
+            f"{soft_mod}.envelope", source=True, destination=False
+        ):
+            cmds.setAttr(f"{soft_mod}.envelope", value)
+    else:
+        cmds.setAttr(f"{soft_mod}.envelope", value)
+
+
+def sample_visibility(
+    soft_mods: list[str], camera: str, start: int, end: int, min_size: float
+) -> tuple[list[int], np.ndarray]:
+    """Find on which frames each sticky is visible from the camera.
+
+    The falloff sphere of every sticky and the camera are sampled in a single
+    traversal of time, the frustum test is then done on all frames at once.
+    The sphere is centered on the slide_ctrl and grows by the distance of the
+    ctrl, which can drag the vertices that far.
+
+    :param soft_mods: SoftMods of the stickies.
+    :param camera: Camera transform or shape.
+    :param start: First frame of the range.
+    :param end: Last frame of the range.
+    :param min_size: Diameter, in pixels, under which a sticky is considered
+        as invisible.
+
+    :returns: Frames, and (f, n) visibility of each sticky on each frame.
+    """
+    shape = get_camera_shape(camera)
+    plugs = [
+        f"{shape}.worldInverseMatrix[0]",
+        f"{shape}.focalLength",
+        f"{shape}.nearClipPlane",
+        f"{shape}.farClipPlane",
+    ]
+    for soft_mod in soft_mods:
+        slide_ctrl, ctrl = sticky.get_sticky_controllers(soft_mod)
+        plugs.extend(
+            [
+                f"{slide_ctrl}.worldMatrix[0]",
+                f"{ctrl}.worldMatrix[0]",
+                f"{soft_mod}.falloffRadius",
+            ]
+        )
+
+    frames = list(range(int(start), int(end) + 1))
+    samples = animation.sample_plugs(plugs, frames)
+    view_matrices = np.array([sample[0] for sample in samples])
+    focal_lengths = [sample[1] for sample in samples]
+    clip_planes = np.array([sample[2:4] for sample in samples])
+    centers = np.array([sample[4::3] for sample in samples])[..., 12:15]
+    offsets = np.array([sample[5::3] for sample in samples])[..., 12:15]
+    radii = np.array([sample[6::3] for sample in samples])
+    radii += np.linalg.norm(offsets - centers, axis=-1)
+
+    width = cmds.getAttr("defaultResolution.width")
+    height = cmds.getAttr("defaultResolution.height")
+    view_tangents = geometry.get_view_tangents(
+        focal_lengths,
+        (
+            cmds.getAttr(f"{shape}.horizontalFilmAperture"),
+            cmds.getAttr(f"{shape}.verticalFilmAperture"),
+        ),
+        width / height,
+        cmds.getAttr(f"{shape}.filmFit"),
+    )
+    visibility = geometry.get_spheres_visibility(
+        centers,
+        radii,
+        view_matrices.reshape(-1, 4, 4),
+        view_tangents,
+        clip_planes,
+        min_size / width,
+    )
+
+    return frames, visibility
+
+
+@utils.undoable
+def apply_lod(
+    soft_mods: list[str],
+    camera: str,
+    start: int,
+    end: int,
+    min_size: float = 4,
+):
+    """Switch off the stickies on the frames they are outside of the camera
+    frustum or smaller than min_size on screen.
+
+    The envelope of each sticky is driven by a stepped animCurve, multiplied
+    by its envelope value stored in "lod_envelope". Full quality is restored
+    while playblasting, rendering with Maya Software and saving the scene,
+    see add_callbacks for the other renders.
+
+    :param soft_mods: SoftMods of the stickies.
+    :param camera: Camera transform or shape.
+    :param start: First frame of the range.
+    :param end: Last frame of the range.
+    :param min_size: Diameter, in pixels, under which a sticky is switched
+        off.
+    """
+    if cmds.getAttr(f"{get_camera_shape(camera)}.orthographic"):
+        log.warning(f"-{camera}- is orthographic, LOD is not applied !")
+        return
+
+    remove_lod(soft_mods)
+    driven = [
+        soft_mod
+        for soft_mod in soft_mods
+        if cmds.listConnections(
+            f"{soft_mod}.envelope", source=True, destination=False
+        )
+    ]
+    for soft_mod in driven:
+        log.warning(f"-{soft_mod}- envelope is driven, LOD is not applied !")
+    soft_mods = [soft_mod for soft_mod in soft_mods if soft_mod not in driven]
+    if not soft_mods:
+        return
+
+    frames, visibility = sample_visibility(
+        soft_mods, camera, start, end, min_size
+    )
+    for soft_mod, visible in zip(soft_mods, visibility.T):
+        cmds.addAttr(soft_mod, longName="lod_node", attributeType="message")
+        cmds.addAttr(soft_mod, longName="lod_envelope", attributeType="double")
+        cmds.setAttr(
+            f"{soft_mod}.lod_envelope", cmds.getAttr(f"{soft_mod}.envelope")
+        )
+
+        mdl = cmds.createNode("multDoubleLinear", name=f"{soft_mod}_lod_mdl")
+        cmds.connectAttr(f"{mdl}.message", f"{soft_mod}.lod_node")
+        cmds.connectAttr(f"{soft_mod}.lod_envelope", f"{mdl}.input2")
+        keys = geometry.get_step_keys(visible)
+        animation.create_anim_curve(
+            f"{mdl}.input1",
+            {
+                "times": [frames[i] for i in keys],
+                "values": visible[keys].astype(float).tolist(),
+                "in_tangents": ["linear"] * len(keys),
+                "out_tangents": ["step"] * len(keys),
+            },
+        )
+        cmds.connectAttr(f"{mdl}.output", f"{soft_mod}.envelope")
+        log.info(
+            f"-{soft_mod}- is switched off on "
+            f"{int(np.count_nonzero(~visible))}/{len(frames)} frames."
+        )
+
+    add_callbacks()
+
+
+@utils.undoable
+def remove_lod(soft_mods: list[str] = None):
+    """Delete the LOD of the stickies and restore their envelope.
+
+    :param soft_mods: SoftMods of the stickies. Default is every sticky.
+    """
+    soft_mods = soft_mods or cmds.ls(type="softMod")
+    for soft_mod in soft_mods:
+        mdl = get_lod_node(soft_mod)
+        if not mdl:
+            continue
+        envelope = cmds.getAttr(f"{soft_mod}.lod_envelope")
+        cmds.delete(mdl, animation.get_anim_curve(f"{mdl}.input1"))
+        cmds.deleteAttr(f"{soft_mod}.lod_node")
+        cmds.deleteAttr(f"{soft_mod}.lod_envelope")
+        cmds.setAttr(f"{soft_mod}.envelope", envelope)
+
+    if not has_lod():
+        remove_callbacks()
+
+
+def has_lod() -> bool:
+    """Returns whether any sticky of the scene has a LOD."""
+    return any(get_lod_node(soft_mod) for soft_mod in cmds.ls(type="softMod"))
+
+
+def set_lod_enabled(enabled: bool):
+    """Connect or disconnect the LOD of every sticky, without recording it in
+    the undo queue nor marking the scene as modified. Disconnected stickies
+    are at full quality.
+    """
+    modified = cmds.file(query=True, modified=True)
+    with utils.without_undo():
+        for soft_mod in cmds.ls(type="softMod"):
+            mdl = get_lod_node(soft_mod)
+            if not mdl:
+                continue
+            connected = cmds.isConnected(
+                f"{mdl}.output", f"{soft_mod}.envelope"
+            )
+            if enabled and not connected:
+                cmds.connectAttr(f"{mdl}.output", f"{soft_mod}.envelope")
+            elif not enabled and connected:
+                cmds.disconnectAttr(f"{mdl}.output", f"{soft_mod}.envelope")
+                cmds.setAttr(
+                    f"{soft_mod}.envelope",
+                    cmds.getAttr(f"{soft_mod}.lod_envelope"),
+                )
+    # Reconnecting after a save must not ask to save the scene again.
+    cmds.file(modified=modified)
+
+
+@contextlib.contextmanager
+def full_quality():
+    """Context manager disconnecting the LOD of every sticky, for renders
+    which are not restored by the callbacks (Arnold RenderView, IPR, other
+    renderers' interactive renders) or scripts exporting the deformation.
+    """
+    set_lod_enabled(False)
+    try:
+        yield
+    finally:
+        if has_lod():
+            set_lod_enabled(True)
+
+
+def _on_full_quality(*_):
+    set_lod_enabled(False)
+
+
+def _on_lod(*_):
+    set_lod_enabled(True)
+
+
+def _on_playblasting(state, *_):
+    set_lod_enabled(not state)
+
+
+def restore_lod(*_):
+    """Reconnect the LOD of the stickies of the current scene, which is
+    saved disconnected, and add the callbacks restoring full quality.
+    """
+    if has_lod():
+        set_lod_enabled(True)
+        add_callbacks()
+
+
+def start():
+    """Restore the LOD of the current scene, then of every opened scene."""
+    add_scene_callbacks()
+    restore_lod()
+
+
+def add_scene_callbacks():
+    """Move the callbacks of add_callbacks from the closed scene to the
+    opened one, and restore its LOD.
+    """
+    if _SCENE_CALLBACK_IDS:
+        return
+
+    for message, function in [
+        (om.MSceneMessage.kBeforeNew, remove_callbacks),
+        (om.MSceneMessage.kBeforeOpen, remove_callbacks),
+        (om.MSceneMessage.kAfterOpen, restore_lod),
+    ]:
+        _SCENE_CALLBACK_IDS.append(
+            om.MSceneMessage.addCallback(message, function)
+        )
+
+
+def add_callbacks():
+    """Restore full quality while playblasting, rendering with Maya Software
+    and saving or exporting, so batch renders of the saved scene are never
+    affected.
+
+    Maya doesn't send any message for the interactive renders of other
+    renderers, like Arnold RenderView or IPR, those render the LOD. Use
+    full_quality, or remove the LOD, before them.
+    """
+    add_scene_callbacks()
+    if _CALLBACK_IDS:
+        return
+
+    _CALLBACK_IDS.append(
+        om.MConditionMessage.addConditionCallback(
+            "playblasting", _on_playblasting
+        )
+    )
+    for before, after in [
+        (om.MSceneMessage.kBeforeSave, om.MSceneMessage.kAfterSave),
+        (om.MSceneMessage.kBeforeExport, om.MSceneMessage.kAfterExport),
+        (
+            om.MSceneMessage.kBeforeSoftwareRender,
+            om.MSceneMessage.kAfterSoftwareRender,
+        ),
+    ]:
+        _CALLBACK_IDS.append(
+            om.MSceneMessage.addCallback(before, _on_full_quality)
+        )
+        _CALLBACK_IDS.append(om.MSceneMessage.addCallback(after, _on_lod))
+
+
+def remove_callbacks(*_):
+    """Remove the callbacks added by add_callbacks."""
+    if _CALLBACK_IDS:
+        om.MMessage.removeCallbacks(_CALLBACK_IDS)
+        _CALLBACK_IDS.clear()
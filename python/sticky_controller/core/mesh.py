@@ -1,8 +1,24 @@
 from __future__ import annotations
 
+import hashlib
+from typing import Callable
+
+import numpy as np
 from maya import cmds
+from maya.api import OpenMaya as om
 
 from sticky_controller import utils
+from sticky_controller.core import geometry, query_cache
+
+
+def get_shape(transform: str) -> str | None:
+    """Returns the first shape of transform which is not an intermediate
+    object.
+    """
+    shapes = query_cache.list_relatives(
+        transform, shapes=True, noIntermediate=True, path=True
+    )
+    return shapes[0] if shapes else None
 
 
 def get_shape_deformed(transform: str, create: bool = True) -> str | None:
@@ -14,7 +30,7 @@ def get_shape_deformed(transform: str, create: bool = True) -> str | None:
 
     :returns: The deformed shape DagNode or None.
     """
-    shapes = cmds.listRelatives(transform, shapes=True, path=True)
+    shapes = query_cache.list_relatives(transform, shapes=True, path=True)
     if len(shapes) != 1:
         for shape in shapes:
             if not cmds.getAttr(f"{shape}.intermediateObject"):
@@ -32,14 +48,20 @@ def create_shape_deformed(transform: str) -> str:
     """
     original_shape = get_original_shape(transform)
 
-    if cmds.referenceQuery(transform, isNodeReferenced=True):
+    if query_cache.is_referenced(transform):
         shape_deformed = f"{transform.split(':')[-1]}ShapeDeformed"
-        shape_deformed = duplicate_shape(transform, name=shape_deformed)
+        shape_deformed = duplicate_shape(
+            transform, shape_deformed, original_shape, copy_shading=True
+        )
     else:
         shape_deformed = original_shape
-        original_shape = duplicate_shape(transform, f"{transform}ShapeOrig")
+        original_shape = duplicate_shape(
+            transform, f"{transform}ShapeOrig", original_shape
+        )
 
     cmds.setAttr(f"{original_shape}.intermediateObject", True)
+    # Cached listRelatives(noIntermediate=True) of the transform changed.
+    query_cache.invalidate(transform)
 
     return shape_deformed
 
@@ -57,20 +79,20 @@ def get_original_shape(transform: str) -> str:
 
     :raises RuntimeError: If no shapes found.
     """
-    shapes = cmds.listRelatives(transform, shapes=True, path=True)
+    shapes = query_cache.list_relatives(transform, shapes=True, path=True)
     if not shapes:
         raise RuntimeError(f"Node -{transform}- doesn't have any shape !")
 
-    if cmds.referenceQuery(transform, isNodeReferenced=True):
+    if query_cache.is_referenced(transform):
         for shape in shapes:
-            if cmds.referenceQuery(shape, isNodeReferenced=True):
+            if query_cache.is_referenced(shape):
                 # Referenced shape is the original shape.
                 return shape
 
     # For non referenced geometries.
     orig_shapes = []
     for shape in shapes:
-        if not cmds.listConnections(
+        if not query_cache.list_connections(
             f"{shape}.inMesh", source=True, destination=False
         ):
             # No input in inMesh attribute means its the original shape.
@@ -96,9 +118,10 @@ def get_deformers(mesh: str, deformer_types: list[str] = None) -> list[str]:
     common_types = 1 if not deformer_types else 2
     deformer_types.insert(0, "geometryFilter")
 
+    shapes = query_cache.list_relatives(mesh, shapes=True, path=True)
     deformers = []
-    for node in cmds.listHistory(mesh):
-        node_types = cmds.nodeType(node, inherited=True)
+    for node in query_cache.list_history(mesh):
+        node_types = query_cache.node_type(node, inherited=True)
         if not utils.has_common_members(
             node_types, deformer_types, common_types
         ):
@@ -107,13 +130,12 @@ def get_deformers(mesh: str, deformer_types: list[str] = None) -> list[str]:
 
         # Wrap deformer has no originalGeo attribute, we then get geoMatrix.
         orig_attr = "geomMatrix" if "wrap" in node_types else "originalGeometry"
-        orig_geos = cmds.listConnections(
+        orig_geos = query_cache.list_connections(
             f"{node}.{orig_attr}", source=True, shapes=True
         )
         if not orig_geos:
             # if no input connections in originalGeo or geomMatrix.
             continue
-        shapes = cmds.listRelatives(mesh, shapes=True, path=True)
         if not utils.has_common_members(orig_geos, shapes):
             # Check if any shapes are in originalGeos. This way we can get the
             # deformer even if there are duplicated deformed shapes.
@@ -147,14 +169,155 @@ def get_uv_coordinates(
     return u, v
 
 
-def duplicate_shape(transform: str, name: str) -> str:
-    """Duplicates the first shape of transform and parent it directly under
-    it. Returns the new shape.
+def duplicate_shape(
+    transform: str, name: str, shape: str = None, copy_shading: bool = False
+) -> str:
+    """Duplicates a shape of transform and parent it directly under it.
+    Returns the new shape.
+
+    Only the mesh data of the shape is copied in a new mesh node, instead of
+    duplicating the whole transform with all its shapes and children.
+
+    :param transform: Transform of the shape.
+    :param name: Name of the new shape.
+    :param shape: Shape to duplicate, default is the first shape of transform.
+    :param copy_shading: Assign the shading of shape to the new shape.
     """
-    dup = cmds.duplicate(transform)
-    new_shape = cmds.listRelatives(dup, shapes=True, path=True)[0]
-    new_shape = cmds.rename(new_shape, name)
-    cmds.parent(new_shape, transform, relative=True, shape=True)
-    cmds.delete(dup)
+    shape = shape or cmds.listRelatives(transform, shapes=True, path=True)[0]
+    new_shape = cmds.createNode("mesh", name=name, parent=transform)
+
+    # Pull the mesh data once through a temporary connection.
+    cmds.connectAttr(f"{shape}.outMesh", f"{new_shape}.inMesh")
+    cmds.dgeval(f"{new_shape}.outMesh")
+    cmds.disconnectAttr(f"{shape}.outMesh", f"{new_shape}.inMesh")
+
+    if copy_shading:
+        copy_shading_assignment(shape, new_shape)
 
     return new_shape
+
+
+def copy_shading_assignment(source: str, target: str):
+    """Assign to target mesh the shading engines of source mesh, for the whole
+    mesh or per face.
+    """
+    source_path = cmds.ls(source, long=True)
+    shading_engines = cmds.listConnections(
+        source, type="shadingEngine", source=False, destination=True
+    )
+    for shading_engine in set(shading_engines or []):
+        for member in cmds.sets(shading_engine, query=True) or []:
+            if cmds.ls(member, objectsOnly=True, long=True) != source_path:
+                # Member of another mesh.
+                continue
+            component = member.split(".", 1)[1] if "." in member else ""
+            cmds.sets(
+                f"{target}.{component}" if component else target,
+                edit=True,
+                forceElement=shading_engine,
+            )
+
+
+def get_mesh_fn(shape: str) -> om.MFnMesh:
+    """Returns the MFnMesh of given mesh shape."""
+    return om.MFnMesh(om.MSelectionList().add(shape).getDagPath(0))
+
+
+def get_world_mesh_fn(shape: str, frame: float = None) -> om.MFnMesh:
+    """Returns the MFnMesh of the world mesh data of a shape, evaluated at
+    given frame without changing the current time.
+
+    :param shape: Mesh shape.
+    :param frame: Frame at which the mesh is evaluated, current frame if None.
+    """
+    plug = om.MSelectionList().add(f"{shape}.worldMesh[0]").getPlug(0)
+    if frame is None:
+        return om.MFnMesh(plug.asMObject())
+
+    context = om.MDGContext(om.MTime(frame, om.MTime.uiUnit()))
+    with om.MDGContextGuard(context):
+        return om.MFnMesh(plug.asMObject())
+
+
+def get_points(shape: str, space: int = om.MSpace.kWorld) -> np.ndarray:
+    """Returns the (n, 3) positions of all the vertices of a mesh.
+
+    :param shape: Mesh shape.
+    :param space: MSpace in which positions are returned.
+    """
+    return np.array(get_mesh_fn(shape).getPoints(space))[:, :3]
+
+
+def get_points_reader(
+    mesh_fn: om.MFnMesh, space: int = om.MSpace.kObject
+) -> Callable[[np.ndarray], np.ndarray]:
+    """Returns a function reading the positions of given vertex ids. Only
+    the asked vertices are read, except when all of them are asked.
+    """
+
+    def get_points(vertex_ids: np.ndarray) -> np.ndarray:
+        if len(vertex_ids) == mesh_fn.numVertices:
+            return np.array(mesh_fn.getPoints(space))[:, :3]
+        points = [mesh_fn.getPoint(int(i), space) for i in vertex_ids]
+        return np.array(points)[:, :3]
+
+    return get_points
+
+
+def get_topology_hash(shape: str) -> str:
+    """Returns a hash of the polygons vertex ids of a mesh, identical for all
+    the meshes sharing the same topology.
+    """
+    poly_counts, poly_vertices = get_mesh_fn(shape).getVertices()
+    topology = hashlib.sha1(np.array(poly_counts, dtype=np.int64).tobytes())
+    topology.update(np.array(poly_vertices, dtype=np.int64).tobytes())
+
+    return topology.hexdigest()
+
+
+def get_points_hash(shape: str, space: int = om.MSpace.kObject) -> str:
+    """Returns a hash of the vertex positions of a mesh."""
+    return hashlib.sha1(get_points(shape, space).tobytes()).hexdigest()
+
+
+def get_triangulation_arrays(
+    shape: str, triangles: bool = True
+) -> dict[str, np.ndarray]:
+    """Read the arrays the triangulation of a mesh is computed from, see
+    geometry.get_triangle_uvs. Reading must be done on the main thread, the
+    computation can be done in any thread.
+
+    :param shape: Mesh shape.
+    :param triangles: Read the triangles, the slowest read. Without them the
+        arrays can only be used to check if the topology or uvs changed.
+    """
+    fn = get_mesh_fn(shape)
+    poly_counts, poly_vertices = fn.getVertices()
+    uv_counts, uv_ids = fn.getAssignedUVs()
+    us, vs = fn.getUVs()
+    arrays = {
+        "poly_counts": np.array(poly_counts, dtype=np.int64),
+        "poly_vertices": np.array(poly_vertices, dtype=np.int64),
+        "uv_counts": np.array(uv_counts, dtype=np.int64),
+        "uv_ids": np.array(uv_ids, dtype=np.int64),
+        "uvs": np.stack(
+            [np.array(us, dtype=np.float64), np.array(vs, dtype=np.float64)],
+            axis=-1,
+        ),
+    }
+    if triangles:
+        tri_counts, tri_vertices = fn.getTriangles()
+        arrays["tri_counts"] = np.array(tri_counts, dtype=np.int64)
+        arrays["tri_vertices"] = np.array(tri_vertices, dtype=np.int64)
+
+    return arrays
+
+
+def get_triangles(shape: str) -> tuple[np.ndarray, np.ndarray]:
+    """Get the triangulation of a mesh with the uv of each triangle corner.
+
+    :param shape: Mesh shape.
+
+    :returns: (t, 3) vertex ids and (t, 3, 2) uvs of each triangle.
+    """
+    return geometry.get_triangle_uvs(**get_triangulation_arrays(shape))
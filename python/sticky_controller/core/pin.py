@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+from maya import cmds
+from maya.api import OpenMaya as om
+
+from sticky_controller import utils
+from sticky_controller.core import (
+    log,
+    animation,
+    geometry,
+    mesh,
+    precompute,
+    query_cache,
+    sticky,
+)
+
+PLUGIN = "sticky_barycentric_pin"
+# The barycentric pin is opt-in, stickies are pinned with their uvPin unless
+# this environment variable is set to 1.
+ENABLE_VARIABLE = "STICKY_CONTROLLER_BARYCENTRIC_PIN"
+
+UV = "uv"
+BARYCENTRIC = "barycentric"
+
+
+def is_barycentric_pin_enabled() -> bool:
+    """Returns True if the barycentric pin is enabled, see ENABLE_VARIABLE."""
+    return os.environ.get(ENABLE_VARIABLE, "0") == "1"
+
+
+def load_plugin():
+    """Load the plug-in of the barycentric pin node, if needed."""
+    if not cmds.pluginInfo(PLUGIN, query=True, loaded=True):
+        path = utils.get_package_root().joinpath("plugins", f"{PLUGIN}.py")
+        cmds.loadPlugin(path.as_posix(), quiet=True)
+
+
+def get_pin_multiply(soft_mod: str) -> str | None:
+    """Returns the multMatrix placing the slide_ctrl on the pin matrix."""
+    slide_ctrl, _ = sticky.get_sticky_controllers(soft_mod)
+    if not slide_ctrl:
+        return None
+    slide_orig = query_cache.list_relatives(slide_ctrl, parent=True, path=True)
+    mmtx = query_cache.list_connections(
+        f"{slide_orig[0]}.offsetParentMatrix", source=True, destination=False
+    )
+    return mmtx[0] if mmtx else None
+
+
+def get_pin_mode(soft_mod: str) -> str | None:
+    """Returns UV or BARYCENTRIC, depending on the node the sticky is pinned
+    with, None if the softMod is not a sticky.
+    """
+    mmtx = get_pin_multiply(soft_mod)
+    pins = mmtx and query_cache.list_connections(
+        f"{mmtx}.matrixIn[1]", source=True, destination=False
+    )
+    if not pins:
+        return None
+
+    if query_cache.node_type(pins[0]) == sticky.BARYCENTRIC_PIN:
+        return BARYCENTRIC
+    return UV
+
+
+def get_barycentric_pin(uv_pin: str, create: bool = True) -> str | None:
+    """Returns the barycentric pin built from a uvPin. It reads the same
+    deformed geometry, and each of its pins uses the index of the uvPin
+    coordinate it is converted from.
+
+    :param uv_pin: UvPin node.
+    :param create: Create the barycentric pin if it doesn't exist.
+    """
+    pins = cmds.listConnections(
+        f"{uv_pin}.message",
+        source=False,
+        destination=True,
+        type=sticky.BARYCENTRIC_PIN,
+    )
+    if pins or not create:
+        return pins[0] if pins else None
+
+    load_plugin()
+    bary_pin = cmds.createNode(
+        sticky.BARYCENTRIC_PIN, name=uv_pin.replace("uvPin", "baryPin")
+    )
+    cmds.connectAttr(f"{uv_pin}.message", f"{bary_pin}.uvPin")
+    deformed_geometry = cmds.listConnections(
+        f"{uv_pin}.deformedGeometry", source=True, destination=False, plugs=True
+    )
+    cmds.connectAttr(deformed_geometry[0], f"{bary_pin}.inputGeometry")
+
+    return bary_pin
+
+
+def update_barycentric_pin(uv_pin: str, idx: int):
+    """Convert the uvPin coordinate at given index to the triangle vertices,
+    barycentric weights and tangent weights of its barycentric pin.
+    """
+    bary_pin = get_barycentric_pin(uv_pin)
+    shape = mesh.get_shape_deformed(sticky.get_pin_geometry(uv_pin), False)
+    triangles, triangle_uvs = precompute.get_triangles(shape)
+    triangle, weights = geometry.locate_uv(
+        triangle_uvs,
+        (
+            cmds.getAttr(f"{uv_pin}.coordinate[{idx}].coordinateU"),
+            cmds.getAttr(f"{uv_pin}.coordinate[{idx}].coordinateV"),
+        ),
+    )
+
+    set_barycentric_pin(
+        bary_pin,
+        idx,
+        triangles[triangle],
+        weights,
+        geometry.get_tangent_weights(triangle_uvs[triangle]),
+    )
+
+
+def set_barycentric_pin(
+    bary_pin: str,
+    idx: int,
+    vertex_ids: np.ndarray,
+    weights: np.ndarray,
+    tangent_weights: np.ndarray,
+):
+    """Set the pin at given index of a barycentric pin.
+
+    :param bary_pin: Barycentric pin node.
+    :param idx: Index of the pin, the index of its uvPin coordinate.
+    :param vertex_ids: (3,) vertex ids of the pinned triangle.
+    :param weights: (3,) barycentric weights of the pinned point.
+    :param tangent_weights: (2,) weights of the edges giving the U tangent,
+        see geometry.get_tangent_weights.
+    """
+    plug = f"{bary_pin}.pin[{idx}]"
+    cmds.setAttr(f"{plug}.vertexIds", *np.asarray(vertex_ids).tolist())
+    cmds.setAttr(f"{plug}.weights", *np.asarray(weights).tolist())
+    cmds.setAttr(
+        f"{plug}.tangentWeights", *np.asarray(tangent_weights).tolist()
+    )
+
+
+def get_used_barycentric_pin(uv_pin: str, idx: int) -> str | None:
+    """Returns the barycentric pin of the uvPin coordinate at given index,
+    only if the sticky is pinned with it.
+    """
+    bary_pin = get_barycentric_pin(uv_pin, create=False)
+    if bary_pin and cmds.listConnections(
+        f"{bary_pin}.outputMatrix[{idx}]", source=False, destination=True
+    ):
+        return bary_pin
+    return None
+
+
+def update_pin_offset(uv_pin: str, idx: int):
+    """Set the offset between the uvPin and barycentric pin matrices of the
+    coordinate at given index, at the current frame, on the multMatrix of the
+    sticky pinned with it. Both pins must be on the same point, so the offset
+    is recomputed each time the barycentric pin is moved to another triangle.
+    """
+    bary_pin = get_used_barycentric_pin(uv_pin, idx)
+    if not bary_pin:
+        return
+
+    mmtx = cmds.listConnections(
+        f"{bary_pin}.outputMatrix[{idx}]",
+        source=False,
+        destination=True,
+        type="multMatrix",
+    )
+    offset = om.MMatrix(cmds.getAttr(f"{uv_pin}.outputMatrix[{idx}]")) * (
+        om.MMatrix(cmds.getAttr(f"{bary_pin}.outputMatrix[{idx}]")).inverse()
+    )
+    for node in mmtx or []:
+        cmds.setAttr(f"{node}.matrixIn[0]", list(offset), type="matrix")
+
+
+def sync_barycentric_pin(uv_pin: str, idx: int):
+    """Update the barycentric pin of the uvPin coordinate at given index and
+    its offset, only if the sticky is pinned with it.
+    """
+    if get_used_barycentric_pin(uv_pin, idx):
+        update_barycentric_pin(uv_pin, idx)
+        update_pin_offset(uv_pin, idx)
+
+
+@utils.undoable
+@query_cache.scoped
+def set_pin_mode(soft_mod: str, mode: str):
+    """Pin the sticky with its uvPin or with a barycentric pin.
+
+    The barycentric pin converts the uv coordinate once to a triangle and
+    barycentric weights, then only reads the three vertices of that triangle
+    on evaluation, instead of looking the uv up on the whole mesh. The mesh
+    is still deformed whole upstream of both pins, only the lookup is saved.
+    The small difference between both pin matrices at the current frame is
+    kept as an offset, so the sticky doesn't move when switching.
+
+    The uvPin is the default, the barycentric pin needs its plug-in wherever
+    the scene is opened and is only used if is_barycentric_pin_enabled.
+
+    :param soft_mod: SoftMod of the sticky.
+    :param mode: UV or BARYCENTRIC.
+    """
+    uvp, idx = sticky.get_sticky_pin(soft_mod)
+    if not uvp:
+        log.warning(f"-{soft_mod}- is not a sticky !")
+        return
+    if get_pin_mode(soft_mod) == mode:
+        return
+
+    mmtx = get_pin_multiply(soft_mod)
+    if mode == UV:
+        cmds.connectAttr(
+            f"{uvp}.outputMatrix[{idx}]", f"{mmtx}.matrixIn[1]", force=True
+        )
+        cmds.setAttr(
+            f"{mmtx}.matrixIn[0]", list(om.MMatrix.kIdentity), type="matrix"
+        )
+        bary_pin = get_barycentric_pin(uvp, create=False)
+        if bary_pin:
+            cmds.removeMultiInstance(
+                f"{bary_pin}.pin[{idx}]", breakConnection=True
+            )
+        return
+
+    if not is_barycentric_pin_enabled():
+        log.warning(
+            f"-{soft_mod}- keeps its uvPin, set {ENABLE_VARIABLE}=1 to use "
+            f"barycentric pins !"
+        )
+        return
+    for attr in ["coordinateU", "coordinateV"]:
+        if animation.get_anim_curve(f"{uvp}.coordinate[{idx}].{attr}"):
+            log.warning(
+                f"-{soft_mod}- pin coordinate is animated, it can't use a "
+                f"barycentric pin !"
+            )
+            return
+
+    bary_pin = get_barycentric_pin(uvp)
+    update_barycentric_pin(uvp, idx)
+    cmds.connectAttr(
+        f"{bary_pin}.outputMatrix[{idx}]", f"{mmtx}.matrixIn[1]", force=True
+    )
+    update_pin_offset(uvp, idx)
@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import os
+import copy
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import maya.utils
+import numpy as np
+from maya import cmds
+from maya.api import OpenMaya as om
+
+from sticky_controller.core import log, cache_store, geometry, mesh
+
+# Worker threads, numpy releases the GIL in the heavy parts of the jobs.
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+
+def get_surface_key(arrays: dict[str, np.ndarray]) -> str:
+    """Returns the key of the surface data computed from the arrays of
+    mesh.get_triangulation_arrays, it changes with the topology or the uvs.
+    """
+    return cache_store.CacheStore.get_key(
+        "surface",
+        arrays["poly_counts"],
+        arrays["poly_vertices"],
+        arrays["uv_counts"],
+        arrays["uv_ids"],
+        arrays["uvs"],
+    )
+
+
+def build_surface(
+    arrays: dict[str, np.ndarray], points: np.ndarray
+) -> tuple[str, geometry.SurfaceTracker, geometry.SpatialHash]:
+    """Build the triangulation, uvs and vertex to triangles adjacency of a
+    mesh, and a spatial hash of its points. Doesn't use Maya, so it can run
+    in any thread.
+
+    :param arrays: Arrays returned by mesh.get_triangulation_arrays.
+    :param points: (n, 3) object space positions of the vertices.
+
+    :returns: Key of the surface, its tracker and the hash of its points.
+    """
+    tracker = geometry.SurfaceTracker(*geometry.get_triangle_uvs(**arrays))
+    # Cells of about an edge length, the nearest vertex of a position on the
+    # surface is in its cell or a neighbor one.
+    edges = points[tracker.triangles[:, :2]]
+    lengths = np.linalg.norm(edges[:, 0] - edges[:, 1], axis=1)
+    cell_size = float(np.median(lengths)) if len(lengths) else 0.0
+
+    return (
+        get_surface_key(arrays),
+        tracker,
+        geometry.SpatialHash(points, cell_size or 1.0),
+    )
+
+
+def get_meshes(nodes: list[str]) -> list[str]:
+    """Returns the visible mesh shapes of given transforms, shapes or
+    components.
+    """
+    transforms = set()
+    for node in cmds.ls(nodes, long=True, objectsOnly=True) or []:
+        if cmds.objectType(node, isAType="shape"):
+            node = cmds.listRelatives(node, parent=True, fullPath=True)[0]
+        transforms.add(node)
+    if not transforms:
+        return []
+
+    return (
+        cmds.listRelatives(
+            list(transforms),
+            shapes=True,
+            noIntermediate=True,
+            fullPath=True,
+            type="mesh",
+        )
+        or []
+    )
+
+
+def get_candidate_meshes() -> list[str]:
+    """Returns the meshes stickies are likely created on: the selected ones,
+    and the ones which already have stickies.
+    """
+    uv_pins = cmds.ls(type="uvPin")
+    pinned = uv_pins and cmds.listConnections(
+        [f"{uvp}.originalGeometry" for uvp in uv_pins],
+        source=True,
+        destination=False,
+    )
+    return get_meshes(
+        cmds.ls(selection=True, objectsOnly=True) + (pinned or [])
+    )
+
+
+def get_watched_node(shape: str) -> str | None:
+    """Returns the node dirtied when the topology or uvs of a deformed mesh
+    may change: its original shape, or the node feeding it if it has none.
+
+    :returns: None if the mesh isn't deformed, or is fed by a deformer
+        without original shape, which is dirtied on every frame.
+    """
+    sources = cmds.listConnections(
+        f"{shape}.inMesh", source=True, destination=False
+    )
+    if not sources:
+        return None
+
+    transform = cmds.listRelatives(shape, parent=True, fullPath=True)[0]
+    original_shape = mesh.get_original_shape(transform)
+    if original_shape:
+        return original_shape
+    if cmds.objectType(sources[0], isAType="geometryFilter"):
+        return None
+    return sources[0]
+
+
+class Precomputer:
+    """Prepare the surfaces of the meshes stickies are likely created on in
+    the background: the selected ones and the ones with stickies, when a
+    scene is opened, a reference is loaded or the selection changes.
+
+    Mesh arrays are read through the API on the main thread, one mesh per
+    idle event so Maya stays responsive, then surfaces are built in a thread
+    pool. Each scene change starts a new generation: pending jobs are
+    cancelled and results of previous generations are dropped.
+
+    A prepared surface is dropped and prepared again once callbacks marked
+    it stale: when the original shape is dirtied (the topology and uvs of a
+    deformed mesh come from there) or the mesh topology changes. Meshes
+    without original shape fed by a deformer are not prepared, see
+    get_watched_node.
+    """
+
+    def __init__(self):
+        self._executor: ThreadPoolExecutor | None = None
+        self._generation = 0
+        self._queue: list[str] = []
+        self._futures: dict[str, Future] = {}
+        # {shape long name: (surface key, tracker, spatial hash)}
+        self._surfaces: dict[
+            str,
+            tuple[str, geometry.SurfaceTracker, geometry.SpatialHash],
+        ] = {}
+        # Shapes whose surface may have changed, and the callbacks marking
+        # them, by shape long name.
+        self._stale: set[str] = set()
+        self._surface_callback_ids: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+        self._callback_ids: list[int] = []
+
+    def start(self, shapes: list[str] = None):
+        """Queue the meshes of get_candidate_meshes, or given mesh shapes,
+        which are not prepared yet.
+        """
+        if shapes is None:
+            shapes = get_candidate_meshes()
+        with self._lock:
+            known = set(self._futures) | set(self._surfaces)
+        shapes = [
+            shape
+            for shape in cmds.ls(shapes, long=True) or []
+            if shape not in known and shape not in self._queue
+        ]
+        if not shapes:
+            return
+
+        idle = not self._queue
+        self._queue.extend(shapes)
+        if idle:
+            self._defer_next()
+
+    def cancel(self):
+        """Cancel pending jobs and drop all the prepared surfaces."""
+        with self._lock:
+            self._generation += 1
+            for future in self._futures.values():
+                future.cancel()
+            self._futures = {}
+            self._surfaces = {}
+            self._stale = set()
+        for callback_ids in self._surface_callback_ids.values():
+            om.MMessage.removeCallbacks(callback_ids)
+        self._surface_callback_ids = {}
+        self._queue = []
+
+    def get_surface(
+        self, shape: str
+    ) -> tuple[geometry.SurfaceTracker, geometry.SpatialHash] | None:
+        """Returns a new tracker sharing the prepared surface of a mesh, and
+        the spatial hash of its points when it was prepared. None if it isn't
+        ready or may have changed since, it is then prepared again in the
+        background instead of being checked against the mesh.
+        """
+        shape = (cmds.ls(shape, long=True) or [shape])[0]
+        with self._lock:
+            surface = self._surfaces.get(shape)
+            stale = shape in self._stale
+        if not surface:
+            return None
+
+        if stale:
+            self._forget(shape)
+            self.start([shape])
+            return None
+
+        _, tracker, spatial_hash = surface
+        tracker = copy.copy(tracker)
+        tracker.triangle = None
+        return tracker, spatial_hash
+
+    def _watch(self, shape: str, upstream: str):
+        """Mark the surface of a mesh stale whenever the node of
+        get_watched_node is dirtied, or its topology changes.
+        """
+        if shape in self._surface_callback_ids:
+            return
+
+        selection = om.MSelectionList().add(shape).add(upstream)
+
+        def mark(*_):
+            with self._lock:
+                self._stale.add(shape)
+
+        self._surface_callback_ids[shape] = [
+            om.MPolyMessage.addPolyTopologyChangedCallback(
+                selection.getDependNode(0), mark
+            ),
+            om.MNodeMessage.addNodeDirtyCallback(
+                selection.getDependNode(1), mark
+            ),
+        ]
+
+    def _forget(self, shape: str):
+        """Drop the prepared surface of a mesh and its callbacks."""
+        with self._lock:
+            self._surfaces.pop(shape, None)
+            self._stale.discard(shape)
+        om.MMessage.removeCallbacks(self._surface_callback_ids.pop(shape, []))
+
+    def _defer_next(self):
+        cmds.evalDeferred(
+            functools.partial(self._extract_next, self._generation),
+            lowestPriority=True,
+        )
+
+    def _extract_next(self, generation: int):
+        """Read the arrays of the next queued mesh and submit its job."""
+        if generation != self._generation or not self._queue:
+            return
+
+        shape = self._queue.pop(0)
+        # Only deformed meshes can get stickies.
+        upstream = cmds.objExists(shape) and get_watched_node(shape)
+        if upstream:
+            arrays = mesh.get_triangulation_arrays(shape)
+            points = mesh.get_points(shape, space=om.MSpace.kObject)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    MAX_WORKERS, thread_name_prefix="sticky_precompute"
+                )
+            # Watched before the job, so edits made meanwhile are caught.
+            self._watch(shape, upstream)
+            future = self._executor.submit(build_surface, arrays, points)
+            with self._lock:
+                self._futures[shape] = future
+            future.add_done_callback(
+                functools.partial(self._store, shape, generation)
+            )
+
+        if self._queue:
+            self._defer_next()
+
+    def _store(self, shape: str, generation: int, future: Future):
+        """Keep the result of a job, runs in the worker thread."""
+        if future.cancelled():
+            return
+        if future.exception():
+            # Maya commands and its script editor are not thread safe.
+            maya.utils.executeDeferred(
+                log.warning, f"Can't prepare the surface of -{shape}- !"
+            )
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._futures.pop(shape, None)
+            if not future.exception():
+                self._surfaces[shape] = future.result()
+
+    def add_callbacks(self):
+        """Prepare the candidate surfaces when a scene is opened, a reference
+        loaded or the selection changes, and cancel everything when the scene
+        changes.
+        """
+        if self._callback_ids:
+            return
+        for message, function in [
+            (om.MSceneMessage.kBeforeOpen, self.cancel),
+            (om.MSceneMessage.kBeforeNew, self.cancel),
+            (om.MSceneMessage.kMayaExiting, self.cancel),
+            (om.MSceneMessage.kAfterOpen, self.start),
+            (om.MSceneMessage.kAfterLoadReference, self.start),
+            (om.MSceneMessage.kAfterCreateReference, self.start),
+        ]:
+            self._callback_ids.append(
+                om.MSceneMessage.addCallback(
+                    message, lambda *_, function=function: function()
+                )
+            )
+        self._callback_ids.append(
+            om.MModelMessage.addCallback(
+                om.MModelMessage.kActiveListModified,
+                lambda *_: self.start(
+                    get_meshes(cmds.ls(selection=True, objectsOnly=True))
+                ),
+            )
+        )
+
+    def remove_callbacks(self):
+        """Remove the callbacks and cancel everything."""
+        if self._callback_ids:
+            om.MMessage.removeCallbacks(self._callback_ids)
+            self._callback_ids = []
+        self.cancel()
+
+
+_precomputer = Precomputer()
+
+
+def start():
+    """Prepare the surfaces of the selected meshes and of the meshes with
+    stickies in the background, then on every scene opened, reference
+    loaded or selection change.
+    """
+    _precomputer.add_callbacks()
+    _precomputer.start()
+
+
+def stop():
+    """Stop preparing surfaces and drop the prepared ones."""
+    _precomputer.remove_callbacks()
+
+
+def get_surface_tracker(shape: str) -> geometry.SurfaceTracker:
+    """Returns a SurfaceTracker of a mesh, from its prepared surface if ready,
+    built on demand otherwise.
+    """
+    surface = _precomputer.get_surface(shape)
+    if surface:
+        return surface[0]
+    return geometry.SurfaceTracker(*mesh.get_triangles(shape))
+
+
+def get_prepared_triangles(
+    shape: str,
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """Same as mesh.get_triangles, only from the prepared surface, None if
+    it isn't ready. Never reads the mesh.
+    """
+    surface = _precomputer.get_surface(shape)
+    if surface:
+        return surface[0].triangles, surface[0].triangle_uvs
+    return None
+
+
+def get_triangles(shape: str) -> tuple[np.ndarray, np.ndarray]:
+    """Same as mesh.get_triangles, from the prepared surface if ready."""
+    return get_prepared_triangles(shape) or mesh.get_triangles(shape)
+
+
+def get_uv_coordinates(
+    position: tuple[float, float, float], shape: str
+) -> tuple[float, float]:
+    """Same as mesh.get_uv_coordinates. When the surface of the mesh is
+    prepared, the closest point is walked from the triangles of the nearest
+    prepared point, reading only the vertices around it, instead of creating
+    a closestPointOnMesh node. The node is still used if the position is off
+    the surface, or the mesh deformed too much since it was prepared for the
+    walk to reach the position.
+    """
+    surface = _precomputer.get_surface(shape)
+    if surface:
+        tracker, spatial_hash = surface
+        # Prepared points are in object space, they still match when the
+        # geometry only moved.
+        dag_path = om.MSelectionList().add(shape).getDagPath(0)
+        local_position = np.array(
+            om.MPoint(*position) * dag_path.inclusiveMatrixInverse()
+        )[:3]
+        nearest, _ = spatial_hash.nearest(
+            local_position[np.newaxis], spatial_hash.cell_size
+        )
+        vertex = int(nearest[0])
+        if vertex != -1 and vertex + 1 < len(tracker.offsets):
+            triangles = tracker.vertex_triangles[
+                tracker.offsets[vertex] : tracker.offsets[vertex + 1]
+            ]
+            if len(triangles):
+                tracker.triangle = int(triangles[0])
+                uv, _, distance = tracker.project(
+                    local_position,
+                    mesh.get_points_reader(om.MFnMesh(dag_path)),
+                )
+                if (
+                    not np.isnan(uv).any()
+                    and distance <= spatial_hash.cell_size
+                ):
+                    return float(uv[0]), float(uv[1])
+
+    return mesh.get_uv_coordinates(position, shape)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import numpy as np
+from maya import cmds
+from maya.api import OpenMaya as om
+
+from sticky_controller import utils
+from sticky_controller.core import log, geometry, mesh, sticky
+
+# Number of samples of the falloff curve, and of overlay colors.
+LUT_SIZE = 256
+COLOR_SET = "sticky_radius_preview"
+
+_preview: RadiusPreview | None = None
+_callback_id: int | None = None
+
+
+def get_falloff_lut(soft_mod: str) -> np.ndarray:
+    """Sample the falloffCurve of a softMod from the center (0) to the
+    radius (1).
+    """
+    plug = om.MSelectionList().add(f"{soft_mod}.falloffCurve").getPlug(0)
+    ramp = om.MRampAttribute(plug)
+    return np.array(
+        [
+            ramp.getValueAtPosition(position)
+            for position in np.linspace(0, 1, LUT_SIZE)
+        ]
+    )
+
+
+class RadiusPreview:
+    """Show the falloff weights of a sticky as vertex colors on overlay
+    copies of its deformed geometries.
+
+    Points are read once, and their distances to the sticky center sorted
+    once, so a radius change only computes the weights of the vertices
+    within the old or new radius, one range of vertices per color. The ctrl
+    radius is disconnected from the softMod meanwhile, so nothing is
+    re-evaluated while dragging it.
+    """
+
+    def __init__(self, soft_mod: str):
+        self.soft_mod = soft_mod
+        self.slide_ctrl, self.ctrl = sticky.get_sticky_controllers(soft_mod)
+        self.center = np.array(
+            cmds.xform(
+                self.slide_ctrl, query=True, translation=True, worldSpace=True
+            )
+        )
+        self.lut = get_falloff_lut(soft_mod)
+        self.palette = [
+            om.MColor((value, value, value)) for value in self.lut
+        ] + [om.MColor((0, 0, 0))]
+        self.falloff_mode = None
+        self.layers = []
+        self.script_jobs = []
+
+    def start(self):
+        """Create the overlays, disconnect the radius and watch the ctrl."""
+        for geo in sticky.get_deformed_geometries(self.soft_mod):
+            shape = mesh.get_shape_deformed(geo, create=False)
+            name = geo.split("|")[-1].split(":")[-1]
+            overlay = mesh.duplicate_shape(
+                geo, f"{name}_radius_previewShape", shape
+            )
+            overlay_fn = mesh.get_mesh_fn(overlay)
+            overlay_fn.createColorSet(COLOR_SET, False)
+            overlay_fn.setCurrentColorSetName(COLOR_SET)
+            overlay_fn.setVertexColors(
+                om.MColorArray(overlay_fn.numVertices, self.palette[-1]),
+                list(range(overlay_fn.numVertices)),
+            )
+            cmds.setAttr(f"{overlay}.displayColors", True)
+            cmds.setAttr(f"{shape}.visibility", False)
+
+            triangles, _ = mesh.get_triangles(shape)
+            self.layers.append(
+                {
+                    "shape": shape,
+                    "overlay": overlay,
+                    "points": mesh.get_points(shape),
+                    "edges": geometry.get_edges(triangles),
+                    "count": 0,
+                }
+            )
+
+        cmds.disconnectAttr(
+            f"{self.ctrl}.radius", f"{self.soft_mod}.falloffRadius"
+        )
+        for attr in ["radius", "falloff_mode"]:
+            self.script_jobs.append(
+                cmds.scriptJob(
+                    attributeChange=[f"{self.ctrl}.{attr}", self.update],
+                    killWithScene=True,
+                )
+            )
+        self.update()
+
+    def stop(self):
+        """Delete the overlays and reconnect the radius."""
+        for job in self.script_jobs:
+            if cmds.scriptJob(exists=job):
+                cmds.scriptJob(kill=job, force=True)
+        self.script_jobs = []
+
+        for layer in self.layers:
+            if cmds.objExists(layer["overlay"]):
+                cmds.delete(layer["overlay"])
+            if cmds.objExists(layer["shape"]):
+                cmds.setAttr(f"{layer['shape']}.visibility", True)
+        self.layers = []
+
+        if cmds.objExists(self.ctrl) and not cmds.isConnected(
+            f"{self.ctrl}.radius", f"{self.soft_mod}.falloffRadius"
+        ):
+            cmds.connectAttr(
+                f"{self.ctrl}.radius", f"{self.soft_mod}.falloffRadius"
+            )
+
+    def sort_distances(self, layer: dict, radius: float):
+        """Compute and sort the distances of the layer vertices to the
+        sticky center, along the surface in Surface mode.
+        """
+        distances = np.linalg.norm(layer["points"] - self.center, axis=1)
+        if self.falloff_mode == 1:
+            seed = int(np.argmin(distances))
+            # Surface distances are only computed up to twice the radius,
+            # they are computed again if the radius grows beyond it.
+            layer["max_distance"] = radius * 2
+            distances = geometry.get_surface_distances(
+                layer["points"],
+                layer["edges"],
+                seed,
+                distances[seed],
+                layer["max_distance"],
+            )
+        else:
+            layer["max_distance"] = np.inf
+        layer["order"] = np.argsort(distances)
+        layer["distances"] = distances[layer["order"]]
+        # Every vertex weight must be written again.
+        layer["count"] = len(distances)
+
+    def update(self):
+        """Write the weights of the current radius and falloff mode."""
+        radius = cmds.getAttr(f"{self.ctrl}.radius")
+        mode_changed = self.falloff_mode != cmds.getAttr(
+            f"{self.ctrl}.falloff_mode"
+        )
+        self.falloff_mode = cmds.getAttr(f"{self.ctrl}.falloff_mode")
+        for layer in self.layers:
+            if mode_changed or radius > layer["max_distance"]:
+                self.sort_distances(layer, radius)
+
+            count, ranges = geometry.get_level_ranges(
+                layer["distances"], radius, layer["count"], LUT_SIZE
+            )
+            layer["count"] = count
+            if not len(ranges):
+                continue
+
+            # Each level is written with a single color instead of one per
+            # vertex.
+            overlay_fn = mesh.get_mesh_fn(layer["overlay"])
+            for level, start, end in ranges:
+                overlay_fn.setVertexColors(
+                    om.MColorArray(int(end - start), self.palette[level]),
+                    layer["order"][start:end].tolist(),
+                )
+
+
+def start_preview(soft_mod: str):
+    """Preview the radius of a sticky until stop_preview is called. Nothing
+    is recorded in the undo queue.
+    """
+    stop_preview()
+    if not sticky.get_sticky_controllers(soft_mod)[0]:
+        log.warning(f"-{soft_mod}- is not a sticky !")
+        return
+
+    global _preview, _callback_id
+    _preview = RadiusPreview(soft_mod)
+    with utils.without_undo():
+        _preview.start()
+    # Never save the overlays and the disconnected radius.
+    _callback_id = om.MSceneMessage.addCallback(
+        om.MSceneMessage.kBeforeSave, lambda *_: stop_preview()
+    )
+
+
+def stop_preview():
+    """Stop the radius preview, if any."""
+    global _preview, _callback_id
+    if not _preview:
+        return
+
+    with utils.without_undo():
+        _preview.stop()
+    _preview = None
+    if _callback_id is not None:
+        om.MMessage.removeCallback(_callback_id)
+        _callback_id = None
+
+
+def get_previewed_sticky() -> str | None:
+    """Returns the softMod of the previewed sticky, if any."""
+    return _preview.soft_mod if _preview else None
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+from collections import defaultdict
+from typing import Any, Iterator
+
+from maya import cmds
+from maya.api import OpenMaya as om
+
+from sticky_controller.core import log
+
+# Key under which queries depending on the whole scene are indexed.
+_SCENE = "*"
+
+# Counters of the closed scopes, see get_stats.
+_STATS = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+class QueryCache:
+    """Memoise scene queries (shapes, reference state, node types,
+    connections) while a scope is active.
+
+    Cached results are indexed by the nodes they depend on and are dropped
+    as soon as the scene is edited around those nodes, through a few DG level
+    callbacks registered for the duration of the scope. Attribute values are
+    not watched, there is no DG level callback for them and one callback per
+    node costs more than the queries it saves. Code setting an attribute a
+    cached query depends on, like intermediateObject for
+    listRelatives(noIntermediate=True), calls invalidate afterwards.
+    """
+
+    def __init__(self):
+        self._results: dict[tuple, Any] = {}
+        self._node_keys: dict[str, set[tuple]] = defaultdict(set)
+        self._callback_ids: list[int] = []
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def query(self, command: callable, node: str, *args, **kwargs) -> Any:
+        """Run command or returns its cached result.
+
+        :param command: Maya command.
+        :param node: Node, plug or scene (_SCENE) the result depends on.
+        """
+        key = (
+            command.__name__,
+            node,
+            args,
+            tuple(
+                sorted((flag, repr(value)) for flag, value in kwargs.items())
+            ),
+        )
+        if key in self._results:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._results[key] = command(*args, **kwargs)
+            # Result also depends on the nodes it lists, they may be renamed
+            # or deleted.
+            dependencies = [node]
+            if isinstance(self._results[key], list):
+                dependencies.extend(self._results[key])
+            for dependency in dependencies:
+                self._node_keys[get_node_name(dependency)].add(key)
+
+        result = self._results[key]
+        # Callers are free to edit the returned list.
+        return list(result) if isinstance(result, list) else result
+
+    def invalidate(self, *nodes: str):
+        """Drop the results depending on given nodes, and on the whole scene."""
+        for node in (*nodes, _SCENE):
+            keys = self._node_keys.pop(get_node_name(node), set())
+            for key in keys:
+                self._results.pop(key, None)
+            self.invalidations += len(keys)
+
+    def add_callbacks(self):
+        """Invalidate results when the scene is edited."""
+        self._callback_ids = [
+            om.MDGMessage.addConnectionCallback(self._on_connection),
+            om.MDGMessage.addNodeAddedCallback(self._on_node_added),
+            om.MDGMessage.addNodeRemovedCallback(self._on_node_removed),
+            om.MDagMessage.addAllDagChangesCallback(self._on_dag_change),
+            om.MNodeMessage.addNameChangedCallback(
+                om.MObject.kNullObj, self._on_name_changed
+            ),
+        ]
+
+    def remove_callbacks(self):
+        """Stop invalidating results, once the scope exits."""
+        om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+    def _on_connection(self, src_plug, dst_plug, made, *_):
+        self.invalidate(
+            om.MFnDependencyNode(src_plug.node()).name(),
+            om.MFnDependencyNode(dst_plug.node()).name(),
+        )
+
+    def _on_node_added(self, node, *_):
+        # A node reusing the name of a deleted one, when undoing a deletion.
+        self.invalidate(om.MFnDependencyNode(node).name())
+
+    def _on_node_removed(self, node, *_):
+        self.invalidate(om.MFnDependencyNode(node).name())
+
+    def _on_dag_change(self, msg_type, child, parent, *_):
+        self.invalidate(child.partialPathName(), parent.partialPathName())
+
+    def _on_name_changed(self, node, previous_name, *_):
+        self.invalidate(previous_name, om.MFnDependencyNode(node).name())
+
+
+_active_cache: QueryCache | None = None
+
+
+def get_node_name(node: str) -> str:
+    """Returns the short name of the node of a DagPath or a plug."""
+    return node.split(".", 1)[0].split("|")[-1]
+
+
+@contextlib.contextmanager
+def scope() -> Iterator[QueryCache]:
+    """Cache the scene queries of this module until the scope exits. Nested
+    scopes share the cache of the outermost one.
+    """
+    global _active_cache
+    if _active_cache:
+        yield _active_cache
+        return
+
+    _active_cache = QueryCache()
+    _active_cache.add_callbacks()
+    try:
+        yield _active_cache
+    finally:
+        _active_cache.remove_callbacks()
+        _STATS["hits"] += _active_cache.hits
+        _STATS["misses"] += _active_cache.misses
+        _STATS["invalidations"] += _active_cache.invalidations
+        log.debug(
+            f"Query cache: {_active_cache.hits} command calls saved, "
+            f"{_active_cache.misses} made, "
+            f"{_active_cache.invalidations} results invalidated."
+        )
+        _active_cache = None
+
+
+def invalidate(*nodes: str):
+    """Drop the cached results depending on nodes, after setting one of their
+    attributes inside a scope. Does nothing outside of a scope.
+    """
+    if _active_cache is not None:
+        _active_cache.invalidate(*nodes)
+
+
+def get_stats() -> dict[str, int]:
+    """Returns the counters of all the scopes closed since the last reset:
+    {"hits": command calls saved, "misses": command calls made,
+    "invalidations": results dropped by scene edits}.
+    """
+    return dict(_STATS)
+
+
+def reset_stats():
+    """Reset the counters returned by get_stats."""
+    for key in _STATS:
+        _STATS[key] = 0
+
+
+def log_stats():
+    """Log the counters returned by get_stats."""
+    log.info(
+        f"Query cache: {_STATS['hits']} command calls saved, "
+        f"{_STATS['misses']} made, "
+        f"{_STATS['invalidations']} results invalidated."
+    )
+
+
+def scoped(function: callable):
+    """Decorator to run function in a query cache scope."""
+
+    @functools.wraps(function)
+    def wrapper_function(*args, **kwargs):
+        with scope():
+            return function(*args, **kwargs)
+
+    return wrapper_function
+
+
+def _query(command: callable, node: str, *args, **kwargs) -> Any:
+    if _active_cache is None:
+        return command(*args, **kwargs)
+    return _active_cache.query(command, node, *args, **kwargs)
+
+
+def list_relatives(node: str, **kwargs) -> list[str] | None:
+    """Cached cmds.listRelatives."""
+    return _query(cmds.listRelatives, node, node, **kwargs)
+
+
+def list_connections(plug: str, **kwargs) -> list[str] | None:
+    """Cached cmds.listConnections."""
+    return _query(cmds.listConnections, plug, plug, **kwargs)
+
+
+def list_history(node: str, **kwargs) -> list[str] | None:
+    """Cached cmds.listHistory, invalidated by any scene edit."""
+    return _query(cmds.listHistory, _SCENE, node, **kwargs)
+
+
+def node_type(node: str, **kwargs) -> str | list[str]:
+    """Cached cmds.nodeType."""
+    return _query(cmds.nodeType, node, node, **kwargs)
+
+
+def is_referenced(node: str) -> bool:
+    """Cached cmds.referenceQuery(node, isNodeReferenced=True)."""
+    return _query(cmds.referenceQuery, node, node, isNodeReferenced=True)
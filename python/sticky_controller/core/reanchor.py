@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+from maya import cmds
+from maya.api import OpenMaya as om
+
+from sticky_controller import utils
+from sticky_controller.core import (
+    log,
+    anchor,
+    animation,
+    mesh,
+    pin,
+    precompute,
+    query_cache,
+    sticky,
+)
+
+
+def set_pin_coordinates(soft_mod: str, uv: tuple[float, float]):
+    """Set the uvPin coordinates of a sticky, and of its barycentric pin if
+    it is used, then record its new anchor.
+    """
+    uvp, idx = sticky.get_sticky_pin(soft_mod)
+    cmds.setAttr(f"{uvp}.coordinate[{idx}].coordinateU", uv[0])
+    cmds.setAttr(f"{uvp}.coordinate[{idx}].coordinateV", uv[1])
+    pin.sync_barycentric_pin(uvp, idx)
+
+    shape = mesh.get_shape_deformed(sticky.get_pin_geometry(uvp), create=False)
+    anchor.record_anchor(
+        soft_mod,
+        sticky.get_pin_geometry(uvp, shapes=True),
+        uv,
+        precompute.get_triangles(shape),
+    )
+
+
+@utils.undoable
+@query_cache.scoped
+def reanchor(soft_mod: str):
+    """Move the uvPin coordinate of the sticky under the surface projection of
+    its slide_ctrl. The slide_ctrl keeps its world position, so the
+    deformation doesn't change, but the sticky base point is back under it.
+
+    :param soft_mod: SoftMod of the sticky.
+    """
+    slide_ctrl, _ = sticky.get_sticky_controllers(soft_mod)
+    uvp, idx = sticky.get_sticky_pin(soft_mod)
+    if not uvp:
+        log.warning(f"-{soft_mod}- is not a sticky !")
+        return
+
+    shape = mesh.get_shape_deformed(sticky.get_pin_geometry(uvp), create=False)
+    world_matrix = cmds.xform(
+        slide_ctrl, query=True, matrix=True, worldSpace=True
+    )
+    set_pin_coordinates(
+        soft_mod, precompute.get_uv_coordinates(world_matrix[12:15], shape)
+    )
+    cmds.xform(slide_ctrl, matrix=world_matrix, worldSpace=True)
+
+
+@utils.undoable
+@query_cache.scoped
+def bake_reanchor(soft_mod: str, start: int, end: int):
+    """Key the uvPin coordinate of the sticky on every frame of the range, so
+    the sticky base point follows the surface projection of its slide_ctrl.
+
+    The projection is tracked from the triangle hit on the previous frame, so
+    each frame only reads the positions of the vertices around it. The mesh is
+    still evaluated at each frame: pulling its world mesh computes the whole
+    deformation chain, which is the main cost of the bake on heavy rigs. The
+    slide_ctrl animation is then compensated to keep its world position,
+    unless it is driven by a constraint which already compensates it.
+
+    :param soft_mod: SoftMod of the sticky.
+    :param start: First frame of the range.
+    :param end: Last frame of the range.
+    """
+    slide_ctrl, _ = sticky.get_sticky_controllers(soft_mod)
+    uvp, idx = sticky.get_sticky_pin(soft_mod)
+    if not uvp:
+        log.warning(f"-{soft_mod}- is not a sticky !")
+        return
+
+    if pin.get_pin_mode(soft_mod) == pin.BARYCENTRIC:
+        # Barycentric pins can't follow animated coordinates.
+        log.info(f"-{soft_mod}- is pinned back with its uvPin.")
+        pin.set_pin_mode(soft_mod, pin.UV)
+
+    shape = mesh.get_shape_deformed(sticky.get_pin_geometry(uvp), create=False)
+    tracker = precompute.get_surface_tracker(shape)
+
+    # Sample slide_ctrl and surface projections in a single traversal of time.
+    frames = list(range(int(start), int(end) + 1))
+    world_matrices, uvs = [], []
+    for frame in frames:
+        world_matrix = cmds.getAttr(f"{slide_ctrl}.worldMatrix[0]", time=frame)
+        uv, _, _ = tracker.project(
+            world_matrix[12:15],
+            mesh.get_points_reader(mesh.get_world_mesh_fn(shape, frame)),
+        )
+        world_matrices.append(world_matrix)
+        uvs.append(uv)
+
+    uvs = np.array(uvs)
+    for i, attr in enumerate(["coordinateU", "coordinateV"]):
+        animation.bake_anim_curve(
+            f"{uvp}.coordinate[{idx}].{attr}", frames, uvs[:, i].tolist()
+        )
+
+    transform_attrs = [f"{a}{x}" for a, x in itertools.product("tr", "xyz")]
+    if animation.get_driven_attributes(slide_ctrl, transform_attrs):
+        log.info(f"-{slide_ctrl}- is driven, its transforms are not baked.")
+        return
+
+    # Compensate slide_ctrl to keep its world matrix on the new base point.
+    rotate_order = cmds.getAttr(f"{slide_ctrl}.rotateOrder")
+    samples = {attr: [] for attr in transform_attrs}
+    for frame, world_matrix in zip(frames, world_matrices):
+        parent_matrix = cmds.getAttr(
+            f"{slide_ctrl}.parentMatrix[0]", time=frame
+        )
+        local_matrix = om.MTransformationMatrix(
+            om.MMatrix(world_matrix) * om.MMatrix(parent_matrix).inverse()
+        )
+        translation = local_matrix.translation(om.MSpace.kTransform)
+        rotation = local_matrix.rotation().reorder(rotate_order)
+        for i, axis in enumerate("xyz"):
+            samples[f"t{axis}"].append(
+                om.MDistance(translation[i]).asUnits(om.MDistance.uiUnit())
+            )
+            samples[f"r{axis}"].append(
+                om.MAngle(rotation[i]).asUnits(om.MAngle.uiUnit())
+            )
+
+    for attr, values in samples.items():
+        animation.bake_anim_curve(f"{slide_ctrl}.{attr}", frames, values)
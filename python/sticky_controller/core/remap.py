@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+import numpy as np
+from maya import cmds
+from maya.api import OpenMaya as om
+
+from sticky_controller import utils
+from sticky_controller.core import (
+    log,
+    anchor,
+    animation,
+    geometry,
+    mesh,
+    pin,
+    query_cache,
+    sticky,
+)
+
+
+def get_pins_by_shape(
+    soft_mods: list[str],
+) -> dict[str, list[tuple[str, str, int]]]:
+    """Group stickies by the rest shape they are pinned on.
+
+    :returns: {rest shape: [(softMod, uvPin, index)]}.
+    """
+    pins = defaultdict(list)
+    for soft_mod in soft_mods:
+        uvp, idx = sticky.get_sticky_pin(soft_mod)
+        shape = uvp and sticky.get_pin_geometry(uvp, shapes=True)
+        if not shape:
+            log.warning(f"-{soft_mod}- is not a sticky !")
+            continue
+        pins[shape].append((soft_mod, uvp, idx))
+
+    return pins
+
+
+@utils.undoable
+@query_cache.scoped
+def record_anchors(soft_mods: list[str]):
+    """Record the surface frame of each sticky anchor, in the object space of
+    its rest shape, to remap it on another topology or uvs later. Anchors
+    are already recorded when a sticky is created or re-anchored, this
+    records them on older stickies.
+
+    :param soft_mods: SoftMods of the stickies.
+    """
+    for shape, pins in get_pins_by_shape(soft_mods).items():
+        uvs = np.array(
+            [
+                cmds.getAttr(f"{uvp}.coordinate[{idx}]")[0]
+                for _, uvp, idx in pins
+            ]
+        )
+        frames, valid = anchor.get_anchor_frames(shape, uvs)
+        for (soft_mod, _, _), frame, is_valid in zip(pins, frames, valid):
+            if not is_valid:
+                log.warning(f"-{soft_mod}- is not pinned on its surface !")
+                continue
+            anchor.set_anchor(soft_mod, frame)
+
+
+def is_animated(uv_pin: str, idx: int) -> bool:
+    """Whether the uvPin coordinate at given index is keyed."""
+    plug = f"{uv_pin}.coordinate[{idx}]"
+    return bool(
+        animation.get_anim_curve(f"{plug}.coordinateU")
+        or animation.get_anim_curve(f"{plug}.coordinateV")
+    )
+
+
+@utils.undoable
+@query_cache.scoped
+def remap_stickies(
+    soft_mods: list[str], tolerance: float = 0.01
+) -> dict[str, float]:
+    """Pin stickies back on their recorded anchors, after the topology or the
+    uvs of their geometries changed.
+
+    The anchors of all the stickies of a geometry are projected at once on
+    its new rest shape, then their uvPin coordinates, barycentric pins and
+    anchors are rewritten from the projected triangles.
+
+    :param soft_mods: SoftMods of the stickies.
+    :param tolerance: Distance beyond which a sticky is reported as moved.
+
+    :returns: {softMod: distance} of the stickies moved beyond tolerance.
+    """
+    # Anchors of stickies created since the last idle.
+    anchor.record_pending_anchors()
+    moved = {}
+    for shape, pins in get_pins_by_shape(soft_mods).items():
+        anchored = []
+        for soft_mod, uvp, idx in pins:
+            frame = anchor.get_anchor(soft_mod)
+            if frame is None:
+                log.warning(f"-{soft_mod}- has no recorded anchor !")
+                continue
+            if is_animated(uvp, idx):
+                log.warning(f"-{soft_mod}- pin coordinate is animated !")
+                if pin.get_used_barycentric_pin(uvp, idx):
+                    # Its triangle vertex ids are from the previous topology.
+                    pin.set_pin_mode(soft_mod, pin.UV)
+                    log.warning(
+                        f"-{soft_mod}- is pinned back with its uvPin, its "
+                        f"barycentric pin can't be remapped !"
+                    )
+                continue
+            anchored.append((soft_mod, uvp, idx, frame))
+        if not anchored:
+            continue
+
+        anchors = np.array([frame for *_, frame in anchored])
+        triangles, triangle_uvs = mesh.get_triangles(shape)
+        points = mesh.get_points(shape, om.MSpace.kObject)
+        triangle_ids, weights, distances = geometry.project_on_mesh(
+            anchors[:, 3, :3], anchors[:, 1, :3], points, triangles
+        )
+        uvs = np.einsum("ij,ijk->ik", weights, triangle_uvs[triangle_ids])
+        tangent_weights = geometry.get_tangent_weights(
+            triangle_uvs[triangle_ids]
+        )
+        frames = geometry.get_surface_frames(
+            points[triangles[triangle_ids]], weights, tangent_weights
+        )
+
+        for i, (soft_mod, uvp, idx, _) in enumerate(anchored):
+            if np.isnan(uvs[i]).any():
+                log.warning(f"-{soft_mod}- anchor is on a face without uvs !")
+                continue
+            cmds.setAttr(f"{uvp}.coordinate[{idx}].coordinateU", uvs[i][0])
+            cmds.setAttr(f"{uvp}.coordinate[{idx}].coordinateV", uvs[i][1])
+            bary_pin = pin.get_used_barycentric_pin(uvp, idx)
+            if bary_pin:
+                pin.set_barycentric_pin(
+                    bary_pin,
+                    idx,
+                    triangles[triangle_ids[i]],
+                    weights[i],
+                    tangent_weights[i],
+                )
+                pin.update_pin_offset(uvp, idx)
+            # Next remaps start from the new surface.
+            anchor.set_anchor(soft_mod, frames[i])
+            if distances[i] > tolerance:
+                log.warning(
+                    f"-{soft_mod}- anchor moved by {distances[i]:.4f}, "
+                    f"check it !"
+                )
+                moved[soft_mod] = float(distances[i])
+
+    return moved
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+
+from maya import cmds
+
+from sticky_controller import utils
+from sticky_controller.core import log, animation, lod, query_cache, sticky
+
+# Suffix of each node of a sticky, after its base name, as in create_sticky.
+SUFFIXES = {
+    "soft_mod": "_sfm",
+    "soft_mod_handle": "_sfmHandle",
+    "slide_orig": "_softMod_slide_ctrl_orig",
+    "slide_ctrl": "_softMod_slide_ctrl",
+    "ctrl_orig": "_softMod_ctrl_orig",
+    "ctrl": "_softMod_ctrl",
+    "decompose_matrix": "_sticky_dm",
+    "mult_matrix": "_sticky_mm",
+    "transforms_mult_matrix": "_sticky_transforms_mm",
+    "transforms_decompose_matrix": "_sticky_transforms_mm_matrixSum_dm",
+    "group": "_sticky_grp",
+    "lod_node": "_sfm_lod_mdl",
+    "deformer_set": "_sfmSet",
+}
+
+DEFAULT_PATTERN = "{prefix}_{side}_{counter:02d}"
+
+
+def _get_source(plug: str) -> str | None:
+    sources = query_cache.list_connections(plug, source=True, destination=False)
+    return sources[0] if sources else None
+
+
+def _get_parent(node: str) -> str | None:
+    parents = query_cache.list_relatives(node, parent=True, path=True)
+    return parents[0] if parents else None
+
+
+def _get_deformer_set(soft_mod: str) -> str | None:
+    # Deformers only have a set when component tags are disabled.
+    plugs = query_cache.list_connections(
+        f"{soft_mod}.message",
+        source=False,
+        destination=True,
+        plugs=True,
+        type="objectSet",
+    )
+    for plug in plugs or []:
+        if ".usedBy" in plug:
+            return plug.split(".", 1)[0]
+
+    return None
+
+
+def sanitize_name(name: str) -> str:
+    """Returns name as Maya renames a node with it: invalid characters are
+    replaced by "_", and a leading digit is prefixed by "_".
+    """
+    name = re.sub(r"\W", "_", name)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def get_sticky_nodes(soft_mod: str) -> dict[str, str]:
+    """Resolve the nodes of a sticky from its network, by role.
+
+    :param soft_mod: SoftMod of the sticky.
+
+    :returns: {role: node} for each role of SUFFIXES found, empty if the
+        softMod is not a sticky.
+    """
+    slide_ctrl, ctrl = sticky.get_sticky_controllers(soft_mod)
+    if not slide_ctrl:
+        return {}
+
+    nodes = {"soft_mod": soft_mod, "slide_ctrl": slide_ctrl, "ctrl": ctrl}
+    nodes["slide_orig"] = _get_parent(slide_ctrl)
+    nodes["ctrl_orig"] = _get_parent(ctrl)
+    nodes["group"] = _get_parent(nodes["slide_orig"])
+    nodes["mult_matrix"] = _get_source(
+        f"{nodes['slide_orig']}.offsetParentMatrix"
+    )
+    nodes["decompose_matrix"] = _get_source(f"{soft_mod}.falloffCenter")
+    nodes["soft_mod_handle"] = _get_source(f"{soft_mod}.matrix")
+    if nodes["soft_mod_handle"]:
+        nodes["transforms_decompose_matrix"] = _get_source(
+            f"{nodes['soft_mod_handle']}.translate"
+        )
+    if nodes.get("transforms_decompose_matrix"):
+        nodes["transforms_mult_matrix"] = _get_source(
+            f"{nodes['transforms_decompose_matrix']}.inputMatrix"
+        )
+    nodes["lod_node"] = lod.get_lod_node(soft_mod)
+    nodes["deformer_set"] = _get_deformer_set(soft_mod)
+
+    return {role: node for role, node in nodes.items() if node}
+
+
+def get_renames(soft_mod: str, base_name: str) -> dict[str, str]:
+    """Returns the new name of each node of a sticky: the nodes of SUFFIXES,
+    the shapes of the controllers and handle, and the animCurves of the
+    controllers and the LOD.
+
+    :param soft_mod: SoftMod of the sticky.
+    :param base_name: New base name of the sticky, sanitized like Maya does.
+
+    :returns: {node uuid: new name}
+    """
+    base_name = sanitize_name(base_name)
+    nodes = get_sticky_nodes(soft_mod)
+    renames = {}
+    for role, node in nodes.items():
+        new_name = f"{base_name}{SUFFIXES[role]}"
+        renames[node] = new_name
+
+        # Shapes are named like in controller.create.
+        shapes = query_cache.list_relatives(node, shapes=True, path=True)
+        for i, shape in enumerate(shapes or []):
+            renames[shape] = f"{new_name}Shape{i or ''}"
+
+    for role in ["slide_ctrl", "ctrl"]:
+        for attr, curve in animation.get_anim_curves(nodes[role]).items():
+            renames[curve] = f"{renames[nodes[role]]}_{attr}"
+    if "lod_node" in nodes:
+        curve = animation.get_anim_curve(f"{nodes['lod_node']}.input1")
+        if curve:
+            renames[curve] = f"{renames[nodes['lod_node']]}_input1"
+
+    return {
+        cmds.ls(node, uuid=True)[0]: new_name
+        for node, new_name in renames.items()
+    }
+
+
+def get_side(soft_mod: str, tolerance: float = 0.001) -> str:
+    """Returns "L", "R" or "C" depending on the world x position of the
+    slide_ctrl of the sticky.
+    """
+    slide_ctrl, _ = sticky.get_sticky_controllers(soft_mod)
+    x = cmds.xform(slide_ctrl, query=True, translation=True, worldSpace=True)[0]
+    if abs(x) <= tolerance:
+        return "C"
+    return "L" if x > 0 else "R"
+
+
+def get_base_names(
+    soft_mods: list[str],
+    pattern: str = DEFAULT_PATTERN,
+    prefix: str = "sticky",
+    start: int = 1,
+) -> list[str]:
+    """Format the new base name of each sticky.
+
+    :param soft_mods: SoftMods of the stickies, in counter order.
+    :param pattern: Format string with {prefix}, {side} and {counter} fields.
+    :param prefix: Value of {prefix}.
+    :param start: First value of {counter}, counted per side.
+
+    :returns: Base name of each sticky.
+
+    :raise KeyError: If pattern has other fields.
+    """
+    counters = defaultdict(lambda: start)
+    base_names = []
+    for soft_mod in soft_mods:
+        side = get_side(soft_mod)
+        base_names.append(
+            pattern.format(prefix=prefix, side=side, counter=counters[side])
+        )
+        counters[side] += 1
+
+    return base_names
+
+
+def get_collisions(renames: dict[str, str]) -> list[str]:
+    """Returns the new names used twice, or already used by a node which is
+    not renamed.
+
+    :param renames: {node uuid: new name}
+    """
+    collisions = set()
+    used = set()
+    for new_name in renames.values():
+        if new_name in used:
+            collisions.add(new_name)
+        used.add(new_name)
+        for node in cmds.ls(new_name, uuid=True) or []:
+            if node not in renames:
+                collisions.add(new_name)
+
+    return sorted(collisions)
+
+
+def _get_short_name(uuid: str) -> str:
+    return cmds.ls(uuid)[0].rsplit("|", 1)[-1]
+
+
+def _rename_nodes(renames: dict[str, str]):
+    for i, uuid in enumerate(renames):
+        cmds.rename(
+            cmds.ls(uuid)[0], f"sticky_rename_tmp_{i}", ignoreShape=True
+        )
+    for uuid, new_name in renames.items():
+        cmds.rename(cmds.ls(uuid)[0], new_name, ignoreShape=True)
+
+
+@utils.undoable
+@query_cache.scoped
+def rename_stickies(
+    soft_mods: list[str], base_names: list[str]
+) -> list[str] | None:
+    """Rename every node of the stickies in one batch. Nothing is renamed if
+    any new name collides.
+
+    Nodes are first given temporary names, so stickies can swap their names,
+    and are resolved by uuid since renaming a parent changes the path of its
+    children. If a rename fails, every node gets its previous name back.
+
+    :param soft_mods: SoftMods of the stickies.
+    :param base_names: New base name of each sticky.
+
+    :returns: New names of the softMods, None if nothing was renamed.
+    """
+    renames = {}
+    for soft_mod, base_name in zip(soft_mods, base_names):
+        if not sticky.get_sticky_controllers(soft_mod)[0]:
+            log.warning(f"-{soft_mod}- is not a sticky !")
+            return None
+        renames.update(get_renames(soft_mod, base_name))
+
+    collisions = get_collisions(renames)
+    if collisions:
+        log.warning(f"Names already used, nothing renamed: {collisions} !")
+        return None
+
+    soft_mod_uuids = [cmds.ls(sfm, uuid=True)[0] for sfm in soft_mods]
+    previous_names = {uuid: _get_short_name(uuid) for uuid in renames}
+    try:
+        _rename_nodes(renames)
+    except Exception:
+        # Don't leave temporary or half renamed stickies, the node which
+        # failed to be renamed is left as is.
+        _rename_nodes(
+            {
+                uuid: name
+                for uuid, name in previous_names.items()
+                if _get_short_name(uuid) != name
+            }
+        )
+        raise
+    log.info(f"{len(renames)} nodes renamed on {len(soft_mods)} stickies.")
+
+    return [cmds.ls(uuid)[0] for uuid in soft_mod_uuids]
+
+
+def rename_sticky(soft_mod: str, base_name: str) -> str | None:
+    """Rename every node of a sticky.
+
+    :returns: New name of the softMod, None if nothing was renamed.
+    """
+    soft_mods = rename_stickies([soft_mod], [base_name])
+    return soft_mods[0] if soft_mods else None
+
+
+def rename_with_pattern(
+    soft_mods: list[str],
+    pattern: str = DEFAULT_PATTERN,
+    prefix: str = "sticky",
+    start: int = 1,
+) -> list[str] | None:
+    """Rename the stickies from a pattern, see get_base_names.
+
+    :returns: New names of the softMods, None if nothing was renamed.
+    """
+    try:
+        base_names = get_base_names(soft_mods, pattern, prefix, start)
+    except (KeyError, IndexError, ValueError):
+        log.warning(
+            f"Invalid pattern -{pattern}-, only {{prefix}}, {{side}} and "
+            f"{{counter}} fields are available !"
+        )
+        return None
+
+    return rename_stickies(soft_mods, base_names)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from maya import cmds
+
+from sticky_controller import utils
+from sticky_controller.core import (
+    log,
+    animation,
+    lod,
+    pin,
+    precompute,
+    query_cache,
+    rename,
+    sticky,
+)
+
+SNAPSHOT_VERSION = 1
+
+
+def get_stickies() -> list[str]:
+    """Returns the softMod of every sticky in the scene."""
+    return [
+        soft_mod
+        for soft_mod in cmds.ls(type="softMod")
+        if sticky.get_sticky_controllers(soft_mod)[0]
+    ]
+
+
+def get_controller_data(ctrl: str) -> dict[str, Any]:
+    """Get keyable attributes values and animCurves of a controller.
+
+    :param ctrl: Controller transform.
+
+    :returns: {"attributes": {attr: value}, "curves": {attr: curve_data}}
+    """
+    curves = animation.get_anim_curves(ctrl)
+    attributes = {}
+    for attr in cmds.listAttr(ctrl, keyable=True) or []:
+        if attr in curves or not cmds.getAttr(f"{ctrl}.{attr}", settable=True):
+            # Animated or driven attributes are not restored from a value.
+            continue
+        attributes[attr] = cmds.getAttr(f"{ctrl}.{attr}")
+
+    return {
+        "attributes": attributes,
+        "curves": {
+            attr: animation.get_anim_curve_data(curve)
+            for attr, curve in curves.items()
+        },
+    }
+
+
+def get_sticky_data(soft_mod: str) -> dict[str, Any] | None:
+    """Get everything needed to rebuild a sticky: geometry, uvPin coordinate
+    and its animCurves, envelope, deformed geometries, controllers attributes
+    (transforms, radius, falloff mode) and animCurves.
+
+    :param soft_mod: SoftMod of the sticky.
+
+    :returns: Sticky data or None if the softMod is not a sticky.
+    """
+    slide_ctrl, ctrl = sticky.get_sticky_controllers(soft_mod)
+    uvp, idx = sticky.get_sticky_pin(soft_mod)
+    if not slide_ctrl or not uvp:
+        return None
+
+    uv_curves = {}
+    for attr in ["coordinateU", "coordinateV"]:
+        curve = animation.get_anim_curve(f"{uvp}.coordinate[{idx}].{attr}")
+        if curve:
+            uv_curves[attr] = animation.get_anim_curve_data(curve)
+
+    return {
+        "name": soft_mod.rsplit("_sfm", 1)[0],
+        "geometry": sticky.get_pin_geometry(uvp),
+        "uv": [
+            cmds.getAttr(f"{uvp}.coordinate[{idx}].coordinateU"),
+            cmds.getAttr(f"{uvp}.coordinate[{idx}].coordinateV"),
+        ],
+        "uv_curves": uv_curves,
+        "envelope": lod.get_envelope(soft_mod),
+        "pin_mode": pin.get_pin_mode(soft_mod),
+        "deformed_geometries": sticky.get_deformed_geometries(soft_mod),
+        "slide_ctrl": get_controller_data(slide_ctrl),
+        "ctrl": get_controller_data(ctrl),
+    }
+
+
+@query_cache.scoped
+def export_stickies(path: str | Path, soft_mods: list[str] = None) -> int:
+    """Export stickies in a json snapshot file.
+
+    :param path: Snapshot file path.
+    :param soft_mods: SoftMods of the stickies to export. Default is all the
+        stickies of the scene.
+
+    :returns: Number of exported stickies.
+    """
+    stickies_data = []
+    for soft_mod in soft_mods or get_stickies():
+        sticky_data = get_sticky_data(soft_mod)
+        if sticky_data:
+            stickies_data.append(sticky_data)
+
+    utils.serialize(
+        {"version": SNAPSHOT_VERSION, "stickies": stickies_data}, path
+    )
+    log.info(f"{len(stickies_data)} stickies exported in -{path}-.")
+
+    return len(stickies_data)
+
+
+def apply_controller_data(ctrl: str, data: dict[str, Any]):
+    """Restore attributes values and animCurves of a controller.
+
+    :param ctrl: Controller transform.
+    :param data: Data returned by get_controller_data.
+    """
+    for attr, value in data["attributes"].items():
+        if cmds.attributeQuery(attr, node=ctrl, exists=True):
+            cmds.setAttr(f"{ctrl}.{attr}", value)
+
+    for attr, curve_data in data["curves"].items():
+        if cmds.attributeQuery(attr, node=ctrl, exists=True):
+            animation.create_anim_curve(f"{ctrl}.{attr}", curve_data)
+
+
+@utils.undoable
+@query_cache.scoped
+def import_stickies(path: str | Path) -> list[str]:
+    """Rebuild all the stickies of a snapshot file in one batched pass.
+    Geometry level data is resolved only once per geometry and the viewport
+    refresh is suspended while building.
+
+    :param path: Snapshot file path.
+
+    :returns: SoftMods of the rebuilt stickies.
+    """
+    data = utils.deserialize(path)
+
+    soft_mods = []
+    geometries_data = {}
+    triangulations = {}
+    cmds.refresh(suspend=True)
+    try:
+        for sticky_data in data["stickies"]:
+            geometry = sticky_data["geometry"]
+            if not geometry or not cmds.objExists(geometry):
+                log.warning(
+                    f"Geometry -{geometry}- doesn't exist, can't rebuild "
+                    f"sticky -{sticky_data['name']}- !"
+                )
+                continue
+
+            if geometry not in geometries_data:
+                geometries_data[geometry] = sticky.get_geometry_data(geometry)
+                shape = geometries_data[geometry][1]
+                triangulations[geometry] = shape and precompute.get_triangles(
+                    shape
+                )
+
+            soft_mod = sticky.create_sticky(
+                position=None,
+                geometry=geometry,
+                uv=sticky_data["uv"],
+                geometry_data=geometries_data[geometry],
+                select=False,
+                triangulation=triangulations[geometry],
+            )
+            if not soft_mod:
+                continue
+
+            # Add extra geometries while controllers are still at their
+            # default position, to avoid offsets between geometries.
+            extra_geometries = [
+                geo
+                for geo in sticky_data["deformed_geometries"]
+                if geo != geometry and cmds.objExists(geo)
+            ]
+            if extra_geometries:
+                sticky.add_geometries(soft_mod, extra_geometries)
+
+            slide_ctrl, ctrl = sticky.get_sticky_controllers(soft_mod)
+            apply_controller_data(slide_ctrl, sticky_data["slide_ctrl"])
+            apply_controller_data(ctrl, sticky_data["ctrl"])
+            cmds.setAttr(f"{soft_mod}.envelope", sticky_data["envelope"])
+
+            uvp, idx = sticky.get_sticky_pin(soft_mod)
+            for attr, curve_data in sticky_data.get("uv_curves", {}).items():
+                animation.create_anim_curve(
+                    f"{uvp}.coordinate[{idx}].{attr}", curve_data
+                )
+
+            if sticky_data.get("pin_mode") == pin.BARYCENTRIC:
+                pin.set_pin_mode(soft_mod, pin.BARYCENTRIC)
+
+            if soft_mod != f"{sticky_data['name']}_sfm":
+                soft_mod = (
+                    rename.rename_sticky(soft_mod, sticky_data["name"])
+                    or soft_mod
+                )
+
+            soft_mods.append(soft_mod)
+    finally:
+        cmds.refresh(suspend=False)
+
+    log.info(f"{len(soft_mods)} stickies imported from -{path}-.")
+
+    return soft_mods
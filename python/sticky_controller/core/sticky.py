@@ -1,19 +1,70 @@
+from __future__ import annotations
+
+import numpy as np
 from maya import cmds
 
 from sticky_controller import utils
-from sticky_controller.core import log, mesh, controller
+from sticky_controller.core import (
+    log,
+    anchor,
+    mesh,
+    controller,
+    precompute,
+    query_cache,
+    sticky_index,
+)
+
+# Node type of the pins created by core/pin.py, in place of uvPins.
+BARYCENTRIC_PIN = "stickyBarycentricPin"
+
+
+def get_geometry_data(geometry: str) -> tuple[list[str], str, str]:
+    """Get the geometry level data needed to build stickies on a geometry.
+    Resolve it once to build multiple stickies on the same geometry.
+
+    :param geometry: Geometry to get data from.
+
+    :returns: Deformers, deformed shape and original shape of the geometry.
+        Shapes are None if the geometry doesn't have any deformer.
+    """
+    deformers = mesh.get_deformers(geometry)
+    if not deformers:
+        return deformers, None, None
+
+    shp_def = mesh.get_shape_deformed(geometry)
+    shp_orig = mesh.get_original_shape(geometry)
 
+    return deformers, shp_def, shp_orig
 
-def create_sticky(position: tuple[float, float, float], geometry: str):
+
+@query_cache.scoped
+def create_sticky(
+    position: tuple[float, float, float] | None,
+    geometry: str,
+    uv: tuple[float, float] | None = None,
+    geometry_data: tuple[list[str], str, str] | None = None,
+    select: bool = True,
+    triangulation: tuple[np.ndarray, np.ndarray] | None = None,
+) -> str | None:
     """Creates a softMod deformer with a bindPreMatrix setup that allows it to
     deform and follow a mesh without double transformation.
 
-    :param position: WorldSpace position at which the sticky is built.
+    :param position: WorldSpace position at which the sticky is built. Can be
+        None if uv is given.
     :param geometry: Geometry to deform.
+    :param uv: UV coordinates at which the sticky is built, skip the closest
+        point query on the geometry.
+    :param geometry_data: Data returned by get_geometry_data, to avoid
+        resolving it again when building multiple stickies on a geometry.
+    :param select: Select the sticky controller once created.
+    :param triangulation: Triangles and triangle uvs of the geometry, as
+        returned by mesh.get_triangles, to avoid reading them again when
+        building multiple stickies on a geometry. The prepared surface is
+        used if not given, the anchor is recorded at idle if it isn't ready.
 
     :returns: SoftMod node.
     """
-    de = mesh.get_deformers(geometry)
+    de, shp_def, shp_orig = geometry_data or get_geometry_data(geometry)
     if not de:
         log.warning(
             f"Geometry -{geometry}- does not have any deformer, "
@@ -29,9 +80,7 @@ def create_sticky(position: tuple[float, float, float], geometry: str):
     used_indexes = cmds.getAttr(f"{uvp}.coordinate", multiIndices=True)
     idx = int(used_indexes[-1] + 1) if used_indexes else 0
     cmds.setAttr(f"{uvp}.normalAxis", 1)
-    shp_def = mesh.get_shape_deformed(geometry)
-    shp_orig = mesh.get_original_shape(geometry)
-    uv = mesh.get_uv_coordinates(position, shp_def)
+    uv = uv or precompute.get_uv_coordinates(position, shp_def)
     cmds.setAttr(f"{uvp}.coordinate[{idx}].coordinateU", uv[0])
     cmds.setAttr(f"{uvp}.coordinate[{idx}].coordinateV", uv[1])
     if not cmds.listConnections(
@@ -134,9 +183,24 @@ def create_sticky(position: tuple[float, float, float], geometry: str):
     cmds.parent([base_orig, soft_mod_handle], grp)
     cmds.parent(grp, stickies_grp)
 
+    # Record where the sticky is bound, to remap it if the topology or the
+    # uvs of the geometry change.
+    triangulation = triangulation or precompute.get_prepared_triangles(shp_def)
+    if triangulation:
+        anchor.record_anchor(
+            soft_mod, get_pin_geometry(uvp, shapes=True), uv, triangulation
+        )
+    else:
+        anchor.record_anchor_deferred(
+            soft_mod, get_pin_geometry(uvp, shapes=True), uv
+        )
+
     # Add main mesh to the sticky.
     add_geometries(soft_mod, [geometry])
-    cmds.select(ctrl, replace=True)
+    if select:
+        cmds.select(ctrl, replace=True)
+
+    return soft_mod
 
 
 @utils.undoable
@@ -176,10 +240,10 @@ def get_sticky_controllers(soft_mod: str) -> tuple[str | None, str | None]:
     """Returns the slide_ctrl and the controller associated to given softmod
     deformer. If softmod is not a "sticky" returns None, None.
     """
-    bind_pre_mtx_sources = cmds.listConnections(
+    bind_pre_mtx_sources = query_cache.list_connections(
         f"{soft_mod}.bindPreMatrix", source=True, destination=False
     )
-    radius_sources = cmds.listConnections(
+    radius_sources = query_cache.list_connections(
         f"{soft_mod}.falloffRadius", source=True, destination=False
     )
 
@@ -188,3 +252,52 @@ def get_sticky_controllers(soft_mod: str) -> tuple[str | None, str | None]:
         return bind_pre_mtx_sources[0], radius_sources[0]
 
     return None, None
+
+
+def get_sticky_pin(soft_mod: str) -> tuple[str | None, int | None]:
+    """Returns the uvPin node and the coordinate index on which given sticky
+    is pinned. If softmod is not a "sticky" returns None, None.
+    """
+    slide_ctrl, _ = get_sticky_controllers(soft_mod)
+    if not slide_ctrl:
+        return None, None
+
+    slide_orig = query_cache.list_relatives(slide_ctrl, parent=True, path=True)
+    mmtx = query_cache.list_connections(
+        f"{slide_orig[0]}.offsetParentMatrix", source=True, destination=False
+    )
+    pin_plugs = mmtx and query_cache.list_connections(
+        f"{mmtx[0]}.matrixIn[1]", source=True, destination=False, plugs=True
+    )
+    if not pin_plugs:
+        return None, None
+
+    # Plug is "<uvPin>.outputMatrix[<idx>]".
+    uvp, attr = pin_plugs[0].split(".", 1)
+    if query_cache.node_type(uvp) == BARYCENTRIC_PIN:
+        # Barycentric pins keep the index of the uvPin they are built from.
+        uvp = query_cache.list_connections(
+            f"{uvp}.uvPin", source=True, destination=False
+        )[0]
+    return uvp, int(attr.split("[")[-1].rstrip("]"))
+
+
+def get_pin_geometry(uv_pin: str, shapes: bool = False) -> str | None:
+    """Returns the transform of the geometry on which the uvPin is built.
+
+    :param uv_pin: UvPin node.
+    :param shapes: Returns the original shape the uvPin reads its rest
+        surface from instead.
+    """
+    geometries = query_cache.list_connections(
+        f"{uv_pin}.originalGeometry",
+        source=True,
+        destination=False,
+        shapes=shapes,
+    )
+    return geometries[0] if geometries else None
+
+
+def get_deformed_geometries(soft_mod: str) -> list[str]:
+    """Returns the transform of each geometry deformed by the softMod."""
+    return sticky_index.get_geometries(soft_mod)
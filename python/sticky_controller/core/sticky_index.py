@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from maya import cmds
+from maya.api import OpenMaya as om
+from maya.api import OpenMayaAnim as oma
+
+
+class StickyIndex:
+    """Index of the geometries deformed by each softMod of the scene, and
+    reverse index from each geometry to the softMods deforming it.
+
+    Both are built in one pass over the softMods through the API, instead of
+    a deformer command per softMod, and dropped by callbacks whenever a
+    softMod is connected, added, removed or renamed, or a mesh is renamed or
+    moved in the dag. They are built again on the next query, the callbacks
+    are removed until then when a scene is opened or created.
+    """
+
+    def __init__(self):
+        # {softMod: [geometry transform partial path]}
+        self._soft_mod_geometries: dict[str, list[str]] | None = None
+        # {geometry transform full path: [softMod]}
+        self._geometry_soft_mods: dict[str, list[str]] | None = None
+        self._callback_ids: list[int] = []
+
+    def build(self):
+        """Index the geometries deformed by every softMod of the scene."""
+        self._soft_mod_geometries = defaultdict(list)
+        self._geometry_soft_mods = defaultdict(list)
+        self.add_callbacks()
+
+        soft_mods = cmds.ls(type="softMod")
+        if not soft_mods:
+            return
+
+        selection = om.MSelectionList()
+        for soft_mod in soft_mods:
+            selection.add(soft_mod)
+        for i, soft_mod in enumerate(soft_mods):
+            geometry_filter = oma.MFnGeometryFilter(selection.getDependNode(i))
+            for shape in geometry_filter.getOutputGeometry():
+                transform = om.MDagPath.getAPathTo(shape).pop()
+                self._soft_mod_geometries[soft_mod].append(
+                    transform.partialPathName()
+                )
+                self._geometry_soft_mods[transform.fullPathName()].append(
+                    soft_mod
+                )
+
+    def invalidate(self):
+        """Drop the index, it is built again on the next query."""
+        self._soft_mod_geometries = None
+        self._geometry_soft_mods = None
+
+    def get_geometries(self, soft_mod: str) -> list[str]:
+        """Returns the transform of each geometry deformed by the softMod."""
+        if self._soft_mod_geometries is None:
+            self.build()
+        return list(self._soft_mod_geometries.get(soft_mod, []))
+
+    def get_soft_mods(self, geometries: list[str]) -> list[str]:
+        """Returns the softMods deforming any of given geometries, as
+        transforms, shapes or components.
+        """
+        if self._geometry_soft_mods is None:
+            self.build()
+
+        transforms = set()
+        for node in cmds.ls(geometries, long=True, objectsOnly=True) or []:
+            if cmds.objectType(node, isAType="shape"):
+                node = cmds.listRelatives(node, parent=True, fullPath=True)[0]
+            transforms.add(node)
+
+        soft_mods = []
+        for transform in transforms:
+            for soft_mod in self._geometry_soft_mods.get(transform, []):
+                if soft_mod not in soft_mods:
+                    soft_mods.append(soft_mod)
+
+        return soft_mods
+
+    def add_callbacks(self):
+        """Add the callbacks dropping the index, if not added yet."""
+        if self._callback_ids:
+            return
+        self._callback_ids = [
+            om.MDGMessage.addConnectionCallback(self._on_connection),
+            om.MDGMessage.addNodeAddedCallback(self._on_change, "softMod"),
+            om.MDGMessage.addNodeRemovedCallback(self._on_change, "softMod"),
+            om.MDagMessage.addAllDagChangesCallback(self._on_dag_change),
+            om.MNodeMessage.addNameChangedCallback(
+                om.MObject.kNullObj, self._on_name_changed
+            ),
+            om.MSceneMessage.addCallback(
+                om.MSceneMessage.kBeforeOpen, self.remove_callbacks
+            ),
+            om.MSceneMessage.addCallback(
+                om.MSceneMessage.kBeforeNew, self.remove_callbacks
+            ),
+        ]
+
+    def remove_callbacks(self, *_):
+        """Remove the callbacks and drop the index."""
+        if self._callback_ids:
+            om.MMessage.removeCallbacks(self._callback_ids)
+            self._callback_ids = []
+        self.invalidate()
+
+    def _on_connection(self, src_plug, dst_plug, *_):
+        if src_plug.node().hasFn(om.MFn.kSoftMod) or dst_plug.node().hasFn(
+            om.MFn.kSoftMod
+        ):
+            self.invalidate()
+
+    def _on_change(self, *_):
+        self.invalidate()
+
+    def _on_dag_change(self, msg_type, child, *_):
+        if is_indexed(child.node()):
+            self.invalidate()
+
+    def _on_name_changed(self, node, *_):
+        if is_indexed(node):
+            self.invalidate()
+
+
+def is_indexed(node: om.MObject) -> bool:
+    """Whether the name or dag path of a node may be in the index: a softMod,
+    or a dag node with a mesh at or below it.
+    """
+    if node.hasFn(om.MFn.kSoftMod):
+        return True
+    if not node.hasFn(om.MFn.kDagNode):
+        return False
+    iterator = om.MItDag()
+    iterator.reset(node, om.MItDag.kDepthFirst, om.MFn.kMesh)
+    return not iterator.isDone()
+
+
+_index = StickyIndex()
+
+
+def get_geometries(soft_mod: str) -> list[str]:
+    """Returns the transform of each geometry deformed by the softMod, from
+    the scene index.
+    """
+    return _index.get_geometries(soft_mod)
+
+
+def get_soft_mods(geometries: list[str]) -> list[str]:
+    """Returns the softMods deforming any of given geometries, transforms,
+    shapes or components, from the scene reverse index.
+    """
+    return _index.get_soft_mods(geometries)
+
+
+def get_selection_soft_mods() -> list[str]:
+    """Returns the softMods deforming the selected geometries or components."""
+    return _index.get_soft_mods(cmds.ls(selection=True, objectsOnly=True))
+
+
+def remove_callbacks():
+    """Stop maintaining the scene index."""
+    _index.remove_callbacks()
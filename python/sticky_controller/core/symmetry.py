@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+import numpy as np
+from maya import cmds
+from maya.api import OpenMaya as om
+
+from sticky_controller import utils
+from sticky_controller.core import (
+    log,
+    cache_store,
+    geometry,
+    lod,
+    mesh,
+    query_cache,
+    snapshot,
+    sticky,
+)
+
+# Version of geometry.get_symmetry_map, part of the cache keys.
+SYMMETRY_MAP_VERSION = 1
+
+# Symmetry data of the original shapes already read or computed during the
+# session, by shape uuid, dropped when the shape is dirtied.
+_SYMMETRY_MAPS: dict[tuple[str, int], np.ndarray] = {}
+_TRIANGLES: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+_CALLBACK_IDS: dict[str, list[int]] = {}
+_SCENE_CALLBACK_IDS: list[int] = []
+
+
+def _forget(uuid: str):
+    """Drop the symmetry data of a shape, its callbacks are kept."""
+    _TRIANGLES.pop(uuid, None)
+    for key in [key for key in _SYMMETRY_MAPS if key[0] == uuid]:
+        del _SYMMETRY_MAPS[key]
+
+
+def _watch(shape: str) -> str:
+    """Drop the symmetry data of a shape whenever it is dirtied or removed.
+
+    :returns: Uuid of the shape.
+    """
+    uuid = cmds.ls(shape, uuid=True)[0]
+    if uuid in _CALLBACK_IDS:
+        return uuid
+
+    node = om.MSelectionList().add(shape).getDependNode(0)
+    _CALLBACK_IDS[uuid] = [
+        om.MNodeMessage.addNodeDirtyCallback(
+            node, lambda *_, uuid=uuid: _forget(uuid)
+        ),
+        om.MNodeMessage.addNodePreRemovalCallback(
+            node, lambda *_, uuid=uuid: _forget(uuid)
+        ),
+    ]
+    if not _SCENE_CALLBACK_IDS:
+        _SCENE_CALLBACK_IDS.extend(
+            om.MSceneMessage.addCallback(message, clear_cache)
+            for message in [
+                om.MSceneMessage.kBeforeNew,
+                om.MSceneMessage.kBeforeOpen,
+            ]
+        )
+
+    return uuid
+
+
+def clear_cache(*_):
+    """Drop the symmetry data kept in memory and remove their callbacks. The
+    cache store on disk is kept.
+    """
+    _SYMMETRY_MAPS.clear()
+    _TRIANGLES.clear()
+    for callback_ids in _CALLBACK_IDS.values():
+        om.MMessage.removeCallbacks(callback_ids)
+    _CALLBACK_IDS.clear()
+
+
+def get_symmetry_map(geo: str, axis: int = 0) -> np.ndarray:
+    """Returns the id of the mirrored vertex of each vertex of a geometry.
+
+    The map is computed on the original shape, in its object space: the
+    bind pose must be symmetric around the plane of the axis, whatever the
+    transform of the geometry. It is kept in memory by shape uuid until the
+    shape is dirtied, and in the cache store keyed by topology and points,
+    so any geometry sharing the same original mesh reuses it in the next
+    sessions.
+
+    :param geo: Geometry transform.
+    :param axis: Mirror axis, 0 for x, 1 for y, 2 for z.
+
+    :returns: (n,) id of the mirrored vertex of each vertex, -1 if not found.
+    """
+    shape = mesh.get_original_shape(geo)
+    uuid = _watch(shape)
+    if (uuid, axis) in _SYMMETRY_MAPS:
+        return _SYMMETRY_MAPS[uuid, axis]
+
+    key = cache_store.CacheStore.get_key(
+        "symmetry",
+        mesh.get_topology_hash(shape),
+        mesh.get_points_hash(shape),
+        axis,
+        version=SYMMETRY_MAP_VERSION,
+    )
+    _SYMMETRY_MAPS[uuid, axis] = utils.get_cache_store().get_or_compute(
+        key,
+        lambda: geometry.get_symmetry_map(
+            mesh.get_points(shape, space=om.MSpace.kObject), axis
+        ),
+    )
+
+    return _SYMMETRY_MAPS[uuid, axis]
+
+
+def get_triangles(geo: str) -> tuple[np.ndarray, np.ndarray]:
+    """Same as mesh.get_triangles on the original shape of a geometry, kept
+    in memory until the shape is dirtied.
+    """
+    shape = mesh.get_original_shape(geo)
+    uuid = _watch(shape)
+    if uuid not in _TRIANGLES:
+        _TRIANGLES[uuid] = mesh.get_triangles(shape)
+
+    return _TRIANGLES[uuid]
+
+
+def get_axis_signs(
+    source_matrix: list[float], target_matrix: list[float], axis: int = 0
+) -> np.ndarray:
+    """Compare the mirrored axes of a source matrix with the axes of a target
+    matrix. Matrices are uvPin outputs, in the object space of the geometry,
+    like the symmetry map.
+
+    :returns: (3,) 1 or -1 for each axis, whether the mirrored source axis
+        points in the same direction as the target axis or not.
+    """
+    source = np.array(source_matrix).reshape(4, 4)[:3, :3]
+    target = np.array(target_matrix).reshape(4, 4)[:3, :3]
+    source[:, axis] *= -1
+    signs = np.sign(np.einsum("ij,ij->i", source, target))
+
+    return np.where(signs == 0, 1, signs)
+
+
+def mirror_controller_data(
+    data: dict[str, Any], signs: np.ndarray
+) -> dict[str, Any]:
+    """Mirror the transforms values and animCurves of a controller data.
+
+    :param data: Data returned by snapshot.get_controller_data.
+    :param signs: Axis signs returned by get_axis_signs.
+
+    :returns: Mirrored copy of data.
+    """
+    attr_signs = {}
+    for i, axis in enumerate("XYZ"):
+        others = [signs[j] for j in range(3) if j != i]
+        attr_signs[f"translate{axis}"] = signs[i]
+        # A rotation keeps its direction if both other axes are flipped.
+        attr_signs[f"rotate{axis}"] = others[0] * others[1]
+
+    mirrored = copy.deepcopy(data)
+    for attr, sign in attr_signs.items():
+        if sign > 0:
+            continue
+        if attr in mirrored["attributes"]:
+            mirrored["attributes"][attr] *= -1
+        curve_data = mirrored["curves"].get(attr)
+        if curve_data:
+            for key in ["values", "in_angles", "out_angles"]:
+                if curve_data.get(key):
+                    curve_data[key] = [-value for value in curve_data[key]]
+
+    return mirrored
+
+
+@utils.undoable
+@query_cache.scoped
+def mirror_sticky(soft_mod: str, axis: int = 0) -> str | None:
+    """Create the sticky on the opposite side of the geometry, with the same
+    radius, falloff mode, envelope and deformed geometries, and mirrored
+    controllers animation.
+
+    :param soft_mod: SoftMod of the sticky to mirror.
+    :param axis: Mirror axis, 0 for x, 1 for y, 2 for z.
+
+    :returns: SoftMod of the mirrored sticky.
+    """
+    uvp, idx = sticky.get_sticky_pin(soft_mod)
+    if not uvp:
+        log.warning(f"-{soft_mod}- is not a sticky !")
+        return
+
+    # Find the mirrored vertices of the triangle the sticky is pinned on.
+    geo = sticky.get_pin_geometry(uvp)
+    shape = mesh.get_shape_deformed(geo, create=False)
+    triangles, triangle_uvs = get_triangles(geo)
+    triangle, bary = geometry.locate_uv(
+        triangle_uvs,
+        (
+            cmds.getAttr(f"{uvp}.coordinate[{idx}].coordinateU"),
+            cmds.getAttr(f"{uvp}.coordinate[{idx}].coordinateV"),
+        ),
+    )
+    mirrored_vertices = get_symmetry_map(geo, axis)[triangles[triangle]]
+    if np.any(mirrored_vertices == -1):
+        log.warning(f"Geometry -{geo}- is not symmetric around -{soft_mod}- !")
+        return
+
+    get_points = mesh.get_points_reader(
+        mesh.get_mesh_fn(shape), om.MSpace.kWorld
+    )
+    mirrored_soft_mod = sticky.create_sticky(
+        position=bary @ get_points(mirrored_vertices),
+        geometry=geo,
+        select=False,
+        triangulation=(triangles, triangle_uvs),
+    )
+    if not mirrored_soft_mod:
+        return
+
+    extra_geometries = [
+        deformed
+        for deformed in sticky.get_deformed_geometries(soft_mod)
+        if deformed != geo
+    ]
+    if extra_geometries:
+        sticky.add_geometries(mirrored_soft_mod, extra_geometries)
+
+    mirrored_uvp, mirrored_idx = sticky.get_sticky_pin(mirrored_soft_mod)
+    signs = get_axis_signs(
+        cmds.getAttr(f"{uvp}.outputMatrix[{idx}]"),
+        cmds.getAttr(f"{mirrored_uvp}.outputMatrix[{mirrored_idx}]"),
+        axis,
+    )
+    for source, target in zip(
+        sticky.get_sticky_controllers(soft_mod),
+        sticky.get_sticky_controllers(mirrored_soft_mod),
+    ):
+        snapshot.apply_controller_data(
+            target,
+            mirror_controller_data(snapshot.get_controller_data(source), signs),
+        )
+    cmds.setAttr(f"{mirrored_soft_mod}.envelope", lod.get_envelope(soft_mod))
+
+    return mirrored_soft_mod
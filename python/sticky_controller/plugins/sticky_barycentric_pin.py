@@ -0,0 +1,162 @@
+"""Pin matrices on a mesh from cached triangle vertices and barycentric
+weights. Unlike the uvPin, no uv lookup is done at evaluation, only the three
+vertices of each pinned triangle are read from the input mesh. The input mesh
+itself is still evaluated whole upstream, by the deformers producing it: the
+node saves the uv lookup, not the deformation of the mesh.
+
+The plug-in is self-contained, it doesn't need the sticky_controller package
+to be importable, so scenes using it can be opened anywhere it is loaded. It
+is opt-in, see pin.ENABLE_VARIABLE: without the plug-in, the nodes of a saved
+scene are unknown and its stickies don't follow their geometry.
+"""
+
+from __future__ import annotations
+
+from maya.api import OpenMaya as om
+
+
+def maya_useNewAPI():
+    """Tells Maya this plug-in uses the Python API 2.0."""
+
+
+def get_pin_matrix(
+    points: list[om.MPoint],
+    weights: tuple[float, float, float],
+    tangent_weights: tuple[float, float],
+) -> om.MMatrix:
+    """Returns the matrix of a point on a triangle, with the triangle normal
+    as Y axis and its U tangent as X axis, like a uvPin with normalAxis Y.
+
+    :param points: Triangle corners.
+    :param weights: Barycentric weights of the pinned point.
+    :param tangent_weights: Weights of the edges giving the U tangent.
+    """
+    position = om.MVector()
+    for point, weight in zip(points, weights):
+        position += om.MVector(point) * weight
+
+    edge_1 = points[1] - points[0]
+    edge_2 = points[2] - points[0]
+    normal = (edge_1 ^ edge_2).normal()
+    tangent = edge_1 * tangent_weights[0] + edge_2 * tangent_weights[1]
+    tangent -= normal * (tangent * normal)
+    if tangent.length() < 1e-12:
+        tangent = edge_1 - normal * (edge_1 * normal)
+    tangent.normalize()
+    binormal = tangent ^ normal
+
+    rows = [(*tangent, 0), (*normal, 0), (*binormal, 0), (*position, 1)]
+    return om.MMatrix([value for row in rows for value in row])
+
+
+class BarycentricPin(om.MPxNode):
+    type_name = "stickyBarycentricPin"
+    # Local id (0x00000 - 0x7ffff), only unique within a studio. Replace it
+    # with an id of a block registered with Autodesk before sharing scenes
+    # using the node, binary scenes store it.
+    type_id = om.MTypeId(0x0007A8C1)
+
+    input_geometry = None
+    uv_pin = None
+    pin = None
+    vertex_ids = None
+    weights = None
+    tangent_weights = None
+    output_matrix = None
+
+    @staticmethod
+    def creator():
+        return BarycentricPin()
+
+    @classmethod
+    def initialize(cls):
+        typed_attr = om.MFnTypedAttribute()
+        numeric_attr = om.MFnNumericAttribute()
+        compound_attr = om.MFnCompoundAttribute()
+        matrix_attr = om.MFnMatrixAttribute()
+        message_attr = om.MFnMessageAttribute()
+
+        cls.input_geometry = typed_attr.create(
+            "inputGeometry", "ig", om.MFnData.kMesh
+        )
+        # UvPin whose coordinates are converted, see core/pin.py.
+        cls.uv_pin = message_attr.create("uvPin", "uvp")
+
+        cls.vertex_ids = numeric_attr.create(
+            "vertexIds", "vid", om.MFnNumericData.k3Int
+        )
+        cls.weights = numeric_attr.create(
+            "weights", "w", om.MFnNumericData.k3Double
+        )
+        cls.tangent_weights = numeric_attr.create(
+            "tangentWeights", "tw", om.MFnNumericData.k2Double
+        )
+        cls.pin = compound_attr.create("pin", "pin")
+        compound_attr.addChild(cls.vertex_ids)
+        compound_attr.addChild(cls.weights)
+        compound_attr.addChild(cls.tangent_weights)
+        compound_attr.array = True
+
+        cls.output_matrix = matrix_attr.create("outputMatrix", "om")
+        matrix_attr.array = True
+        matrix_attr.usesArrayDataBuilder = True
+        matrix_attr.writable = False
+        matrix_attr.storable = False
+
+        for attr in [cls.input_geometry, cls.uv_pin, cls.pin]:
+            cls.addAttribute(attr)
+        cls.addAttribute(cls.output_matrix)
+        for attr in [
+            cls.input_geometry,
+            cls.pin,
+            cls.vertex_ids,
+            cls.weights,
+            cls.tangent_weights,
+        ]:
+            cls.attributeAffects(attr, cls.output_matrix)
+
+    def compute(self, plug: om.MPlug, data_block: om.MDataBlock):
+        if plug.attribute() != self.output_matrix:
+            return None
+
+        # The mesh data is referenced, not copied, but pulling it evaluates
+        # the whole deformation chain upstream.
+        mesh = data_block.inputValue(self.input_geometry).asMesh()
+        output_handle = data_block.outputArrayValue(self.output_matrix)
+        builder = output_handle.builder()
+
+        if not mesh.isNull():
+            mesh_fn = om.MFnMesh(mesh)
+            vertex_count = mesh_fn.numVertices
+            pin_handle = data_block.inputArrayValue(self.pin)
+            for i in range(len(pin_handle)):
+                pin_handle.jumpToPhysicalElement(i)
+                index = pin_handle.elementLogicalIndex()
+                handle = pin_handle.inputValue()
+                vertex_ids = handle.child(self.vertex_ids).asInt3()
+                if max(vertex_ids) >= vertex_count:
+                    continue
+                # Only the three vertices of the pinned triangle are read.
+                matrix = get_pin_matrix(
+                    [mesh_fn.getPoint(vertex_id) for vertex_id in vertex_ids],
+                    handle.child(self.weights).asDouble3(),
+                    handle.child(self.tangent_weights).asDouble2(),
+                )
+                builder.addElement(index).setMMatrix(matrix)
+
+        output_handle.set(builder)
+        output_handle.setAllClean()
+        data_block.setClean(plug)
+
+
+def initializePlugin(plugin: om.MObject):
+    om.MFnPlugin(plugin).registerNode(
+        BarycentricPin.type_name,
+        BarycentricPin.type_id,
+        BarycentricPin.creator,
+        BarycentricPin.initialize,
+    )
+
+
+def uninitializePlugin(plugin: om.MObject):
+    om.MFnPlugin(plugin).deregisterNode(BarycentricPin.type_id)
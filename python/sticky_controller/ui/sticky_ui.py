@@ -5,6 +5,7 @@ from PySide2.QtCore import Qt
 from PySide2.QtGui import QIcon
 from PySide2.QtWidgets import (
     QDialog,
+    QFileDialog,
     QVBoxLayout,
     QWidget,
     QInputDialog,
@@ -18,7 +19,23 @@ from maya import cmds
 from maya.OpenMayaUI import MQtUtil
 
 from sticky_controller import utils, __version__
-from sticky_controller.core import controller, sticky
+from sticky_controller.core import (
+    controller,
+    sticky,
+    snapshot,
+    reanchor,
+    contact,
+    symmetry,
+    query_cache,
+    lod,
+    bake,
+    rename,
+    preview,
+    pin,
+    precompute,
+    remap,
+    sticky_index,
+)
 from sticky_controller.ui.widgets import StickyTree, StickyItem
 
 
@@ -49,17 +66,43 @@ class StickyUi(QDialog):
         self._stickies: list[dict[str, str]] = [
             # {"soft_mod": str, "slide_ctrl": str, "ctrl": str}
         ]
+        self._selection_job: int | None = None
 
         self.main_layout = QVBoxLayout(self)
         self.build_ui()
         self.fill_ui()
 
+        # Prepare the meshes surfaces while the user picks vertices.
+        precompute.start()
+        # Scenes are saved at full quality, reconnect their LOD.
+        lod.start()
+
     def build_ui(self):
         # Widgets.
         create_btn = QPushButton("Create")
         create_btn.setIcon(QIcon(f"{utils.get_resource('icons')}/sticky.png"))
         refresh_btn = QPushButton("Reload")
         refresh_btn.setIcon(QIcon(":refresh.png"))
+        contacts_btn = QPushButton("Contacts")
+        contacts_btn.setIcon(QIcon(":nClothCollide.png"))
+        export_btn = QPushButton("Export")
+        export_btn.setIcon(QIcon(":fileSave.png"))
+        import_btn = QPushButton("Import")
+        import_btn.setIcon(QIcon(":fileOpen.png"))
+        self.lod_btn = QPushButton("LOD")
+        self.lod_btn.setIcon(QIcon(":Camera.png"))
+        self.lod_btn.setCheckable(True)
+        self.lod_btn.setChecked(lod.has_lod())
+        self.lod_btn.setToolTip(
+            "Switch off the stickies outside of the active camera on the "
+            "playback range."
+        )
+        self.selection_btn = QPushButton("Selection")
+        self.selection_btn.setIcon(QIcon(":aselect.png"))
+        self.selection_btn.setCheckable(True)
+        self.selection_btn.setToolTip(
+            "Only show the stickies deforming the selected geometries."
+        )
         self.tree = StickyTree()
         self.filter_le = QLineEdit()
         self.filter_le.setPlaceholderText("Search for Sticky name")
@@ -70,15 +113,28 @@ class StickyUi(QDialog):
         btn_layout.setContentsMargins(0, 0, 0, 0)
         btn_layout.addWidget(create_btn)
         btn_layout.addWidget(refresh_btn)
+        btn_layout.addWidget(contacts_btn)
+        btn_layout.addWidget(export_btn)
+        btn_layout.addWidget(import_btn)
+        btn_layout.addWidget(self.lod_btn)
         self.main_layout.addLayout(btn_layout)
-        self.main_layout.addWidget(self.filter_le)
+        filter_layout = QHBoxLayout()
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout.addWidget(self.filter_le)
+        filter_layout.addWidget(self.selection_btn)
+        self.main_layout.addLayout(filter_layout)
         self.main_layout.addWidget(self.tree)
 
         # Connections.
         self.filter_le.textChanged.connect(self.tree.filter_items)
+        self.selection_btn.toggled.connect(self.toggle_selection_filter)
         # Tree.
         create_btn.pressed.connect(self.run_create_sticky)
         refresh_btn.pressed.connect(self.fill_ui)
+        contacts_btn.pressed.connect(self.create_contact_stickies)
+        export_btn.pressed.connect(self.export_stickies)
+        import_btn.pressed.connect(self.import_stickies)
+        self.lod_btn.toggled.connect(self.toggle_lod)
         self.tree.select_controllers_act.triggered.connect(
             self.select_controllers
         )
@@ -91,10 +147,21 @@ class StickyUi(QDialog):
         self.tree.remove_deformed_geometries_act.triggered.connect(
             self.remove_deformed_geometries
         )
+        self.tree.preview_radius_act.triggered.connect(self.preview_radius)
+        self.tree.barycentric_pin_act.triggered.connect(
+            self.set_barycentric_pin
+        )
+        self.tree.reanchor_act.triggered.connect(self.reanchor_sticky)
+        self.tree.bake_reanchor_act.triggered.connect(self.bake_reanchor_sticky)
+        self.tree.bake_drivers_act.triggered.connect(self.bake_drivers)
+        self.tree.record_anchors_act.triggered.connect(self.record_anchors)
+        self.tree.remap_act.triggered.connect(self.remap_stickies)
         self.tree.rename_act.triggered.connect(self.rename_sticky)
+        self.tree.mirror_act.triggered.connect(self.mirror_sticky)
         self.tree.delete_act.triggered.connect(self.delete_sticky)
         self.tree.itemClicked.connect(enable_sticky)
 
+    @query_cache.scoped
     def fill_ui(self):
         """Fill the tree with all stickies in the scene."""
         self.tree.clear()
@@ -107,6 +174,37 @@ class StickyUi(QDialog):
         self.tree.resizeColumnToContents(0)
         self.tree.resizeColumnToContents(1)
         self.tree.resizeColumnToContents(2)
+        self.tree.apply_filters()
+
+    def done(self, result: int):
+        """Stop the selection filter, the radius preview and the scene index
+        callbacks when the window is closed, rejected with Esc included.
+        """
+        self.selection_btn.setChecked(False)
+        preview.stop_preview()
+        sticky_index.remove_callbacks()
+        super().done(result)
+
+    def toggle_selection_filter(self, checked: bool):
+        """Follow the viewport selection, showing only the stickies deforming
+        the selected geometries, or stop following it.
+        """
+        if self._selection_job is not None:
+            if cmds.scriptJob(exists=self._selection_job):
+                cmds.scriptJob(kill=self._selection_job, force=True)
+            self._selection_job = None
+
+        if checked:
+            self._selection_job = cmds.scriptJob(
+                event=["SelectionChanged", self.filter_selection]
+            )
+            self.filter_selection()
+        else:
+            self.tree.set_soft_mods_filter(None)
+
+    def filter_selection(self):
+        """Show only the stickies deforming the selected geometries."""
+        self.tree.set_soft_mods_filter(sticky_index.get_selection_soft_mods())
 
     def get_stickies(self):
         """Get all stickies in the scene and fill the instance attribute with
@@ -140,6 +238,7 @@ class StickyUi(QDialog):
             cmds.select(items[0].deformed_geometries, replace=True)
 
     @utils.undoable
+    @query_cache.scoped
     def add_deformed_geometries(self):
         """Add selected viewport geometries as deformed geometries of selected
         sticky.
@@ -152,12 +251,12 @@ class StickyUi(QDialog):
         geometries = []
         for node in cmds.ls(selection=True, shortNames=True):
             if (
-                cmds.nodeType(node) != "transform"
+                query_cache.node_type(node) != "transform"
                 or node in item.deformed_geometries
             ):
                 continue
-            shapes = cmds.listRelatives(node, shapes=True, path=True)
-            if shapes and cmds.nodeType(shapes[0]) == "mesh":
+            shapes = query_cache.list_relatives(node, shapes=True, path=True)
+            if shapes and query_cache.node_type(shapes[0]) == "mesh":
                 geometries.append(node)
 
         if not geometries:
@@ -174,6 +273,7 @@ class StickyUi(QDialog):
         item.update_display()
 
     @utils.undoable
+    @query_cache.scoped
     def remove_deformed_geometries(self):
         """Remove selected viewport geometries from deformed geometries of
         selected sticky.
@@ -186,12 +286,12 @@ class StickyUi(QDialog):
         geometries = []
         for node in cmds.ls(selection=True, shortNames=True):
             if (
-                cmds.nodeType(node) != "transform"
+                query_cache.node_type(node) != "transform"
                 or node not in item.deformed_geometries
             ):
                 continue
-            shapes = cmds.listRelatives(node, shapes=True, path=True)
-            if shapes and cmds.nodeType(shapes[0]) == "mesh":
+            shapes = query_cache.list_relatives(node, shapes=True, path=True)
+            if shapes and query_cache.node_type(shapes[0]) == "mesh":
                 geometries.append(node)
 
         if not geometries:
@@ -201,36 +301,141 @@ class StickyUi(QDialog):
 
         item.update_display()
 
-    @utils.undoable
-    def rename_sticky(self):
-        """Rename the selected sticky controller."""
+    def preview_radius(self, checked: bool):
+        """Preview the falloff weights of selected sticky while editing its
+        radius and falloff mode, or stop the preview.
+        """
+        items = self.tree.selectedItems()
+        if checked and items:
+            preview.start_preview(items[0].soft_mod)
+        else:
+            preview.stop_preview()
+
+    def set_barycentric_pin(self, checked: bool):
+        """Pin the selected stickies with a barycentric pin, or back with
+        their uvPin.
+        """
+        for item in self.tree.selectedItems():
+            pin.set_pin_mode(
+                item.soft_mod, pin.BARYCENTRIC if checked else pin.UV
+            )
+
+    def reanchor_sticky(self):
+        """Move the base point of selected sticky under its slide_ctrl."""
+        items = self.tree.selectedItems()
+        if items:
+            reanchor.reanchor(items[0].soft_mod)
+
+    def bake_reanchor_sticky(self):
+        """Make the base point of selected sticky follow its slide_ctrl on the
+        playback range.
+        """
         items = self.tree.selectedItems()
         if not items:
             return
-        item: StickyItem = items[0]
 
-        new_name, ok = QInputDialog.getText(
-            self, "Sticky Renamer", "Enter the new sticky name:"
+        reanchor.bake_reanchor(
+            items[0].soft_mod,
+            cmds.playbackOptions(query=True, minTime=True),
+            cmds.playbackOptions(query=True, maxTime=True),
         )
+        items[0].update_display()
 
-        if not new_name or not ok:
+    def bake_drivers(self):
+        """Bake the constraints and drivers of the controllers of selected
+        stickies on the playback range.
+        """
+        items = self.tree.selectedItems()
+        if not items:
             return
 
-        sticky_orig = cmds.listRelatives(item.slide_ctrl, parent=True)[0]
-        sticky_root = cmds.listRelatives(sticky_orig, parent=True)[0]
+        tolerance, ok = QInputDialog.getDouble(
+            self,
+            "Bake",
+            "Redundant keys tolerance (0 keeps all keys):",
+            0.001,
+            0,
+            1000,
+            4,
+        )
+        if not ok:
+            return
 
-        base_name = item.soft_mod.replace("_sfm", "")
-        item.soft_mod = cmds.rename(item.soft_mod, new_name + "_sfm")
-        for node in cmds.listRelatives(sticky_root, allDescendents=True):
-            cmds.rename(node, node.replace(base_name, new_name))
-        cmds.rename(sticky_root, sticky_root.replace(base_name, new_name))
+        bake.bake_drivers(
+            [item.soft_mod for item in items],
+            cmds.playbackOptions(query=True, minTime=True),
+            cmds.playbackOptions(query=True, maxTime=True),
+            tolerance or None,
+        )
+        for item in items:
+            item.update_display()
 
-        # Reassign slide_ctrl and ctrl to the StickyItem properties.
-        slide_ctrl, ctrl = sticky.get_sticky_controllers(item.soft_mod)
-        item.slide_ctrl = slide_ctrl
-        item.ctrl = ctrl
+    def record_anchors(self):
+        """Record the surface anchors of selected stickies."""
+        items = self.tree.selectedItems()
+        if items:
+            remap.record_anchors([item.soft_mod for item in items])
 
-        item.update_display()
+    def remap_stickies(self):
+        """Pin selected stickies back on their recorded anchors, then select
+        the ones which moved beyond a tolerance.
+        """
+        items = self.tree.selectedItems()
+        if not items:
+            return
+
+        tolerance, ok = QInputDialog.getDouble(
+            self,
+            "Remap",
+            "Report stickies moved beyond:",
+            0.01,
+            0,
+            1000,
+            4,
+        )
+        if not ok:
+            return
+
+        moved = remap.remap_stickies(
+            [item.soft_mod for item in items], tolerance
+        )
+        for item in items:
+            item.setSelected(item.soft_mod in (moved or {}))
+
+    def rename_sticky(self):
+        """Rename the selected sticky, or the selected stickies from a
+        pattern.
+        """
+        items = self.tree.selectedItems()
+        if not items:
+            return
+
+        if len(items) == 1:
+            new_name, ok = QInputDialog.getText(
+                self, "Sticky Renamer", "Enter the new sticky name:"
+            )
+            if new_name and ok:
+                rename.rename_sticky(items[0].soft_mod, new_name)
+        else:
+            pattern, ok = QInputDialog.getText(
+                self,
+                "Sticky Renamer",
+                "Enter the pattern ({side} is L, C or R, {counter} is "
+                "counted per side):",
+                text="sticky_{side}_{counter:02d}",
+            )
+            if pattern and ok:
+                rename.rename_with_pattern(
+                    [item.soft_mod for item in items], pattern
+                )
+
+        self.fill_ui()
+
+    def mirror_sticky(self):
+        """Create the mirrored sticky of selected sticky."""
+        items = self.tree.selectedItems()
+        if items and symmetry.mirror_sticky(items[0].soft_mod):
+            self.fill_ui()
 
     @utils.undoable
     def delete_sticky(self):
@@ -241,6 +446,59 @@ class StickyUi(QDialog):
             cmds.delete(cmds.listRelatives(sticky_orig[0], parent=True)[0])
         self.fill_ui()
 
+    def create_contact_stickies(self):
+        """Create stickies where the first selected geometry is in contact
+        with the second one on the playback range.
+        """
+        threshold, ok = QInputDialog.getDouble(
+            self, "Contacts", "Contact distance:", 0.1, 0, 1000, 3
+        )
+        if ok:
+            contact.detect(threshold)
+            self.fill_ui()
+
+    def export_stickies(self):
+        """Export all stickies of the scene in a snapshot file."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Stickies", "", "Sticky snapshot (*.json)"
+        )
+        if path:
+            snapshot.export_stickies(path)
+
+    def import_stickies(self):
+        """Rebuild the stickies of a snapshot file."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Stickies", "", "Sticky snapshot (*.json)"
+        )
+        if path:
+            snapshot.import_stickies(path)
+            self.fill_ui()
+
+    def toggle_lod(self, checked: bool):
+        """Compute the LOD of every sticky for the active camera on the
+        playback range, or remove it.
+        """
+        if not checked:
+            lod.remove_lod()
+            return
+
+        camera = lod.get_active_camera()
+        min_size, ok = QInputDialog.getDouble(
+            self, "LOD", "Minimum size on screen (pixels):", 4, 0, 10000, 1
+        )
+        if not camera or not ok:
+            self.lod_btn.setChecked(False)
+            return
+
+        lod.apply_lod(
+            snapshot.get_stickies(),
+            camera,
+            cmds.playbackOptions(query=True, minTime=True),
+            cmds.playbackOptions(query=True, maxTime=True),
+            min_size,
+        )
+        self.lod_btn.setChecked(lod.has_lod())
+
     @utils.undoable
     def run_create_sticky(self):
         sticky.create()
@@ -249,4 +507,4 @@ class StickyUi(QDialog):
 
 def enable_sticky(item: StickyItem):
     """If item is checked then its soft mod is enabled."""
-    cmds.setAttr(f"{item.soft_mod}.envelope", item.checkState(0) == Qt.Checked)
+    lod.set_envelope(item.soft_mod, item.checkState(0) == Qt.Checked)
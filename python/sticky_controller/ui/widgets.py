@@ -3,6 +3,7 @@ from __future__ import annotations
 from PySide2.QtCore import Qt
 from PySide2.QtGui import QPalette, QColor, QIcon
 from PySide2.QtWidgets import (
+    QAbstractItemView,
     QTreeWidget,
     QMenu,
     QAction,
@@ -11,6 +12,8 @@ from PySide2.QtWidgets import (
 )
 from maya import cmds
 
+from sticky_controller.core import animation, sticky, query_cache, preview, pin
+
 
 class StickyTree(QTreeWidget):
     def __init__(self, parent=None):
@@ -19,6 +22,10 @@ class StickyTree(QTreeWidget):
         self.setRootIsDecorated(False)  # Remove left padding.
         self.setHeaderHidden(True)
         self.setColumnCount(3)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+
+        self._filter_text = ""
+        self._filter_soft_mods: set[str] | None = None
 
         # AlternatingRowColors.
         palette = QPalette()
@@ -33,6 +40,14 @@ class StickyTree(QTreeWidget):
 
     def _show_context_menu(self, position):
         """Show customContextMenu."""
+        self.preview_radius_act.setChecked(
+            preview.get_previewed_sticky() is not None
+        )
+        items = self.selectedItems()
+        self.barycentric_pin_act.setChecked(
+            bool(items)
+            and pin.get_pin_mode(items[0].soft_mod) == pin.BARYCENTRIC
+        )
         self.menu.exec_(self.mapToGlobal(position))
 
     def _build_context_menu(self):
@@ -57,9 +72,48 @@ class StickyTree(QTreeWidget):
             "Remove selected geometries",
             parent=self,
         )
+        self.mirror_act = QAction(
+            QIcon(":polyMirrorGeometry.png"), "Mirror", parent=self
+        )
+        self.preview_radius_act = QAction(
+            QIcon(":softMod.png"), "Preview radius", parent=self
+        )
+        self.preview_radius_act.setCheckable(True)
+        self.barycentric_pin_act = QAction(
+            QIcon(":pointOnPolyConstraint.png"),
+            "Barycentric pin",
+            parent=self,
+        )
+        self.barycentric_pin_act.setCheckable(True)
+        self.barycentric_pin_act.setVisible(pin.is_barycentric_pin_enabled())
+        self.reanchor_act = QAction(
+            QIcon(":pointOnPolyConstraint.png"),
+            "Re-anchor slide controller",
+            parent=self,
+        )
+        self.bake_reanchor_act = QAction(
+            QIcon(":bakeAnimation.png"),
+            "Bake re-anchor on time range",
+            parent=self,
+        )
+        self.bake_drivers_act = QAction(
+            QIcon(":bakeAnimation.png"),
+            "Bake constraints and drivers on time range",
+            parent=self,
+        )
+        self.record_anchors_act = QAction(
+            QIcon(":pinItem.png"), "Record surface anchors", parent=self
+        )
+        self.remap_act = QAction(
+            QIcon(":polyTransfer.png"),
+            "Remap on updated geometries",
+            parent=self,
+        )
         self.delete_act = QAction(QIcon(":delete.png"), "Delete", parent=self)
 
         self.menu.addAction(self.rename_act)
+        self.menu.addAction(self.mirror_act)
+        self.menu.addAction(self.preview_radius_act)
         self.menu.addSeparator()
         self.menu.addAction(self.select_controllers_act)
         self.menu.addAction(self.select_geometries_act)
@@ -67,15 +121,45 @@ class StickyTree(QTreeWidget):
         self.menu.addAction(self.add_deformed_geometries_act)
         self.menu.addAction(self.remove_deformed_geometries_act)
         self.menu.addSeparator()
+        self.menu.addAction(self.barycentric_pin_act)
+        self.menu.addAction(self.reanchor_act)
+        self.menu.addAction(self.bake_reanchor_act)
+        self.menu.addAction(self.bake_drivers_act)
+        self.menu.addSeparator()
+        self.menu.addAction(self.record_anchors_act)
+        self.menu.addAction(self.remap_act)
+        self.menu.addSeparator()
         self.menu.addAction(self.delete_act)
 
     def filter_items(self, text: str):
         """Hide all items of tree which do not have given text their name."""
+        self._filter_text = text.lower()
+        self.apply_filters()
+
+    def set_soft_mods_filter(self, soft_mods: list[str] | None):
+        """Hide all items of tree whose softMod is not in given softMods, and
+        show their names in bold. None removes the filter.
+        """
+        self._filter_soft_mods = None if soft_mods is None else set(soft_mods)
+        self.apply_filters()
+
+    def apply_filters(self):
+        """Show only the items matching both the text and softMods filters."""
+        text = self._filter_text
+        soft_mods = self._filter_soft_mods
+        self.setUpdatesEnabled(False)
         tree_it = QTreeWidgetItemIterator(self, QTreeWidgetItemIterator.All)
         while tree_it.value():
             item = tree_it.value()
-            item.setHidden(not text.lower() in item.text(0).lower())
+            font = item.font(0)
+            font.setBold(soft_mods is not None and item.soft_mod in soft_mods)
+            item.setFont(0, font)
+            item.setHidden(
+                text not in item.text(0).lower()
+                or (soft_mods is not None and item.soft_mod not in soft_mods)
+            )
             tree_it += 1
+        self.setUpdatesEnabled(True)
 
 
 class StickyItem(QTreeWidgetItem):
@@ -93,24 +177,20 @@ class StickyItem(QTreeWidgetItem):
     @property
     def deformed_geometries(self) -> list[str]:
         """Returns the transform of each geometry deformed by the softMod."""
-        return [
-            cmds.listRelatives(shape, parent=True, path=True)[0]
-            for shape in cmds.deformer(self.soft_mod, query=True, geometry=True)
-            or []
-        ]
+        return sticky.get_deformed_geometries(self.soft_mod)
 
     @property
     def has_keys(self) -> bool:
         """Returns whether any controller of the sticky has keyframes or not."""
         for ctrl in [self.ctrl, self.slide_ctrl]:
             for attr in cmds.listAttr(ctrl, keyable=True):
-                input_nodes = cmds.listConnections(
+                input_nodes = query_cache.list_connections(
                     f"{ctrl}.{attr}",
                     source=True,
                     destination=False,
                     plugs=False,
                 )
-                if input_nodes and "animCurve" in cmds.nodeType(input_nodes[0]):
+                if input_nodes and animation.is_key_curve(input_nodes[0]):
                     return True
 
         return False
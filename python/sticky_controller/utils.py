@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import json
+import contextlib
 import functools
 from pathlib import Path
 from typing import Iterable, Any
 
 from maya import cmds
 
-from sticky_controller.core import log
+from sticky_controller.core import log, cache_store
+from sticky_controller.core.cache_store import CacheStore
 
 
 def get_package_root() -> Path:
@@ -25,6 +27,19 @@ def get_resource(string: str | Path) -> Path:
     return directory
 
 
+def get_cache_directory() -> Path:
+    """Returns ".../maya/sticky_controller/cache"."""
+    directory = Path(cmds.internalVar(userAppDir=True), "sticky_controller")
+    return directory.joinpath("cache")
+
+
+def get_cache_store() -> CacheStore:
+    """Returns the store of precomputed data, in the cache directory, see
+    cache_store.get_max_size for its size limit.
+    """
+    return CacheStore(get_cache_directory(), cache_store.get_max_size())
+
+
 def deserialize(path: str | Path) -> Any:
     """Deserialize file and returns data.
 
@@ -45,6 +60,25 @@ def deserialize(path: str | Path) -> Any:
     return data
 
 
+def serialize(data: Any, path: str | Path):
+    """Serialize data in a json file.
+
+    :param data: Json serializable data.
+    :param path: Full path of file without extension (Considered as ".json").
+
+    :raise NotADirectoryError: If parent directory does not exist.
+    """
+    json_file = path if Path(path).suffix == ".json" else Path(f"{path}.json")
+
+    if not Path(json_file).parent.exists():
+        raise NotADirectoryError(
+            f"Directory -{Path(json_file).parent}- does not exists !"
+        )
+
+    with open(json_file, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+
+
 def undoable(function: callable):
     """Decorator to create an undo chunk."""
 
@@ -54,8 +88,9 @@ def undoable(function: callable):
         cmds.undoInfo(openChunk=True, chunkName=function.__name__)
 
         # Run function.
+        result = None
         try:
-            function(*args, **kwargs)
+            result = function(*args, **kwargs)
         except Exception:
             log.exception(
                 f"An error has occured while running {function.__name__}",
@@ -65,9 +100,24 @@ def undoable(function: callable):
         # Close undoChunk
         cmds.undoInfo(closeChunk=True, chunkName=function.__name__)
 
+        return result
+
     return wrapper_function
 
 
+@contextlib.contextmanager
+def without_undo():
+    """Context manager running commands without recording them in the undo
+    queue, for temporary edits which must not be undone by the user.
+    """
+    state = cmds.undoInfo(query=True, stateWithoutFlush=True)
+    cmds.undoInfo(stateWithoutFlush=False)
+    try:
+        yield
+    finally:
+        cmds.undoInfo(stateWithoutFlush=state)
+
+
 def has_common_members(
     array_1: Iterable, array_2: Iterable, common_nbr: int = 1
 ) -> bool:
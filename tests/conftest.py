@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The package is not installed, it is loaded from the repository like Maya
+# does with the module file.
+sys.path.insert(0, Path(__file__).parents[1].joinpath("python").as_posix())
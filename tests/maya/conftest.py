@@ -0,0 +1,25 @@
+"""Fixtures of the tests needing mayapy, which skip themselves otherwise:
+
+mayapy -m pytest tests/maya
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def session():
+    import maya.standalone
+
+    maya.standalone.initialize()
+
+
+@pytest.fixture
+def geometry(session) -> str:
+    """Returns a sphere skinned to a joint, in a new scene."""
+    from maya import cmds
+
+    cmds.file(new=True, force=True)
+    sphere = cmds.polySphere(subdivisionsAxis=20, subdivisionsHeight=20)[0]
+    cmds.delete(sphere, constructionHistory=True)
+    cmds.skinCluster(cmds.createNode("joint"), sphere)
+    return sphere
@@ -0,0 +1,52 @@
+"""Bake tests, they need mayapy:
+
+mayapy -m pytest tests/maya
+"""
+
+import pytest
+
+pytest.importorskip("maya.standalone")
+
+
+def test_sample_plugs_matches_get_attr(session):
+    from maya import cmds
+    from sticky_controller.core import animation
+
+    cmds.file(new=True, force=True)
+    node = cmds.createNode("transform")
+    for attr, values in [("translateX", (0, 4)), ("rotateY", (0, 90))]:
+        cmds.setKeyframe(node, attribute=attr, time=1, value=values[0])
+        cmds.setKeyframe(node, attribute=attr, time=10, value=values[1])
+    plugs = [f"{node}.translateX", f"{node}.rotateY", f"{node}.worldMatrix[0]"]
+    frames = [1, 4, 10]
+
+    samples = animation.sample_plugs(plugs, frames)
+
+    for frame, values in zip(frames, samples):
+        for plug, value in zip(plugs, values):
+            assert value == pytest.approx(cmds.getAttr(plug, time=frame))
+    assert cmds.currentTime(query=True) == 1
+
+
+def test_bake_drivers(geometry):
+    from maya import cmds
+    from sticky_controller.core import animation, bake, sticky
+
+    soft_mod = sticky.create_sticky(None, geometry, uv=(0.5, 0.5), select=False)
+    _, ctrl = sticky.get_sticky_controllers(soft_mod)
+    driver = cmds.createNode("transform")
+    cmds.setKeyframe(driver, attribute="translateY", time=1, value=0)
+    cmds.setKeyframe(driver, attribute="translateY", time=10, value=3)
+    cmds.pointConstraint(driver, ctrl, maintainOffset=True)
+    expected = [
+        cmds.getAttr(f"{ctrl}.translateY", time=frame) for frame in range(1, 11)
+    ]
+
+    baked = bake.bake_drivers([soft_mod], 1, 10)
+
+    assert f"{ctrl}.translateY" in baked
+    assert not cmds.ls(type="pointConstraint")
+    curve = animation.get_anim_curve(f"{ctrl}.translateY")
+    assert cmds.keyframe(curve, query=True, valueChange=True) == pytest.approx(
+        expected
+    )
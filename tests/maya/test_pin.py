@@ -0,0 +1,70 @@
+"""Pin mode tests, they need mayapy:
+
+mayapy -m pytest tests/maya
+"""
+
+import pytest
+
+pytest.importorskip("maya.standalone")
+
+
+@pytest.fixture
+def soft_mod(geometry) -> str:
+    """Returns the softMod of a sticky on the sphere."""
+    from sticky_controller.core import sticky
+
+    return sticky.create_sticky(None, geometry, uv=(0.3, 0.4), select=False)
+
+
+def get_pin_position(soft_mod: str) -> list[float]:
+    """Returns the position of the pin matrix the slide_ctrl is placed on."""
+    from maya import cmds
+    from sticky_controller.core import pin
+
+    return cmds.getAttr(f"{pin.get_pin_multiply(soft_mod)}.matrixSum")[12:15]
+
+
+def get_uv_pin_position(soft_mod: str) -> list[float]:
+    from maya import cmds
+    from sticky_controller.core import sticky
+
+    uvp, idx = sticky.get_sticky_pin(soft_mod)
+    return cmds.getAttr(f"{uvp}.outputMatrix[{idx}]")[12:15]
+
+
+def test_uv_pin_is_default(soft_mod, monkeypatch):
+    from sticky_controller.core import pin
+
+    monkeypatch.delenv(pin.ENABLE_VARIABLE, raising=False)
+    pin.set_pin_mode(soft_mod, pin.BARYCENTRIC)
+
+    assert pin.get_pin_mode(soft_mod) == pin.UV
+
+
+def test_switch_keeps_position(soft_mod, monkeypatch):
+    from sticky_controller.core import pin
+
+    monkeypatch.setenv(pin.ENABLE_VARIABLE, "1")
+    position = get_pin_position(soft_mod)
+
+    pin.set_pin_mode(soft_mod, pin.BARYCENTRIC)
+    assert pin.get_pin_mode(soft_mod) == pin.BARYCENTRIC
+    assert get_pin_position(soft_mod) == pytest.approx(position, abs=1e-4)
+
+    pin.set_pin_mode(soft_mod, pin.UV)
+    assert pin.get_pin_mode(soft_mod) == pin.UV
+    assert get_pin_position(soft_mod) == pytest.approx(position, abs=1e-4)
+
+
+def test_offset_updated_on_reanchor(soft_mod, monkeypatch):
+    from sticky_controller.core import pin, reanchor
+
+    monkeypatch.setenv(pin.ENABLE_VARIABLE, "1")
+    pin.set_pin_mode(soft_mod, pin.BARYCENTRIC)
+
+    # Another triangle, the offset of the first one would be stale.
+    reanchor.set_pin_coordinates(soft_mod, (0.7, 0.6))
+
+    assert get_pin_position(soft_mod) == pytest.approx(
+        get_uv_pin_position(soft_mod), abs=1e-4
+    )
@@ -0,0 +1,85 @@
+"""Precompute tests, they need mayapy:
+
+mayapy -m pytest tests/maya
+"""
+
+import pytest
+
+pytest.importorskip("maya.standalone")
+
+
+@pytest.fixture
+def precomputer(session):
+    from sticky_controller.core import precompute
+
+    precomputer = precompute.Precomputer()
+    yield precomputer
+    precomputer.cancel()
+
+
+def get_shape(transform: str) -> str:
+    from maya import cmds
+
+    return cmds.listRelatives(
+        transform, shapes=True, noIntermediate=True, fullPath=True
+    )[0]
+
+
+def prepare(precomputer, shape: str):
+    """Prepare the surface of a mesh without waiting for idle events."""
+    precomputer.start([shape])
+    precomputer._extract_next(precomputer._generation)
+    precomputer._executor.shutdown(wait=True)
+    precomputer._executor = None
+
+
+def test_queue_selection_and_stickies(geometry, precomputer):
+    from maya import cmds
+    from sticky_controller.core import sticky
+
+    sticky.create_sticky(None, geometry, uv=(0.5, 0.5), select=False)
+    selected = cmds.polyCube()[0]
+    cmds.polyCube()
+    cmds.select(f"{selected}.vtx[0]")
+
+    precomputer.start()
+
+    assert sorted(precomputer._queue) == sorted(
+        [get_shape(geometry), get_shape(selected)]
+    )
+
+
+def test_get_watched_node(geometry):
+    from maya import cmds
+    from sticky_controller.core import mesh, precompute
+
+    assert precompute.get_watched_node(get_shape(geometry)) == (
+        mesh.get_original_shape(geometry)
+    )
+
+    transform, history = cmds.polyCube()
+    assert precompute.get_watched_node(get_shape(transform)) == history
+
+    # Fed by the skinCluster of the sphere, without original shape.
+    skin_cluster = cmds.ls(type="skinCluster")[0]
+    shape = cmds.createNode("mesh")
+    cmds.connectAttr(f"{skin_cluster}.outputGeometry[0]", f"{shape}.inMesh")
+    assert precompute.get_watched_node(shape) is None
+
+    assert (
+        precompute.get_watched_node(get_shape(cmds.polyCube()[0])) is not None
+    )
+    cube = cmds.polyCube()[0]
+    cmds.delete(cube, constructionHistory=True)
+    assert precompute.get_watched_node(get_shape(cube)) is None
+
+
+def test_stale_surface_is_prepared_again(geometry, precomputer):
+    shape = get_shape(geometry)
+    prepare(precomputer, shape)
+    assert precomputer.get_surface(shape) is not None
+
+    precomputer._stale.add(shape)
+
+    assert precomputer.get_surface(shape) is None
+    assert precomputer._queue == [shape]
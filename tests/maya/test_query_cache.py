@@ -0,0 +1,157 @@
+"""Query cache tests, they need mayapy:
+
+mayapy -m pytest tests/maya
+"""
+
+import pytest
+
+pytest.importorskip("maya.standalone")
+
+
+@pytest.fixture
+def scene(session):
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    cmds.file(new=True, force=True)
+    query_cache.reset_stats()
+
+
+def test_hits_and_misses(scene):
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    node = cmds.createNode("transform", name="node")
+    with query_cache.scope() as cache:
+        assert query_cache.node_type(node) == "transform"
+        assert query_cache.node_type(node) == "transform"
+        # Other flags are another query.
+        assert "transform" in query_cache.node_type(node, inherited=True)
+
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    assert query_cache.get_stats() == {
+        "hits": 1,
+        "misses": 2,
+        "invalidations": 0,
+    }
+
+
+def test_nested_scopes_share_the_cache(scene):
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    node = cmds.createNode("transform")
+    with query_cache.scope() as cache:
+        query_cache.node_type(node)
+        with query_cache.scope() as nested:
+            query_cache.node_type(node)
+
+        assert nested is cache
+        assert cache.hits == 1
+
+
+def test_returned_lists_are_copies(scene):
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    parent = cmds.createNode("transform")
+    cmds.createNode("transform", parent=parent)
+    with query_cache.scope():
+        query_cache.list_relatives(parent, children=True).append("edited")
+
+        assert len(query_cache.list_relatives(parent, children=True)) == 1
+
+
+def test_no_cache_outside_of_scope(scene):
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    node = cmds.createNode("transform")
+    query_cache.node_type(node)
+    query_cache.node_type(node)
+    # Outside of a scope invalidate does nothing.
+    query_cache.invalidate(node)
+
+    assert query_cache.get_stats()["hits"] == 0
+
+
+def test_invalidated_by_connection(scene):
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    source, target = cmds.createNode("transform"), cmds.createNode("transform")
+    plug = f"{target}.translateX"
+    with query_cache.scope():
+        assert query_cache.list_connections(plug, source=True) is None
+        cmds.connectAttr(f"{source}.translateY", plug)
+
+        assert query_cache.list_connections(plug, source=True) == [source]
+
+
+def test_invalidated_by_parent_and_rename(scene):
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    parent, child = cmds.createNode("transform"), cmds.createNode("transform")
+    with query_cache.scope():
+        assert query_cache.list_relatives(parent, children=True) is None
+        child = cmds.parent(child, parent)[0]
+        assert query_cache.list_relatives(parent, children=True) == [child]
+        child = cmds.rename(child, "renamed")
+
+        assert query_cache.list_relatives(parent, children=True) == [child]
+
+
+def test_invalidated_by_deletion(scene):
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    parent = cmds.createNode("transform")
+    child = cmds.createNode("transform", parent=parent)
+    with query_cache.scope():
+        assert query_cache.list_relatives(parent, children=True)
+        cmds.delete(child)
+
+        assert query_cache.list_relatives(parent, children=True) is None
+
+
+def test_invalidate_after_attribute_edit(scene):
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    transform = cmds.polyCube()[0]
+    shape = cmds.listRelatives(transform, shapes=True)[0]
+    kwargs = {"shapes": True, "noIntermediate": True}
+    with query_cache.scope():
+        assert query_cache.list_relatives(transform, **kwargs) == [shape]
+        cmds.setAttr(f"{shape}.intermediateObject", True)
+        # Attribute values aren't watched.
+        assert query_cache.list_relatives(transform, **kwargs) == [shape]
+        query_cache.invalidate(transform)
+
+        assert query_cache.list_relatives(transform, **kwargs) is None
+
+
+def test_create_shape_deformed_invalidates(scene):
+    from maya import cmds
+    from sticky_controller.core import mesh, query_cache
+
+    transform = cmds.polyCube()[0]
+    cmds.delete(transform, constructionHistory=True)
+    with query_cache.scope():
+        mesh.get_shape(transform)
+        shape_deformed = mesh.create_shape_deformed(transform)
+
+        assert mesh.get_shape(transform).split("|")[-1] == shape_deformed
+
+
+def test_callbacks_removed_at_scope_exit(scene):
+    from maya import cmds
+    from sticky_controller.core import query_cache
+
+    with query_cache.scope() as cache:
+        assert cache._callback_ids
+        cmds.createNode("transform")
+
+    assert not cache._callback_ids
@@ -0,0 +1,92 @@
+"""Remap tests, they need mayapy:
+
+mayapy -m pytest tests/maya
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("maya.standalone")
+
+
+def get_vertex_position(geometry: str, vertex: int) -> np.ndarray:
+    from maya import cmds
+
+    return np.array(
+        cmds.xform(
+            f"{geometry}.vtx[{vertex}]",
+            query=True,
+            translation=True,
+            worldSpace=True,
+        )
+    )
+
+
+def get_pin_position(soft_mod: str) -> np.ndarray:
+    from maya import cmds
+    from sticky_controller.core import sticky
+
+    uvp, idx = sticky.get_sticky_pin(soft_mod)
+    return np.array(cmds.getAttr(f"{uvp}.outputMatrix[{idx}]"))[12:15]
+
+
+def test_create_sticky_records_anchor(geometry):
+    from sticky_controller.core import anchor, sticky
+
+    position = get_vertex_position(geometry, 30)
+    soft_mod = sticky.create_sticky(position, geometry, select=False)
+    # The surface isn't prepared, the anchor is recorded at idle.
+    assert anchor.get_anchor(soft_mod) is None
+    anchor.record_pending_anchors()
+
+    frame = anchor.get_anchor(soft_mod)
+    assert frame is not None
+    # The geometry is not moved, object and world space match.
+    np.testing.assert_allclose(frame[3, :3], position, atol=1e-4)
+
+
+def test_create_sticky_with_triangulation_records_anchor(geometry):
+    from sticky_controller.core import anchor, mesh, sticky
+
+    triangulation = mesh.get_triangles(mesh.get_shape_deformed(geometry))
+    soft_mod = sticky.create_sticky(
+        None,
+        geometry,
+        uv=(0.5, 0.5),
+        select=False,
+        triangulation=triangulation,
+    )
+
+    assert anchor.get_anchor(soft_mod) is not None
+
+
+def test_remap_records_pending_anchors(geometry):
+    from sticky_controller.core import anchor, remap, sticky
+
+    soft_mod = sticky.create_sticky(None, geometry, uv=(0.5, 0.5), select=False)
+    position = get_pin_position(soft_mod)
+
+    assert not remap.remap_stickies([soft_mod])
+    assert anchor.get_anchor(soft_mod) is not None
+    np.testing.assert_allclose(get_pin_position(soft_mod), position, atol=1e-4)
+
+
+def test_remap_after_reanchor_keeps_position(geometry):
+    from maya import cmds
+    from sticky_controller.core import reanchor, remap, sticky
+
+    soft_mod = sticky.create_sticky(
+        get_vertex_position(geometry, 30), geometry, select=False
+    )
+    # Slide the sticky to another vertex and pin it there.
+    slide_ctrl, _ = sticky.get_sticky_controllers(soft_mod)
+    target = get_vertex_position(geometry, 50)
+    cmds.xform(slide_ctrl, translation=target.tolist(), worldSpace=True)
+    reanchor.reanchor(soft_mod)
+    position = get_pin_position(soft_mod)
+    np.testing.assert_allclose(position, target, atol=1e-3)
+
+    moved = remap.remap_stickies([soft_mod])
+
+    assert not moved
+    np.testing.assert_allclose(get_pin_position(soft_mod), position, atol=1e-4)
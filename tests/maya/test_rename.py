@@ -0,0 +1,88 @@
+"""Rename tests, they need mayapy:
+
+mayapy -m pytest tests/maya
+"""
+
+import pytest
+
+pytest.importorskip("maya.standalone")
+
+
+@pytest.fixture
+def stickies(geometry) -> list[str]:
+    """Returns the softMods of two stickies on the sphere."""
+    from sticky_controller.core import sticky
+
+    return [
+        sticky.create_sticky(None, geometry, uv=uv, select=False)
+        for uv in [(0.25, 0.5), (0.75, 0.5)]
+    ]
+
+
+def test_sanitize_name():
+    from sticky_controller.core import rename
+
+    assert rename.sanitize_name("cheek-L 01#") == "cheek_L_01_"
+    assert rename.sanitize_name("01_cheek") == "_01_cheek"
+
+
+def test_rename_sticky(stickies):
+    from maya import cmds
+    from sticky_controller.core import rename
+
+    nodes = rename.get_sticky_nodes(stickies[0])
+    uuids = {role: cmds.ls(node, uuid=True)[0] for role, node in nodes.items()}
+
+    soft_mod = rename.rename_sticky(stickies[0], "cheek")
+
+    assert soft_mod == "cheek_sfm"
+    for role, uuid in uuids.items():
+        name = cmds.ls(uuid)[0].rsplit("|", 1)[-1]
+        assert name == f"cheek{rename.SUFFIXES[role]}"
+    assert not cmds.ls("sticky_rename_tmp_*")
+
+
+def test_rename_sanitizes_before_collisions(stickies):
+    from maya import cmds
+    from sticky_controller.core import rename
+
+    cmds.createNode("transform", name="cheek_L_sfm")
+
+    assert rename.rename_sticky(stickies[0], "cheek-L") is None
+    assert cmds.objExists(stickies[0])
+    assert rename.rename_sticky(stickies[0], "cheek L2") == "cheek_L2_sfm"
+
+
+def test_swap_names(stickies):
+    from maya import cmds
+    from sticky_controller.core import rename
+
+    uuids = [cmds.ls(soft_mod, uuid=True)[0] for soft_mod in stickies]
+    base_names = [soft_mod.rsplit("_sfm", 1)[0] for soft_mod in stickies]
+
+    soft_mods = rename.rename_stickies(stickies, base_names[::-1])
+
+    assert soft_mods == stickies[::-1]
+    assert [cmds.ls(uuid)[0] for uuid in uuids] == stickies[::-1]
+
+
+def test_failed_rename_rolls_back(stickies, monkeypatch):
+    from maya import cmds
+    from sticky_controller.core import rename
+
+    names = sorted(cmds.ls())
+    # Fail on the third final name, after every temporary name.
+    failing_call = len(rename.get_renames(stickies[0], "cheek")) + 3
+    maya_rename = cmds.rename
+    calls = []
+
+    def rename_node(node, name, **kwargs):
+        calls.append(name)
+        if len(calls) == failing_call:
+            raise RuntimeError("Can't rename node !")
+        return maya_rename(node, name, **kwargs)
+
+    monkeypatch.setattr(rename.cmds, "rename", rename_node)
+
+    assert rename.rename_sticky(stickies[0], "cheek") is None
+    assert sorted(cmds.ls()) == names
@@ -0,0 +1,89 @@
+"""Snapshot tests, they need mayapy:
+
+mayapy -m pytest tests/maya
+"""
+
+import pytest
+
+pytest.importorskip("maya.standalone")
+
+
+def delete_stickies():
+    """Delete every sticky of the scene, with its uvPins."""
+    from maya import cmds
+
+    cmds.delete(cmds.ls("*_sticky_grp"), "STICKIES")
+    cmds.delete(cmds.ls(type="uvPin"))
+
+
+def test_create_anim_curve_without_keys(session):
+    from maya import cmds
+    from sticky_controller.core import animation
+
+    cmds.file(new=True, force=True)
+    node = cmds.createNode("transform")
+    curve = animation.create_anim_curve(
+        f"{node}.translateX", {"times": [], "values": []}
+    )
+
+    assert curve is None
+    assert not cmds.ls(type="animCurve")
+
+
+def test_create_anim_curve_on_element_plug(geometry):
+    from maya import cmds
+    from sticky_controller.core import animation, sticky
+
+    soft_mod = sticky.create_sticky(None, geometry, uv=(0.5, 0.5), select=False)
+    uvp, idx = sticky.get_sticky_pin(soft_mod)
+    plug = f"{uvp}.coordinate[{idx}].coordinateU"
+
+    curve = animation.create_anim_curve(
+        plug, {"times": [1, 10], "values": [0.25, 0.75]}
+    )
+
+    assert curve == animation.get_anim_curve(plug)
+    assert "[" not in curve and "." not in curve
+    assert cmds.keyframe(curve, query=True, valueChange=True) == [0.25, 0.75]
+
+
+def test_export_import_stickies(geometry, tmp_path):
+    from maya import cmds
+    from sticky_controller.core import animation, snapshot, sticky
+
+    soft_mod = sticky.create_sticky(None, geometry, uv=(0.3, 0.6), select=False)
+    slide_ctrl, ctrl = sticky.get_sticky_controllers(soft_mod)
+    cmds.setAttr(f"{ctrl}.radius", 3)
+    cmds.setKeyframe(f"{ctrl}.translateY", time=1, value=0)
+    cmds.setKeyframe(f"{ctrl}.translateY", time=12, value=2)
+    uvp, idx = sticky.get_sticky_pin(soft_mod)
+    cmds.setKeyframe(f"{uvp}.coordinate[{idx}].coordinateV", time=1, value=0.6)
+    cmds.setKeyframe(f"{uvp}.coordinate[{idx}].coordinateV", time=8, value=0.7)
+    expected = snapshot.get_sticky_data(soft_mod)
+    path = tmp_path / "stickies.json"
+
+    assert snapshot.export_stickies(path) == 1
+    delete_stickies()
+    soft_mods = snapshot.import_stickies(path)
+
+    assert soft_mods == [soft_mod]
+    data = snapshot.get_sticky_data(soft_mod)
+    assert data["uv"] == pytest.approx(expected["uv"])
+    assert data["ctrl"]["attributes"]["radius"] == 3
+    for key in ["uv_curves", "slide_ctrl", "ctrl"]:
+        assert data[key] == expected[key]
+    _, ctrl = sticky.get_sticky_controllers(soft_mod)
+    assert animation.get_anim_curve(f"{ctrl}.translateY")
+
+
+def test_import_skips_missing_geometry(geometry, tmp_path):
+    from maya import cmds
+    from sticky_controller.core import snapshot, sticky
+
+    sticky.create_sticky(None, geometry, uv=(0.3, 0.6), select=False)
+    path = tmp_path / "stickies.json"
+    snapshot.export_stickies(path)
+    delete_stickies()
+    cmds.delete(geometry)
+
+    assert snapshot.import_stickies(path) == []
@@ -0,0 +1,87 @@
+"""Sticky index tests, they need mayapy:
+
+mayapy -m pytest tests/maya
+"""
+
+import pytest
+
+pytest.importorskip("maya.standalone")
+
+
+@pytest.fixture
+def soft_mod(geometry) -> str:
+    """Returns the softMod of a sticky on the sphere."""
+    from sticky_controller.core import sticky, sticky_index
+
+    sticky_index.remove_callbacks()
+    return sticky.create_sticky(None, geometry, uv=(0.5, 0.5), select=False)
+
+
+def test_get_geometries(soft_mod, geometry):
+    from sticky_controller.core import sticky_index
+
+    assert sticky_index.get_geometries(soft_mod) == [geometry]
+    assert sticky_index.get_geometries("missing_sfm") == []
+
+
+def test_get_soft_mods(soft_mod, geometry):
+    from maya import cmds
+    from sticky_controller.core import sticky_index
+
+    shape = cmds.listRelatives(geometry, shapes=True, noIntermediate=True)[0]
+    for nodes in [[geometry], [shape], [f"{geometry}.vtx[0:3]"]]:
+        assert sticky_index.get_soft_mods(nodes) == [soft_mod]
+    assert sticky_index.get_soft_mods([cmds.createNode("transform")]) == []
+
+
+def test_get_selection_soft_mods(soft_mod, geometry):
+    from maya import cmds
+    from sticky_controller.core import sticky_index
+
+    cmds.select(f"{geometry}.f[0]")
+
+    assert sticky_index.get_selection_soft_mods() == [soft_mod]
+
+
+def test_invalidated_by_new_sticky(soft_mod, geometry):
+    from sticky_controller.core import sticky, sticky_index
+
+    assert sticky_index.get_soft_mods([geometry]) == [soft_mod]
+    other = sticky.create_sticky(None, geometry, uv=(0.2, 0.5), select=False)
+
+    assert sticky_index.get_soft_mods([geometry]) == [soft_mod, other]
+
+
+def test_invalidated_by_rename(soft_mod, geometry):
+    from maya import cmds
+    from sticky_controller.core import sticky_index
+
+    assert sticky_index.get_geometries(soft_mod) == [geometry]
+    renamed_geometry = cmds.rename(geometry, "renamed_geometry")
+    renamed_soft_mod = cmds.rename(soft_mod, "renamed_sfm")
+
+    assert sticky_index.get_geometries(renamed_soft_mod) == [renamed_geometry]
+    assert sticky_index.get_soft_mods([renamed_geometry]) == [renamed_soft_mod]
+
+
+def test_invalidated_by_reparent(soft_mod, geometry):
+    from maya import cmds
+    from sticky_controller.core import sticky_index
+
+    assert sticky_index.get_soft_mods([geometry]) == [soft_mod]
+    geometry = cmds.parent(geometry, cmds.createNode("transform"))[0]
+
+    assert sticky_index.get_soft_mods([geometry]) == [soft_mod]
+
+
+def test_callbacks_removed_on_new_scene(soft_mod, geometry):
+    from maya import cmds
+    from sticky_controller.core import sticky_index
+
+    sticky_index.get_geometries(soft_mod)
+    assert sticky_index._index._callback_ids
+
+    cmds.file(new=True, force=True)
+
+    assert not sticky_index._index._callback_ids
+    assert sticky_index.get_geometries(soft_mod) == []
@@ -0,0 +1,73 @@
+"""Synthetic meshes for the headless tests and benchmarks."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def make_grid(
+    rows: int, columns: int = None, size: float = 1
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns a triangulated grid in the xy plane, centered on the origin,
+    facing +z, with uvs matching its xy positions.
+
+    :returns: (n, 3) points, (t, 3) triangles and (n, 2) uvs.
+    """
+    columns = columns or rows
+    x, y = np.meshgrid(
+        np.linspace(-size / 2, size / 2, columns + 1),
+        np.linspace(-size / 2, size / 2, rows + 1),
+    )
+    points = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=-1)
+
+    ids = np.arange(points.shape[0]).reshape(rows + 1, columns + 1)
+    a, b = ids[:-1, :-1].ravel(), ids[:-1, 1:].ravel()
+    c, d = ids[1:, 1:].ravel(), ids[1:, :-1].ravel()
+    triangles = np.concatenate(
+        [np.stack([a, b, c], axis=-1), np.stack([a, c, d], axis=-1)]
+    )
+    uvs = points[:, :2] / size + 0.5
+
+    return points, triangles, uvs
+
+
+def make_sphere(
+    rows: int, columns: int = None, radius: float = 1
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns a closed uv sphere with outward facing triangles.
+
+    :returns: (n, 3) points and (t, 3) triangles.
+    """
+    columns = columns or rows * 2
+    theta = np.linspace(0, np.pi, rows + 1)[1:-1]
+    phi = np.linspace(0, np.pi * 2, columns, endpoint=False)
+    theta, phi = np.meshgrid(theta, phi, indexing="ij")
+    points = np.stack(
+        [
+            np.sin(theta) * np.cos(phi),
+            np.sin(theta) * np.sin(phi),
+            np.cos(theta),
+        ],
+        axis=-1,
+    ).reshape(-1, 3)
+    points = np.concatenate([[(0, 0, 1)], points, [(0, 0, -1)]]) * radius
+
+    def ring(i: int) -> np.ndarray:
+        return 1 + i * columns + np.arange(columns)
+
+    def fan(ids: np.ndarray, pole: int, flip: bool) -> np.ndarray:
+        poles = np.full(columns, pole)
+        if flip:
+            return np.stack([ids, poles, np.roll(ids, -1)], axis=-1)
+        return np.stack([poles, ids, np.roll(ids, -1)], axis=-1)
+
+    triangles = [fan(ring(0), 0, False)]
+    for i in range(rows - 2):
+        top, bottom = ring(i), ring(i + 1)
+        triangles.append(np.stack([top, bottom, np.roll(bottom, -1)], axis=-1))
+        triangles.append(
+            np.stack([top, np.roll(bottom, -1), np.roll(top, -1)], axis=-1)
+        )
+    triangles.append(fan(ring(rows - 2), len(points) - 1, True))
+
+    return points, np.concatenate(triangles)
@@ -0,0 +1,134 @@
+"""Tests of the on disk store of precomputed data. cache_store.py doesn't
+import Maya, so these tests run with a plain python interpreter.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+
+from sticky_controller.core import cache_store
+from sticky_controller.core.cache_store import CacheStore
+
+
+@pytest.fixture
+def store(tmp_path) -> CacheStore:
+    return CacheStore(tmp_path.joinpath("cache"), 1024**2)
+
+
+def test_get_key():
+    key = CacheStore.get_key("data", "ab", "c")
+
+    assert key.startswith("data_")
+    assert key == CacheStore.get_key("data", "ab", "c")
+    assert key != CacheStore.get_key("data", "a", "bc")
+    assert key != CacheStore.get_key("data", "ab", "c", version=2)
+    assert CacheStore.get_key("data", np.arange(3)) != CacheStore.get_key(
+        "data", np.arange(4)
+    )
+
+
+def test_put_and_get(store):
+    array = np.arange(10, dtype=float)
+
+    assert store.get("entry") is None
+    store.put("entry", array)
+
+    np.testing.assert_array_equal(store.get("entry"), array)
+    assert not list(store.directory.glob("*.tmp"))
+
+
+def test_failed_write_leaves_no_entry(store, monkeypatch):
+    def save(*args, **kwargs):
+        raise OSError("Disk full !")
+
+    monkeypatch.setattr(cache_store.np, "save", save)
+    store.put("entry", np.arange(10))
+
+    assert store.get("entry") is None
+    assert not list(store.directory.iterdir())
+
+
+def test_get_or_compute(store):
+    calls = []
+
+    def compute() -> np.ndarray:
+        calls.append(True)
+        return np.arange(3)
+
+    store.get_or_compute("entry", compute)
+    np.testing.assert_array_equal(
+        store.get_or_compute("entry", compute), [0, 1, 2]
+    )
+    assert len(calls) == 1
+
+
+def test_evict_least_recently_used(store):
+    arrays = {key: np.zeros(1000) for key in "abc"}
+    entry_size = 8000 + 128
+    store.max_size = int(entry_size * 2.5)
+    store.put("a", arrays["a"])
+    store.put("b", arrays["b"])
+    os.utime(store.get_path("a"), (100, 100))
+    os.utime(store.get_path("b"), (200, 200))
+    # Reading an entry makes it the most recently used.
+    store.get("a")
+
+    store.put("c", arrays["c"])
+
+    assert store.get("a") is not None
+    assert store.get("b") is None
+    assert store.get("c") is not None
+
+
+def test_lock(store):
+    with store.lock() as acquired:
+        assert acquired
+        with store.lock(timeout=0) as acquired_again:
+            assert not acquired_again
+
+    assert not store.directory.joinpath(".lock").exists()
+
+
+def test_stale_lock_is_broken(store):
+    path = store.directory.joinpath(".lock")
+    path.touch()
+    os.utime(path, (0, 0))
+
+    with store.lock(timeout=0, stale=60) as acquired:
+        assert acquired
+
+
+def test_remove_temporary_files(store):
+    old = store.directory.joinpath("old.tmp")
+    young = store.directory.joinpath("young.tmp")
+    old.touch()
+    young.touch()
+    os.utime(old, (0, 0))
+
+    store.remove_temporary_files(stale=3600)
+
+    assert not old.exists()
+    assert young.exists()
+
+
+def test_read_only_store(tmp_path):
+    # A file where the directory should be, it can't be created.
+    tmp_path.joinpath("file").touch()
+    store = CacheStore(tmp_path.joinpath("file", "cache"), 1024**2)
+
+    assert not store.writable
+    np.testing.assert_array_equal(
+        store.get_or_compute("entry", lambda: np.arange(3)), [0, 1, 2]
+    )
+    assert store.get("entry") is None
+
+
+def test_get_max_size(monkeypatch):
+    monkeypatch.setenv(cache_store.SIZE_VARIABLE, "10")
+    assert cache_store.get_max_size() == 10 * 1024**2
+
+    monkeypatch.setenv(cache_store.SIZE_VARIABLE, "10GB")
+    assert cache_store.get_max_size() == cache_store.DEFAULT_SIZE * 1024**2
@@ -0,0 +1,636 @@
+"""Compare the vectorized helpers of core/geometry.py with brute force
+references on synthetic meshes. geometry.py doesn't import Maya, so these
+tests run with a plain python interpreter.
+"""
+
+from __future__ import annotations
+
+import heapq
+
+import numpy as np
+import pytest
+
+from meshes import make_grid, make_sphere
+from sticky_controller.core import geometry
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(0)
+
+
+def closest_point_on_segment(
+    point: np.ndarray, a: np.ndarray, b: np.ndarray
+) -> np.ndarray:
+    ab = b - a
+    t = np.clip(np.dot(point - a, ab) / np.dot(ab, ab), 0, 1)
+    return a + t * ab
+
+
+def closest_point_on_triangle(
+    point: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray
+) -> np.ndarray:
+    """Projection on the plane if inside the triangle, closest point on the
+    edges otherwise.
+    """
+    normal = np.cross(b - a, c - a)
+    projected = point - np.dot(point - a, normal) / np.dot(normal, normal) * (
+        normal
+    )
+    inside = all(
+        np.dot(np.cross(end - start, projected - start), normal) >= 0
+        for start, end in [(a, b), (b, c), (c, a)]
+    )
+    if inside:
+        return projected
+
+    candidates = [
+        closest_point_on_segment(point, start, end)
+        for start, end in [(a, b), (b, c), (c, a)]
+    ]
+    return min(candidates, key=lambda p: np.linalg.norm(p - point))
+
+
+def cross_2d(a: np.ndarray, b: np.ndarray) -> float:
+    return a[0] * b[1] - a[1] * b[0]
+
+
+def get_edges(triangles: np.ndarray) -> list[tuple[int, int]]:
+    return sorted(
+        {
+            tuple(sorted((int(triangle[i]), int(triangle[(i + 1) % 3]))))
+            for triangle in triangles
+            for i in range(3)
+        }
+    )
+
+
+def test_closest_points_on_triangles(rng):
+    points = rng.uniform(-2, 2, (500, 3))
+    a, b, c = rng.uniform(-1, 1, (3, 500, 3))
+
+    closest, bary = geometry.closest_points_on_triangles(points, a, b, c)
+
+    expected = np.array(
+        [closest_point_on_triangle(*args) for args in zip(points, a, b, c)]
+    )
+    np.testing.assert_allclose(closest, expected, atol=1e-9)
+    np.testing.assert_allclose(bary.sum(axis=1), 1)
+    assert (bary >= -1e-9).all()
+    np.testing.assert_allclose(
+        bary[:, :1] * a + bary[:, 1:2] * b + bary[:, 2:] * c,
+        expected,
+        atol=1e-9,
+    )
+
+
+def test_spatial_hash_query_pairs(rng):
+    points = rng.uniform(-1, 1, (400, 3))
+    queries = rng.uniform(-1.2, 1.2, (300, 3))
+    radius = 0.2
+
+    query_ids, point_ids, distances = geometry.SpatialHash(
+        points, radius
+    ).query_pairs(queries, radius)
+
+    all_distances = np.linalg.norm(queries[:, None] - points[None], axis=-1)
+    expected = set(zip(*np.nonzero(all_distances <= radius)))
+    assert set(zip(query_ids.tolist(), point_ids.tolist())) == expected
+    np.testing.assert_allclose(distances, all_distances[query_ids, point_ids])
+
+
+def test_spatial_hash_nearest(rng):
+    points = rng.uniform(-1, 1, (400, 3))
+    queries = rng.uniform(-1.2, 1.2, (300, 3))
+    radius = 0.15
+
+    nearest, distances = geometry.SpatialHash(points, radius).nearest(
+        queries, radius
+    )
+
+    all_distances = np.linalg.norm(queries[:, None] - points[None], axis=-1)
+    expected = np.argmin(all_distances, axis=1)
+    expected_distances = all_distances.min(axis=1)
+    found = expected_distances <= radius
+    assert found.any() and not found.all()
+    np.testing.assert_array_equal(nearest[found], expected[found])
+    np.testing.assert_allclose(distances[found], expected_distances[found])
+    assert (nearest[~found] == -1).all()
+    assert np.isinf(distances[~found]).all()
+
+
+def test_find_contacts_on_plane(rng):
+    points, triangles, _ = make_grid(40, size=2)
+    normals = np.tile([0.0, 0, 1], (len(points), 1))
+    queries = np.column_stack(
+        [rng.uniform(-0.9, 0.9, (1000, 2)), rng.uniform(-0.09, 1, 1000)]
+    )
+    threshold = 0.1
+
+    point_ids, distances = geometry.find_contacts(
+        queries, points, normals, threshold, triangles
+    )
+
+    expected = np.nonzero(queries[:, 2] < threshold)[0]
+    np.testing.assert_array_equal(np.sort(point_ids), expected)
+    np.testing.assert_allclose(distances, queries[point_ids, 2])
+
+
+def test_find_contacts_with_long_edges():
+    """A point above a large triangle is farther than the first search radius
+    from every vertex, it is found among the vertices of the long edges.
+    """
+    points, triangles, _ = make_grid(20)
+    big_triangle = np.array([(2.0, 0, 0), (12, 0, 0), (2, 10, 0)])
+    triangles = np.concatenate([triangles, [np.arange(3) + len(points)]])
+    points = np.concatenate([points, big_triangle])
+    normals = np.tile([0.0, 0, 1], (len(points), 1))
+    queries = np.array(
+        [(4.0, 2, 0.05), (4, 2, -0.08), (4, 2, 0.5), (0, 0, 0.02), (0, 0, 1)]
+    )
+
+    point_ids, distances = geometry.find_contacts(
+        queries, points, normals, 0.1, triangles
+    )
+
+    np.testing.assert_array_equal(point_ids, [0, 1, 3])
+    np.testing.assert_allclose(distances, [0.05, -0.08, 0.02])
+
+
+def test_find_contacts_on_sphere(rng):
+    points, triangles = make_sphere(30)
+    normals = points.copy()
+    directions = geometry.normalize(rng.normal(size=(2000, 3)))
+    queries = directions * rng.uniform(0.8, 1.3, (2000, 1))
+    threshold = 0.05
+
+    point_ids, distances = geometry.find_contacts(
+        queries, points, normals, threshold, triangles
+    )
+
+    # Signed distance to the brute force closest point on every triangle.
+    corners = points[triangles]
+    closest, bary = geometry.closest_points_on_triangles(
+        np.repeat(queries, len(triangles), axis=0),
+        *np.tile(corners, (len(queries), 1, 1)).transpose(1, 0, 2),
+    )
+    vectors = (np.repeat(queries, len(triangles), axis=0) - closest).reshape(
+        len(queries), len(triangles), 3
+    )
+    all_distances = np.linalg.norm(vectors, axis=-1)
+    best = np.argmin(all_distances, axis=1)
+    rows = np.arange(len(queries))
+    normals = np.einsum(
+        "ij,ijk->ik",
+        bary.reshape(len(queries), len(triangles), 3)[rows, best],
+        points[triangles[best]],
+    )
+    signed = all_distances[rows, best] * np.sign(
+        np.einsum("ij,ij->i", vectors[rows, best], normals)
+    )
+    expected = np.nonzero(signed < threshold)[0]
+    order = np.argsort(point_ids)
+    np.testing.assert_array_equal(point_ids[order], expected)
+    # Points outside of the first radius use an approximate nearest vertex.
+    edges = geometry.get_edges(triangles)
+    radius = threshold + np.median(
+        np.linalg.norm(points[edges[:, 0]] - points[edges[:, 1]], axis=1)
+    )
+    vertex_distances = np.linalg.norm(
+        queries[expected, None] - points[None], axis=-1
+    )
+    exact = vertex_distances.min(axis=1) <= radius
+    assert exact.any() and not exact.all()
+    np.testing.assert_allclose(distances[order][exact], signed[expected][exact])
+    np.testing.assert_allclose(distances[order], signed[expected], atol=0.01)
+
+
+def test_find_contacts_between_vertices():
+    """Points just above the middle of the triangles of a coarse sphere are
+    below the tangent planes of the vertices, but not in contact.
+    """
+    points, triangles = make_sphere(6)
+    corners = points[triangles]
+    centers = corners.mean(axis=1)
+    face_normals = geometry.normalize(
+        np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    )
+    queries = centers + face_normals * 0.02
+
+    tangent_ids, _ = geometry.find_contacts(queries, points, points, 0.01)
+    point_ids, _ = geometry.find_contacts(
+        queries, points, points, 0.01, triangles
+    )
+    near_ids, distances = geometry.find_contacts(
+        queries, points, points, 0.03, triangles
+    )
+
+    assert len(tangent_ids) and not len(point_ids)
+    np.testing.assert_array_equal(near_ids, np.arange(len(queries)))
+    np.testing.assert_allclose(distances, 0.02)
+
+
+def test_find_contacts_deep_penetration(rng):
+    """Points deep inside a closed surface are found by the growing radius."""
+    points, triangles = make_sphere(40)
+    directions = geometry.normalize(rng.normal(size=(500, 3)))
+    queries = np.concatenate(
+        [
+            directions[:250] * rng.uniform(0, 0.7, (250, 1)),
+            directions[250:] * rng.uniform(1.2, 1.5, (250, 1)),
+        ]
+    )
+
+    point_ids, distances = geometry.find_contacts(
+        queries, points, points, 0.05, triangles
+    )
+
+    np.testing.assert_array_equal(np.sort(point_ids), np.arange(250))
+    assert (distances < -0.2).all()
+
+
+def test_cluster_vertices(rng):
+    points, triangles, _ = make_grid(15)
+    edges = geometry.get_edges(triangles)
+    vertex_ids = np.sort(
+        rng.choice(len(points), len(points) // 3, replace=False)
+    )
+
+    labels = geometry.cluster_vertices(vertex_ids, edges)
+
+    # Union-find over the edges between selected vertices.
+    parents = {int(v): int(v) for v in vertex_ids}
+
+    def find(v: int) -> int:
+        while parents[v] != v:
+            v = parents[v]
+        return v
+
+    for a, b in get_edges(triangles):
+        if a in parents and b in parents:
+            root_a, root_b = find(a), find(b)
+            parents[max(root_a, root_b)] = min(root_a, root_b)
+
+    # Labels are the smallest vertex id of each region.
+    expected = [find(int(v)) for v in vertex_ids]
+    np.testing.assert_array_equal(labels, expected)
+    assert len(np.unique(labels)) > 1
+
+
+def test_cluster_vertices_empty():
+    labels = geometry.cluster_vertices(
+        np.zeros(0, dtype=np.int64), np.array([[0, 1]])
+    )
+    assert labels.shape == (0,)
+
+
+def test_get_view_tangents():
+    aperture = (1.417, 0.945)
+    horizontal = aperture[0] * 25.4 / 2 / 35
+    vertical = aperture[1] * 25.4 / 2 / 35
+
+    # Horizontal fit, or fill when the film is narrower than the image.
+    for film_fit in [0, 1]:
+        tangents = geometry.get_view_tangents([35, 70], aperture, 2, film_fit)
+        np.testing.assert_allclose(
+            tangents,
+            [(horizontal, horizontal / 2), (horizontal / 2, horizontal / 4)],
+        )
+    # Vertical fit, or overscan when the film is narrower than the image.
+    for film_fit in [2, 3]:
+        tangents = geometry.get_view_tangents([35], aperture, 2, film_fit)
+        np.testing.assert_allclose(tangents, [(vertical * 2, vertical)])
+
+
+def test_get_spheres_visibility():
+    """Camera at the origin with a 90 degrees angle of view, then moved
+    forward by 95 on the second frame.
+    """
+    centers = np.array(
+        [
+            (0.0, 0, -10),  # In view.
+            (20, 0, -10),  # Off the side.
+            (10.5, 0, -10),  # Off the side, radius across the side plane.
+            (0, 0, -102),  # Beyond the far clip.
+            (0, 0, -100.5),  # Across the far clip.
+            (0, 0, 10),  # Behind the camera.
+            (0, 0, -50),  # Smaller than min_size.
+        ]
+    )
+    radii = np.array([1, 1, 1, 1, 1, 1, 0.1])
+    view_matrices = np.tile(np.eye(4), (2, 1, 1))
+    view_matrices[1, 3, 2] = 95
+
+    visibility = geometry.get_spheres_visibility(
+        np.stack([centers, centers]),
+        np.stack([radii, radii]),
+        view_matrices,
+        np.ones((2, 2)),
+        np.tile([0.1, 100], (2, 1)),
+        min_size=0.005,
+    )
+
+    np.testing.assert_array_equal(
+        visibility,
+        [
+            [True, False, True, False, True, False, False],
+            [False, False, False, True, True, False, False],
+        ],
+    )
+
+
+def test_get_step_keys():
+    np.testing.assert_array_equal(
+        geometry.get_step_keys([0, 0, 1, 1, 1, 0]), [0, 2, 5]
+    )
+    np.testing.assert_array_equal(
+        geometry.get_step_keys(np.ones(4, dtype=bool)), [0]
+    )
+    assert geometry.get_step_keys([]).shape == (0,)
+
+
+def test_reduce_keys(rng):
+    times = np.sort(rng.uniform(0, 100, 500))
+    values = np.sin(times / 7) * 5 + rng.normal(0, 0.01, 500)
+    tolerance = 0.05
+
+    keys = geometry.reduce_keys(times, values, tolerance)
+
+    assert keys[0] == 0 and keys[-1] == len(times) - 1
+    assert (np.diff(keys) > 0).all()
+    assert len(keys) < len(times) / 3
+    # Linear interpolation between the kept keys stays within tolerance.
+    curve = np.interp(times, times[keys], values[keys])
+    assert np.abs(curve - values).max() <= tolerance
+
+
+def test_reduce_keys_linear_runs():
+    times = np.arange(20.0)
+    values = np.concatenate([np.full(10, 2.0), np.arange(10.0) * 3])
+
+    np.testing.assert_array_equal(
+        geometry.reduce_keys(times, values, 1e-6), [0, 9, 10, 19]
+    )
+    np.testing.assert_array_equal(
+        geometry.reduce_keys(times, times * 2, 1e-6), [0, 19]
+    )
+    np.testing.assert_array_equal(geometry.reduce_keys([1], [4], 0.1), [0])
+    assert geometry.reduce_keys([], [], 0.1).shape == (0,)
+
+
+def test_locate_uv(rng):
+    _, triangles, uvs = make_grid(12)
+    triangle_uvs = uvs[triangles]
+
+    for uv in rng.uniform(0, 1, (200, 2)):
+        triangle, bary = geometry.locate_uv(triangle_uvs, uv)
+
+        assert (bary >= -1e-9).all()
+        np.testing.assert_allclose(bary @ triangle_uvs[triangle], uv)
+        containing = [
+            i
+            for i, (a, b, c) in enumerate(triangle_uvs)
+            if all(
+                cross_2d(end - start, uv - start) >= -1e-12
+                for start, end in [(a, b), (b, c), (c, a)]
+            )
+        ]
+        assert triangle in containing
+
+
+def test_locate_uv_outside():
+    _, triangles, uvs = make_grid(4)
+    triangle, bary = geometry.locate_uv(uvs[triangles], (1.2, 0.5))
+
+    # Closest triangle, with an extrapolated negative weight.
+    assert bary.min() < 0
+    assert uvs[triangles[triangle]][:, 0].max() == 1
+
+
+def test_get_symmetry_map(rng):
+    points, _, _ = make_grid(10, 14)
+    points[:, 2] = rng.uniform(0, 0.1, len(points))
+    # Make the grid symmetric on x, except one vertex.
+    mirrored_ids = np.argmin(
+        np.linalg.norm(
+            points[:, None, :2] * (-1, 1) - points[None, :, :2], axis=-1
+        ),
+        axis=1,
+    )
+    points[:, 2] = np.maximum(points[:, 2], points[mirrored_ids, 2])
+    points[3, 2] += 0.5
+
+    symmetry_map = geometry.get_symmetry_map(points, axis=0)
+
+    tolerance = 1e-3 * np.linalg.norm(np.ptp(points, axis=0))
+    mirrored = points * (-1, 1, 1)
+    all_distances = np.linalg.norm(mirrored[:, None] - points[None], axis=-1)
+    expected = np.where(
+        all_distances.min(axis=1) <= tolerance,
+        np.argmin(all_distances, axis=1),
+        -1,
+    )
+    np.testing.assert_array_equal(symmetry_map, expected)
+    assert symmetry_map[3] == -1 and symmetry_map[mirrored_ids[3]] == -1
+    assert (symmetry_map[symmetry_map != -1] != -1).all()
+
+
+def test_get_surface_distances(rng):
+    points, triangles, _ = make_grid(12)
+    points[:, 2] = rng.uniform(0, 0.05, len(points))
+    edges = geometry.get_edges(triangles)
+    seed, seed_distance, max_distance = 40, 0.02, 0.5
+
+    distances = geometry.get_surface_distances(
+        points, edges, seed, seed_distance, max_distance
+    )
+
+    # Plain Dijkstra without cutoff, vertices are cut afterwards.
+    neighbors = {i: [] for i in range(len(points))}
+    for a, b in edges:
+        length = float(np.linalg.norm(points[a] - points[b]))
+        neighbors[a].append((b, length))
+        neighbors[b].append((a, length))
+    expected = np.full(len(points), np.inf)
+    heap = [(seed_distance, seed)]
+    while heap:
+        distance, vertex = heapq.heappop(heap)
+        if distance >= expected[vertex]:
+            continue
+        expected[vertex] = distance
+        for other, length in neighbors[vertex]:
+            heapq.heappush(heap, (distance + length, other))
+    expected[expected > max_distance] = np.inf
+
+    np.testing.assert_allclose(distances, expected)
+    assert np.isinf(distances).any() and np.isfinite(distances).sum() > 1
+
+
+def test_get_level_ranges(rng):
+    distances = np.sort(rng.uniform(0, 2, 1000))
+    radius, level_count = 1.2, 16
+
+    count, ranges = geometry.get_level_ranges(
+        distances, radius, 900, level_count
+    )
+
+    assert count == np.count_nonzero(distances <= radius)
+    levels = np.full(900, level_count)
+    levels[:count] = np.rint(distances[:count] / radius * (level_count - 1))
+    written = np.full(900, -1)
+    for level, start, end in ranges:
+        written[start:end] = level
+    np.testing.assert_array_equal(written, levels)
+    # Vertices beyond both radii are left as is.
+    assert ranges[-1, 2] == 900
+
+
+def test_get_level_ranges_shrinking_to_zero():
+    count, ranges = geometry.get_level_ranges(np.arange(5.0), 0, 4, 8)
+
+    assert count == 1
+    np.testing.assert_array_equal(ranges, [[8, 0, 4]])
+
+
+def test_get_tangent_weights(rng):
+    triangle_uvs = rng.uniform(0, 1, (100, 3, 2))
+    triangle_uvs[0] = [(0, 0), (1, 1), (2, 2)]
+
+    weights = geometry.get_tangent_weights(triangle_uvs)
+
+    # Moving along the weighted edges increases U by one, V doesn't change.
+    edges = triangle_uvs[:, 1:] - triangle_uvs[:, :1]
+    steps = np.einsum("ij,ijk->ik", weights, edges)
+    np.testing.assert_allclose(steps[1:], np.tile([1.0, 0], (99, 1)), atol=1e-9)
+    np.testing.assert_array_equal(weights[0], [1, 0])
+
+
+def test_get_surface_frames(rng):
+    corners = rng.uniform(-1, 1, (50, 3, 3))
+    weights = rng.dirichlet(np.ones(3), 50)
+    triangle_uvs = rng.uniform(0, 1, (50, 3, 2))
+
+    frames = geometry.get_surface_frames(
+        corners, weights, geometry.get_tangent_weights(triangle_uvs)
+    )
+
+    axes = frames[:, :3, :3]
+    np.testing.assert_allclose(
+        axes @ axes.transpose(0, 2, 1),
+        np.tile(np.eye(3), (50, 1, 1)),
+        atol=1e-9,
+    )
+    np.testing.assert_allclose(frames[:, :3, 3], 0)
+    np.testing.assert_allclose(frames[:, 3, 3], 1)
+    for frame, corner, weight, uvs in zip(
+        frames, corners, weights, triangle_uvs
+    ):
+        edges = corner[1:] - corner[0]
+        normal = np.cross(edges[0], edges[1])
+        np.testing.assert_allclose(
+            frame[1, :3], normal / np.linalg.norm(normal), atol=1e-9
+        )
+        np.testing.assert_allclose(frame[3, :3], weight @ corner)
+        # The X axis points where U increases and V doesn't change.
+        edge_weights = np.linalg.lstsq(edges.T, frame[0, :3], rcond=None)[0]
+        du, dv = edge_weights @ (uvs[1:] - uvs[0])
+        assert du > 0
+        assert abs(dv) < 1e-9 * max(1, abs(du))
+
+
+def test_get_surface_frames_axes():
+    corners = np.array([[(0.0, 0, 0), (1, 0, 0), (0, 0, -1)]])
+    triangle_uvs = np.array([[(0.0, 0), (1, 0), (0, 1)]])
+
+    frames = geometry.get_surface_frames(
+        corners,
+        np.array([[0.5, 0.25, 0.25]]),
+        geometry.get_tangent_weights(triangle_uvs),
+    )
+
+    np.testing.assert_allclose(
+        frames[0],
+        [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0.25, 0, -0.25, 1]],
+        atol=1e-12,
+    )
+
+
+def brute_force_projection(
+    points: np.ndarray,
+    normals: np.ndarray,
+    mesh_points: np.ndarray,
+    triangles: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Score every triangle for every point, like project_on_mesh."""
+    corners = mesh_points[triangles]
+    triangle_normals = geometry.normalize(
+        np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    )
+    scores, distances = [], []
+    for point, normal in zip(points, normals):
+        closest, _ = geometry.closest_points_on_triangles(
+            np.broadcast_to(point, (len(triangles), 3)),
+            corners[:, 0],
+            corners[:, 1],
+            corners[:, 2],
+        )
+        point_distances = np.linalg.norm(closest - point, axis=1)
+        point_scores = point_distances * (2 - triangle_normals @ normal)
+        best = np.argmin(point_scores)
+        scores.append(point_scores[best])
+        distances.append(point_distances[best])
+
+    return np.array(scores), np.array(distances)
+
+
+def test_project_on_mesh(rng):
+    mesh_points, triangles = make_sphere(20)
+    directions = geometry.normalize(rng.normal(size=(300, 3)))
+    # Near the surface, far from it, and inside with flipped normals.
+    scales = np.concatenate(
+        [rng.uniform(0.9, 1.1, 200), rng.uniform(2, 6, 50), np.full(50, 0.3)]
+    )
+    points = directions * scales[:, None]
+    normals = directions.copy()
+    normals[250:] *= -1
+
+    triangle_ids, weights, distances = geometry.project_on_mesh(
+        points, normals, mesh_points, triangles
+    )
+
+    expected_scores, expected_distances = brute_force_projection(
+        points, normals, mesh_points, triangles
+    )
+    corners = mesh_points[triangles[triangle_ids]]
+    projected = np.einsum("ij,ijk->ik", weights, corners)
+    np.testing.assert_allclose(
+        np.linalg.norm(projected - points, axis=1), distances, atol=1e-9
+    )
+    # Ties between triangles sharing the closest point give the same score.
+    triangle_normals = geometry.normalize(
+        np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    )
+    scores = distances * (2 - np.einsum("ij,ij->i", triangle_normals, normals))
+    np.testing.assert_allclose(scores, expected_scores, atol=1e-9)
+    np.testing.assert_allclose(distances, expected_distances, atol=1e-9)
+
+
+def test_project_on_mesh_thin_shell():
+    """Points between two close parallel sheets stick to the sheet their
+    normal faces, even when the other one is closer.
+    """
+    points, triangles, _ = make_grid(8)
+    top = points + (0, 0, 0.02)
+    mesh_points = np.concatenate([points, top])
+    # Bottom sheet facing -z, top sheet facing +z.
+    triangles = np.concatenate([triangles[:, ::-1], triangles + len(points)])
+    queries = np.array([(0.1, 0.1, 0.012), (0.1, 0.1, 0.008)])
+    normals = np.array([(0.0, 0, -1), (0, 0, 1)])
+
+    triangle_ids, _, distances = geometry.project_on_mesh(
+        queries, normals, mesh_points, triangles
+    )
+
+    assert triangle_ids[0] < len(triangles) // 2
+    assert triangle_ids[1] >= len(triangles) // 2
+    np.testing.assert_allclose(distances, [0.012, 0.012])